@@ -0,0 +1,106 @@
+"""
+PACKED METRIC BENCHMARK
+
+ASCII compression metrics (zlib/bz2/lzma) feed the compressor one
+'0'/'1' byte per bit. The packed variants feed it 8 bits per byte
+(*_packed) or one 5-bit ordinal symbol per byte (*_sym5).
+
+Reports, per compressor:
+1. Speed: seconds per evaluation on the full-corpus bitstring
+2. Agreement: a word_perm test scored by every metric on the SAME
+   permutations (run_multi_metric_test) - p-values, effects in bits
+   per input bit, and the rank correlation of the null values with
+   the ASCII metric.
+
+Usage:
+    python src/benchmark_packed_metrics.py --n_perm 200
+"""
+
+import sys
+import time
+sys.path.insert(0, 'src')
+
+import numpy as np
+
+from core.api import (
+    register_encoding, register_corpus, run_multi_metric_test, METRICS, PACKED_WIDTHS
+)
+from core.binary_analysis import load_quran, extract_text
+from encoding_functions.f_ordinal import encode_ordinal_5bit_abjad, encode_ordinal_delta_sign
+
+COMPRESSORS = ["zlib", "bz2", "lzma"]
+
+
+def time_metric(name: str, bits: str, repeat: int = 3) -> float:
+    """Best-of-repeat seconds per evaluation."""
+    fn = METRICS[name].fn
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(bits)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def rank_correlation(a, b) -> float:
+    ra = np.argsort(np.argsort(a))
+    rb = np.argsort(np.argsort(b))
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+def run_benchmark(n_perm: int = 200, n_surahs: int = 20):
+    quran = load_quran()
+    full_text = extract_text(quran, "full")
+    # Agreement test on a subset: the ASCII metrics dominate its runtime
+    subset = " ".join(v["text"] for s in quran[-n_surahs:] for v in s["verses"])
+    register_corpus("bench", subset, "data/quran/quran.json")
+
+    encodings = {
+        "ord_5bit_abjad": encode_ordinal_5bit_abjad,
+        "ord_delta_sign": encode_ordinal_delta_sign,
+    }
+    for name, fn in encodings.items():
+        register_encoding(name, fn, "benchmark", "none")
+
+    print("=" * 70)
+    print("SPEED (full corpus, seconds per evaluation)")
+    print("=" * 70)
+    bits = encode_ordinal_5bit_abjad(full_text)
+    print(f"ord_5bit_abjad: {len(bits):,} bits")
+    for compressor in COMPRESSORS:
+        ascii_time = time_metric(compressor, bits)
+        cells = [f"{compressor:>5}: ascii {ascii_time:7.3f}s"]
+        for suffix in PACKED_WIDTHS:
+            t = time_metric(f"{compressor}_{suffix}", bits)
+            cells.append(f"{suffix} {t:7.3f}s ({ascii_time / t:4.1f}x)")
+        print("  ".join(cells))
+
+    print()
+    print("=" * 70)
+    print(f"AGREEMENT (word_perm, n_perm={n_perm}, last {n_surahs} surahs)")
+    print("=" * 70)
+    for encoding in encodings:
+        metrics = [f"{c}{s}" for c in COMPRESSORS for s in ["", *(f"_{k}" for k in PACKED_WIDTHS)]]
+        result = run_multi_metric_test(
+            "bench", encoding, "word_perm", metrics, n_perm=n_perm, use_cache=False
+        ).results
+        print(f"\n{encoding}")
+        print(f"  {'metric':<12} {'p':>8} {'effect b/bit':>13} {'rank corr':>10}")
+        for compressor in COMPRESSORS:
+            reference = result[compressor].null_distribution
+            for name in [compressor, *(f"{compressor}_{k}" for k in PACKED_WIDTHS)]:
+                r = result[name]
+                corr = rank_correlation(reference, r.null_distribution)
+                print(f"  {name:<12} {r.p_value:8.4f} {r.effect_bits_per_char:13.5f} {corr:10.3f}")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_perm", type=int, default=200,
+                        help="Permutations for the agreement test")
+    parser.add_argument("--n_surahs", type=int, default=20,
+                        help="Surahs (from the end) in the agreement corpus")
+    args = parser.parse_args()
+
+    run_benchmark(n_perm=args.n_perm, n_surahs=args.n_surahs)
@@ -12,15 +12,30 @@ from core.api import (
     # Test specs
     TestSpec,
     LengthScaleSpec,
+    AttributionSpec,
 
     # Test execution
     run_test,
     run_length_scale_test,
     run_robustness_test,
+    run_multi_metric_test,
+    run_batch_test,
+    run_family_test,
+    run_rare_event_test,
+    run_attribution,
     quick_test,
 
     # Utilities
     list_registered,
+    effect_unit,
+    enable_result_cache,
+    disable_result_cache,
+    enable_permutation_bank,
+    disable_permutation_bank,
+    enable_null_cache,
+    disable_null_cache,
+    job_key,
+    code_fingerprint,
 
     # Types
     NullType,
@@ -30,7 +45,13 @@ from core.api import (
     TestResult,
     LengthScaleResult,
     RobustnessResult,
+    BatchResult,
+    FamilyResult,
+    RareEventResult,
+    AttributionResult,
 )
+from core.bitseq import BitSeq, as_bitseq, as_str
+from core.scheduler import Scheduler
 
 
 def load_quran_corpus():
@@ -40,10 +61,20 @@ def load_quran_corpus():
     quran = load_quran("data/quran/quran.json")
     text = extract_text(quran, "full")
 
+    # Word offsets of every verse and surah (for hierarchical nulls)
+    verse_offsets, surah_offsets = [], []
+    n_words = 0
+    for surah in quran:
+        surah_offsets.append(n_words)
+        for verse in surah["verses"]:
+            verse_offsets.append(n_words)
+            n_words += len(verse["text"].split())
+
     register_corpus(
         name="quran",
         text=text,
         source="data/quran/quran.json",
-        language="Classical Arabic"
+        language="Classical Arabic",
+        boundaries={"verse": verse_offsets, "surah": surah_offsets}
     )
     return text
@@ -8,11 +8,36 @@ Key insight: The question is "beyond word boundaries?"
 - Diagnostic: BLOCK SHUFFLE CURVE (reveals length-scale)
 """
 
-from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Tuple, Optional, Any
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Optional, Any
 from enum import Enum
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import hashlib
+import itertools
+import multiprocessing as mp
+import math
 import random
 
+import numpy as np
+
+from core.bitseq import BitSeq, Bits, as_str, ascii_bytes, block_shuffle_array
+from core.word_table import (
+    WordTable, LetterTable, TokenTable, SegmentTable, build_segment_table,
+    expand_units, grouped_permutation, distinct_orders,
+)
+from core.cache import ResultCache, DEFAULT_MAX_BYTES, fingerprint_fn
+from core.perm_bank import MAX_BANK_BYTES, PermutationBank
+from core.null_cache import NullDistributionCache
+from core.streaming import NullSummary
+from core.markov import MAX_ORDER as MARKOV_MAX_ORDER, MarkovModel, sample_surrogates
+from core.word_markov import WordMarkovModel
+from core.statistics import westfall_young_maxT, holm_across_families, compression_bits_per_bit
+from core.rare_event import multilevel_splitting
+from core.code_length import ctw_code_length, kt_bit_costs, kt_code_length
+from core.complexity import block_entropy, lz76_complexity
+from core.dependence import autocorrelation_function, lagged_mutual_information
+
 
 # ============================================================
 # TYPES
@@ -38,7 +63,7 @@ class MetricDirection(Enum):
 class EncodingMeta:
     """Encoding function metadata."""
     name: str
-    fn: Callable[[str], str]  # text -> bits
+    fn: Callable[[str], Bits]  # text -> bits (str or BitSeq)
     description: str
     hypothesis: str  # What this encoding tests
     preregistered: bool = False
@@ -52,15 +77,30 @@ class NullMeta:
     null_type: NullType
     preserves: str  # What it preserves
     destroys: str  # What it destroys
+    index_fn: Optional[Callable] = None  # (WordTable | LetterTable, rng) -> positions
+    index_unit: str = "word"  # Table index_fn works on: "word" or "letter"
+    batch_fn: Optional[Callable] = None  # (bits, [rng, ...]) -> [null bits, ...]
+    levels: Tuple[str, ...] = ()  # Corpus boundary levels the null needs
+    density_only: bool = False  # Output depends only on (length, number of ones)
+    exact_fn: Optional[Callable] = None  # (table, limit) -> every distinct positions array, or None
+    move_fn: Optional[Callable] = None  # (table, positions, np gen) -> positions; MCMC move
 
 
 @dataclass(frozen=True)
 class MetricMeta:
     """Metric function metadata."""
     name: str
-    fn: Callable[[str], float]  # bits -> float
+    fn: Callable[[Bits], float]  # bits (str or BitSeq) -> float
     direction: MetricDirection
     description: str
+    effect_scale: float = 8.0  # Metric difference -> bits per input bit
+    effect_unit: str = "bits/char"  # Unit of effect() (not bits/char for dependence sums)
+
+    def effect(self, observed: float, null_mean: float) -> float:
+        """Structure beyond the null, scaled (positive = observed more structured)."""
+        if self.direction == MetricDirection.LOWER:
+            return (null_mean - observed) * self.effect_scale
+        return (observed - null_mean) * self.effect_scale
 
 
 @dataclass(frozen=True)
@@ -70,12 +110,19 @@ class CorpusMeta:
     text: str
     source: str
     language: str
+    # (level, word offsets) pairs, e.g. ("verse", (0, 7, 12, ...))
+    boundaries: Tuple[Tuple[str, Tuple[int, ...]], ...] = ()
+
+    def boundary_levels(self) -> Dict[str, Tuple[int, ...]]:
+        return dict(self.boundaries)
 
 
 # ============================================================
 # GLOBAL REGISTRIES
 # ============================================================
 
+INDEX_UNITS = ("word", "letter")
+
 ENCODINGS: Dict[str, EncodingMeta] = {}
 NULLS: Dict[str, NullMeta] = {}
 METRICS: Dict[str, MetricMeta] = {}
@@ -88,7 +135,7 @@ CORPORA: Dict[str, CorpusMeta] = {}
 
 def register_encoding(
     name: str,
-    fn: Callable[[str], str],
+    fn: Callable[[str], Bits],
     description: str,
     hypothesis: str,
     preregistered: bool = False
@@ -98,15 +145,17 @@ def register_encoding(
 
     Args:
         name: Unique identifier (e.g., "E8_solar")
-        fn: Function text -> bits
+        fn: Function text -> bits (string of 0s and 1s, or BitSeq)
         description: What it does
         hypothesis: What it tests
         preregistered: Was hypothesis written before seeing results?
     """
     # Validate function signature
     test_result = fn("test")
-    if not isinstance(test_result, str) or not all(c in '01' for c in test_result):
-        raise ValueError(f"Encoding {name} must return string of 0s and 1s")
+    if isinstance(test_result, BitSeq):
+        pass
+    elif not isinstance(test_result, str) or not all(c in '01' for c in test_result):
+        raise ValueError(f"Encoding {name} must return string of 0s and 1s or a BitSeq")
 
     meta = EncodingMeta(name, fn, description, hypothesis, preregistered)
     ENCODINGS[name] = meta
@@ -118,7 +167,14 @@ def register_null(
     fn: Callable,
     null_type: NullType,
     preserves: str,
-    destroys: str
+    destroys: str,
+    index_fn: Optional[Callable] = None,
+    index_unit: str = "word",
+    batch_fn: Optional[Callable] = None,
+    levels: Tuple[str, ...] = (),
+    density_only: bool = False,
+    exact_fn: Optional[Callable] = None,
+    move_fn: Optional[Callable] = None
 ) -> NullMeta:
     """
     Register a null model.
@@ -129,17 +185,46 @@ def register_null(
         null_type: TEXT or BITS
         preserves: What structure it preserves
         destroys: What structure it destroys
+        index_fn: Optional index form (table, rng) -> positions.
+            Lets run_test assemble null bits from pre-encoded tokens.
+        index_unit: "word" (index_fn gets a WordTable) or "letter"
+            (index_fn gets a LetterTable)
+        batch_fn: Optional batched BITS form (bits, rngs) -> one null per
+            rng, each identical to fn(bits, rng). Lets run_test generate
+            many surrogates at once.
+        levels: Corpus boundary levels index_fn reads from the WordTable
+            (e.g. ("verse",)); tests on corpora without them are invalid.
+        density_only: BITS null whose output depends only on the length
+            and number of ones of its input (and the rng), so its null
+            distribution can be shared through the null cache.
+        exact_fn: Optional enumeration (table, limit) -> array of every
+            distinct, equally likely positions order (None if more than
+            limit). Enables TestSpec(exact=True).
+        move_fn: Optional local move (table, positions, gen) -> positions:
+            symmetric and leaving the null distribution invariant.
+            Enables run_rare_event_test.
     """
-    meta = NullMeta(name, fn, null_type, preserves, destroys)
+    if index_unit not in INDEX_UNITS:
+        raise ValueError(f"index_unit must be one of {INDEX_UNITS}")
+    if levels and (index_fn is None or index_unit != "word"):
+        raise ValueError("Boundary levels require a word-level index_fn")
+    if density_only and null_type != NullType.BITS:
+        raise ValueError("density_only nulls must be BITS nulls")
+    if (exact_fn is not None or move_fn is not None) and index_fn is None:
+        raise ValueError("exact_fn and move_fn require an index_fn")
+    meta = NullMeta(name, fn, null_type, preserves, destroys, index_fn, index_unit, batch_fn,
+                    tuple(levels), density_only, exact_fn, move_fn)
     NULLS[name] = meta
     return meta
 
 
 def register_metric(
     name: str,
-    fn: Callable[[str], float],
+    fn: Callable[[Bits], float],
     direction: MetricDirection,
-    description: str
+    description: str,
+    effect_scale: float = 8.0,
+    effect_unit: str = "bits/char"
 ) -> MetricMeta:
     """
     Register a metric function.
@@ -149,22 +234,51 @@ def register_metric(
         fn: Function bits -> float
         direction: LOWER or HIGHER indicates more structure
         description: What it measures
+        effect_scale: Factor turning a metric difference into bits per
+            input bit (8 for ratios over ASCII '0'/'1' bytes, 1 for
+            metrics already in bits per bit)
+        effect_unit: Unit of the scaled difference, for metrics that
+            are not code lengths (no bits/char effect exists)
     """
-    meta = MetricMeta(name, fn, direction, description)
+    meta = MetricMeta(name, fn, direction, description, effect_scale, effect_unit)
     METRICS[name] = meta
     return meta
 
 
+def effect_unit(metric: str) -> str:
+    """Unit of a metric's effect (bits/char unless registered otherwise)."""
+    meta = METRICS.get(metric)
+    return meta.effect_unit if meta is not None else "bits/char"
+
+
 def register_corpus(
     name: str,
     text: str,
     source: str,
-    language: str = "Arabic"
+    language: str = "Arabic",
+    boundaries: Optional[Dict[str, List[int]]] = None
 ) -> CorpusMeta:
-    """Register a text corpus."""
+    """
+    Register a text corpus.
+
+    Args:
+        boundaries: Optional segment levels, level -> word offset where
+            each segment starts (e.g. {"verse": [...], "surah": [...]}).
+            Offsets start at 0 and increase; coarser levels must start
+            on finer-level boundaries. Used by hierarchical nulls.
+    """
     if not text:
         raise ValueError(f"Corpus {name} cannot be empty")
-    meta = CorpusMeta(name, text, source, language)
+    n_words = len(text.split())
+    levels = []
+    for level, offsets in sorted((boundaries or {}).items()):
+        offsets = tuple(int(o) for o in offsets)
+        if not offsets or offsets[0] != 0:
+            raise ValueError(f"Corpus {name}: '{level}' offsets must start at 0")
+        if any(b <= a for a, b in zip(offsets, offsets[1:])) or offsets[-1] >= n_words:
+            raise ValueError(f"Corpus {name}: '{level}' offsets must increase and be < {n_words}")
+        levels.append((level, offsets))
+    meta = CorpusMeta(name, text, source, language, tuple(levels))
     CORPORA[name] = meta
     return meta
 
@@ -185,42 +299,188 @@ def null_word_permutation(text: str, rng: random.Random) -> str:
     return ' '.join(words)
 
 
+def null_word_permutation_index(words: WordTable, rng: random.Random) -> np.ndarray:
+    """
+    Word permutation as a position array.
+
+    Consumes rng exactly like null_word_permutation, so both paths
+    produce the same permutation for the same seed.
+    """
+    order = list(range(len(words)))
+    rng.shuffle(order)
+    return np.array(order, dtype=np.int64)
+
+
+def null_word_swap_move(words: WordTable, positions: np.ndarray, gen: np.random.Generator) -> np.ndarray:
+    """Swap two random words: a symmetric move that keeps word_perm's uniform null."""
+    i, j = gen.integers(len(positions), size=2)
+    moved = positions.copy()
+    moved[i], moved[j] = positions[j], positions[i]
+    return moved
+
+
+def null_within_segments_index(words: WordTable, level: str, rng: random.Random) -> np.ndarray:
+    """
+    Shuffle words within each segment of a boundary level.
+
+    Segment contents and order stay; only word order inside moves.
+    """
+    gen = np.random.default_rng(rng.getrandbits(64))
+    return grouped_permutation(words.segment_ids(level), gen)
+
+
+def null_segment_permutation_index(
+    words: WordTable,
+    level: str,
+    rng: random.Random,
+    within: Optional[str] = None
+) -> np.ndarray:
+    """
+    Shuffle whole segments of a level (each kept intact).
+
+    within=None shuffles them globally; otherwise only inside each
+    segment of the coarser level (e.g. verses within their surah).
+    """
+    gen = np.random.default_rng(rng.getrandbits(64))
+    starts, lens = words.spans(level)
+    if within is None:
+        group = np.zeros(len(starts), dtype=np.int64)
+    else:
+        group = words.segment_ids(within)[starts]
+    order = grouped_permutation(group, gen)
+    return expand_units(starts[order], lens[order])
+
+
+def _null_needs_boundaries(text: str, rng: random.Random) -> str:
+    """Text form of hierarchical nulls: plain text has no verse/surah offsets."""
+    raise ValueError("Hierarchical nulls need corpus boundaries; run them through run_test")
+
+
 def null_block_shuffle_letters(text: str, block_size: int, rng: random.Random) -> str:
     """
     Block shuffle at letter level (preserving word boundaries marker).
 
-    For length-scale diagnostic.
+    For length-scale diagnostic. Words longer than block_size have their
+    blocks reordered; shorter words stay intact. Same draws as the index
+    form (null_block_shuffle_letters_index) for the same rng.
     """
-    # Separate words
-    words = text.split()
-    result_words = []
+    letters = LetterTable(text)
+    return letters.text_for(null_block_shuffle_letters_index(letters, block_size, rng))
+
+
+def null_block_shuffle_letters_index(
+    letters: LetterTable,
+    block_size: int,
+    rng: random.Random
+) -> np.ndarray:
+    """
+    Block shuffle within words as a character position array.
+
+    Every word longer than block_size gets an independent random block
+    order (grouped_permutation by word), applied as one gather.
+    """
+    positions = np.arange(len(letters), dtype=np.int64)
+    block_word, block_start, block_len, dest = letters.blocks(block_size)
+    if len(block_word) == 0:
+        return positions
+
+    gen = np.random.default_rng(rng.getrandbits(64))
+    order = grouped_permutation(block_word, gen)
+    positions[dest] = expand_units(block_start[order], block_len[order])
+    return positions
 
-    for word in words:
-        letters = list(word)
-        if len(letters) <= block_size:
-            # Word smaller than block → keep intact
-            result_words.append(word)
-        else:
-            # Shuffle blocks within word
-            blocks = [letters[i:i+block_size] for i in range(0, len(letters), block_size)]
-            rng.shuffle(blocks)
-            result_words.append(''.join(''.join(b) for b in blocks))
 
-    return ' '.join(result_words)
+def null_within_word_letters(text: str, rng: random.Random) -> str:
+    """
+    Shuffle letters within each word; word lengths and order stay.
+
+    Same draws as null_within_word_letters_index for the same rng.
+    """
+    letters = LetterTable(text)
+    return letters.text_for(null_within_word_letters_index(letters, rng))
+
 
+def null_within_word_letters_index(letters: LetterTable, rng: random.Random) -> np.ndarray:
+    """Within-word letter shuffle as a character position array (one argsort)."""
+    gen = np.random.default_rng(rng.getrandbits(64))
+    return grouped_permutation(letters.word_groups, gen)
 
-def null_random_shuffle_bits(bits: str, rng: random.Random) -> str:
-    """Shuffle all bits randomly. Preserves only 0/1 ratio."""
-    bits_list = list(bits)
-    rng.shuffle(bits_list)
-    return ''.join(bits_list)
+
+def null_random_shuffle_bits(bits: Bits, rng: random.Random) -> Bits:
+    """
+    Shuffle all bits randomly. Preserves only 0/1 ratio.
+
+    Shuffles the sorted bits (zeros, then ones) with one numpy draw, so
+    the output depends only on (length, number of ones, rng) - the same
+    for str and BitSeq input (see the null cache).
+    """
+    n_ones = bits.count('1')
+    arr = np.zeros(len(bits), dtype=np.uint8)
+    arr[len(arr) - n_ones:] = 1
+    np.random.default_rng(rng.getrandbits(64)).shuffle(arr)
+    if isinstance(bits, BitSeq):
+        return BitSeq.from_bits(arr)
+    return (arr + ord('0')).tobytes().decode('ascii')
 
 
-def null_block_shuffle_bits(bits: str, block_size: int, rng: random.Random) -> str:
+def null_block_shuffle_bits(bits: Bits, block_size: int, rng: random.Random) -> Bits:
     """Shuffle blocks of bits. Preserves local patterns."""
-    blocks = [bits[i:i+block_size] for i in range(0, len(bits), block_size)]
-    rng.shuffle(blocks)
-    return ''.join(blocks)
+    gen = np.random.default_rng(rng.getrandbits(64))
+    if isinstance(bits, BitSeq):
+        return BitSeq.from_bits(block_shuffle_array(bits.to_array(), block_size, gen))
+    codes = np.frombuffer(bits.encode('ascii'), dtype=np.uint8)
+    return block_shuffle_array(codes, block_size, gen).tobytes().decode('ascii')
+
+
+@lru_cache(maxsize=8)
+def _markov_model(bits: Bits, order: int) -> MarkovModel:
+    """Fit once per observed bitstring (nulls are drawn from the same fit)."""
+    return MarkovModel.fit(bits, order)
+
+
+def null_markov_bits(bits: Bits, order: int, rng: random.Random) -> Bits:
+    """Order-k Markov surrogate. Preserves all (k+1)-bit statistics."""
+    return null_markov_bits_batch(bits, order, [rng])[0]
+
+
+def null_markov_bits_batch(bits: Bits, order: int, rngs: List[random.Random]) -> List[Bits]:
+    """Several order-k surrogates at once (one per rng, as null_markov_bits)."""
+    gens = [np.random.default_rng(rng.getrandbits(64)) for rng in rngs]
+    return sample_surrogates(bits, order, gens, _markov_model(bits, order))
+
+
+@lru_cache(maxsize=8)
+def _word_markov_model(words: WordTable, order: int) -> WordMarkovModel:
+    """Fit once per word table (nulls are drawn from the same fit)."""
+    return WordMarkovModel(words.ids, order)
+
+
+@lru_cache(maxsize=4)
+def _text_word_table(text: str) -> WordTable:
+    """WordTable for the text form of word Markov nulls (one fit per text)."""
+    return WordTable(text)
+
+
+def null_word_markov(text: str, order: int, rng: random.Random) -> str:
+    """
+    Surrogate text from a word n-gram model (order 1 = bigram, 2 = trigram).
+
+    Same draws as null_word_markov_index for the same rng.
+    """
+    words = _text_word_table(text)
+    return words.text_for(null_word_markov_index(words, order, rng))
+
+
+def null_word_markov_index(words: WordTable, order: int, rng: random.Random) -> np.ndarray:
+    """
+    Word n-gram surrogate as word positions.
+
+    Not a permutation: each generated word is represented by its first
+    position in the corpus, which the segment table encodes the same.
+    """
+    gen = np.random.default_rng(rng.getrandbits(64))
+    ids = _word_markov_model(words, order).sample(len(words), gen)
+    return words.first_position[ids]
 
 
 # ============================================================
@@ -232,34 +492,104 @@ import bz2
 import lzma
 
 
-def metric_compression_zlib(bits: str) -> float:
+def metric_compression_zlib(bits: Bits) -> float:
     """Compression ratio using zlib."""
     if not bits:
         return 1.0
-    data = bits.encode()
+    data = ascii_bytes(bits)
     return len(zlib.compress(data, level=9)) / len(data)
 
 
-def metric_compression_bz2(bits: str) -> float:
+def metric_compression_bz2(bits: Bits) -> float:
     """Compression ratio using bz2."""
     if not bits:
         return 1.0
-    data = bits.encode()
+    data = ascii_bytes(bits)
     return len(bz2.compress(data, compresslevel=9)) / len(data)
 
 
-def metric_compression_lzma(bits: str) -> float:
+def metric_compression_lzma(bits: Bits) -> float:
     """Compression ratio using lzma."""
     if not bits:
         return 1.0
-    data = bits.encode()
+    data = ascii_bytes(bits)
     return len(lzma.compress(data)) / len(data)
 
 
+# Packed variants: same compressors on 1 byte per 8 bits (or per 5-bit
+# symbol) instead of 1 byte per bit. Values in bits per input bit.
+PACKED_WIDTHS = {"packed": 8, "sym5": 5}
+
+
+def metric_compression_packed(bits: Bits, compressor: str, width: int = 8) -> float:
+    """Compressed bits per input bit of the bit-packed (width-bit symbol) bytes."""
+    return compression_bits_per_bit(bits, compressor, width)
+
+
+# Ideal adaptive code lengths: exact, header-free, no byte granularity
+CTW_DEPTH = 16
+
+
+def metric_ctw(bits: Bits, depth: int = CTW_DEPTH) -> float:
+    """CTW code length in bits per input bit."""
+    if not bits:
+        return 1.0
+    return ctw_code_length(bits, depth) / len(bits)
+
+
+def metric_kt(bits: Bits, order: int) -> float:
+    """Adaptive order-k KT code length in bits per input bit."""
+    if not bits:
+        return 1.0
+    return kt_code_length(bits, order) / len(bits)
+
+
+def metric_lz76(bits: Bits) -> float:
+    """Normalised LZ76 complexity, c(n) log2(n) / n."""
+    return lz76_complexity(bits)
+
+
+def metric_block_entropy(bits: Bits, k: int) -> float:
+    """Block entropy H_k / k in bits per bit (k-bit blocks, overlapping)."""
+    if len(bits) < k:
+        return 1.0
+    return block_entropy(bits, k) / k
+
+
+# Registered block lengths (any k up to complexity.MAX_BLOCK via metric_block_entropy)
+BLOCK_ENTROPY_KS = (1, 2, 4, 8, 16, 20)
+
+# Lagged dependence: HIGHER = more structure, all lags from one FFT
+DEPENDENCE_LAGS = (64, 1024)
+
+
+def metric_mi_sum(bits: Bits, max_lag: int) -> float:
+    """Mutual information between bits k apart, summed over k = 1..max_lag (bits)."""
+    return float(lagged_mutual_information(bits, max_lag).sum())
+
+
+def metric_acf_sum(bits: Bits, max_lag: int) -> float:
+    """Squared autocorrelation summed over lags 1..max_lag (Box-Pierce Q / n)."""
+    return float((autocorrelation_function(bits, max_lag) ** 2).sum())
+
+
 # ============================================================
 # REGISTER BUILT-IN NULLS AND METRICS
 # ============================================================
 
+def _register_block_null(block_size: int) -> NullMeta:
+    """Letter block-shuffle null 'block_{k}' (text and index forms)."""
+    return register_null(
+        f"block_{block_size}",
+        lambda t, rng, k=block_size: null_block_shuffle_letters(t, k, rng),
+        NullType.TEXT,
+        preserves=f"Patterns within {block_size}-letter blocks",
+        destroys=f"Patterns across {block_size}-letter blocks",
+        index_fn=lambda letters, rng, k=block_size: null_block_shuffle_letters_index(letters, k, rng),
+        index_unit="letter"
+    )
+
+
 def _init_builtins():
     """Register built-in nulls and metrics."""
     # Critical null
@@ -268,17 +598,77 @@ def _init_builtins():
         null_word_permutation,
         NullType.TEXT,
         preserves="Words intact, within-word structure",
-        destroys="Word order, cross-word patterns"
+        destroys="Word order, cross-word patterns",
+        index_fn=null_word_permutation_index,
+        exact_fn=lambda words, limit: distinct_orders(words.ids, limit),
+        move_fn=null_word_swap_move
+    )
+
+    # Word-level control: letters shuffled inside words
+    register_null(
+        "within_word_shuffle",
+        null_within_word_letters,
+        NullType.TEXT,
+        preserves="Word order, word lengths, letters of each word",
+        destroys="Letter order within words",
+        index_fn=null_within_word_letters_index,
+        index_unit="letter"
+    )
+
+    # Word n-gram surrogates: keep syntax-level word statistics
+    for order, name in [(1, "word_bigram"), (2, "word_trigram")]:
+        register_null(
+            name,
+            lambda t, rng, k=order: null_word_markov(t, k, rng),
+            NullType.TEXT,
+            preserves=f"Word frequencies, word {order + 1}-gram statistics",
+            destroys=f"Word order beyond {order} previous word{'s' if order > 1 else ''}",
+            index_fn=lambda words, rng, k=order: null_word_markov_index(words, k, rng)
+        )
+
+    # Hierarchical nulls (need verse/surah boundaries)
+    for level in ["verse", "surah"]:
+        register_null(
+            f"{level}_word_perm",
+            _null_needs_boundaries,
+            NullType.TEXT,
+            preserves=f"Words intact, {level} membership of every word",
+            destroys=f"Word order within each {level}",
+            index_fn=lambda words, rng, level=level: null_within_segments_index(words, level, rng),
+            levels=(level,)
+        )
+        register_null(
+            f"{level}_perm",
+            _null_needs_boundaries,
+            NullType.TEXT,
+            preserves=f"Every {level} intact",
+            destroys=f"{level.capitalize()} order",
+            index_fn=lambda words, rng, level=level: null_segment_permutation_index(words, level, rng),
+            levels=(level,)
+        )
+    register_null(
+        "surah_verse_perm",
+        _null_needs_boundaries,
+        NullType.TEXT,
+        preserves="Every verse intact, surah membership of every verse",
+        destroys="Verse order within each surah",
+        index_fn=lambda words, rng: null_segment_permutation_index(words, "verse", rng, within="surah"),
+        levels=("verse", "surah")
     )
 
     # Diagnostic nulls for length-scale
     for k in [1, 2, 4, 8, 16, 32, 64, 128]:
+        _register_block_null(k)
+
+    # Markov surrogates: does structure exceed order-k Markov?
+    for k in range(1, MARKOV_MAX_ORDER + 1):
         register_null(
-            f"block_{k}",
-            lambda t, rng, k=k: null_block_shuffle_letters(t, k, rng),
-            NullType.TEXT,
-            preserves=f"Patterns within {k}-letter blocks",
-            destroys=f"Patterns across {k}-letter blocks"
+            f"markov_{k}",
+            lambda b, rng, k=k: null_markov_bits(b, k, rng),
+            NullType.BITS,
+            preserves=f"Order-{k} bit transition probabilities",
+            destroys=f"Structure beyond {k}-bit context",
+            batch_fn=lambda b, rngs, k=k: null_markov_bits_batch(b, k, rngs)
         )
 
     # Random shuffle (baseline)
@@ -287,13 +677,52 @@ def _init_builtins():
         null_random_shuffle_bits,
         NullType.BITS,
         preserves="0/1 ratio only",
-        destroys="All sequential structure"
+        destroys="All sequential structure",
+        density_only=True
     )
 
     # Metrics - multiple compressors required
     register_metric("zlib", metric_compression_zlib, MetricDirection.LOWER, "zlib compression ratio")
     register_metric("bz2", metric_compression_bz2, MetricDirection.LOWER, "bz2 compression ratio")
     register_metric("lzma", metric_compression_lzma, MetricDirection.LOWER, "lzma compression ratio")
+    for compressor in ["zlib", "bz2", "lzma"]:
+        for suffix, width in PACKED_WIDTHS.items():
+            register_metric(
+                f"{compressor}_{suffix}",
+                lambda bits, c=compressor, w=width: metric_compression_packed(bits, c, w),
+                MetricDirection.LOWER,
+                f"{compressor} bits per bit, {width} bits per input byte",
+                effect_scale=1.0
+            )
+    register_metric(
+        "ctw", metric_ctw, MetricDirection.LOWER,
+        f"CTW (depth {CTW_DEPTH}) code length, bits per bit", effect_scale=1.0
+    )
+    for order in [8, 16]:
+        register_metric(
+            f"kt_{order}", lambda bits, k=order: metric_kt(bits, k), MetricDirection.LOWER,
+            f"Adaptive order-{order} KT code length, bits per bit", effect_scale=1.0
+        )
+    register_metric(
+        "lz76", metric_lz76, MetricDirection.LOWER,
+        "Normalised Lempel-Ziv (1976) complexity", effect_scale=1.0
+    )
+    for k in BLOCK_ENTROPY_KS:
+        register_metric(
+            f"block_entropy_{k}", lambda bits, k=k: metric_block_entropy(bits, k),
+            MetricDirection.LOWER, f"Block entropy H_{k} / {k}, bits per bit", effect_scale=1.0
+        )
+    for max_lag in DEPENDENCE_LAGS:
+        register_metric(
+            f"mi_sum_{max_lag}", lambda bits, L=max_lag: metric_mi_sum(bits, L),
+            MetricDirection.HIGHER, f"Lagged mutual information summed over lags 1..{max_lag}, bits",
+            effect_scale=1.0, effect_unit="bits MI (summed over lags)"
+        )
+        register_metric(
+            f"acf_sum_{max_lag}", lambda bits, L=max_lag: metric_acf_sum(bits, L),
+            MetricDirection.HIGHER, f"Squared autocorrelation summed over lags 1..{max_lag}",
+            effect_scale=1.0, effect_unit="sum rho^2"
+        )
 
 
 _init_builtins()
@@ -303,6 +732,21 @@ _init_builtins()
 # TEST SPECIFICATION
 # ============================================================
 
+SEED_MODES = ("stream", "spawn")
+
+# Sequential permutation stopping:
+#   besag_clifford: stop once stop_h nulls are as extreme; p = h / L
+#   alpha_bound:    stop once a binomial bound puts p clearly above or
+#                   below alpha (checked every SEQUENTIAL_LOOK permutations)
+STOPPING_RULES = ("besag_clifford", "alpha_bound")
+
+# Exact mode: enumerate the null when it has at most this many distinct
+# orders (default of TestSpec.exact_max_orders)
+EXACT_MAX_ORDERS = 100_000
+SEQUENTIAL_LOOK = 50
+SEQUENTIAL_DELTA = 0.001  # Total error budget of alpha_bound across all looks
+
+
 @dataclass(frozen=True)
 class TestSpec:
     """
@@ -316,6 +760,12 @@ class TestSpec:
     metric: str
     n_perm: int = 1000
     seed: int = 42
+    seed_mode: str = "stream"  # "stream": one rng; "spawn": one rng per permutation
+    stopping: Optional[str] = None  # Sequential rule, see STOPPING_RULES
+    stop_h: int = 10  # besag_clifford: stop after h nulls as extreme as observed
+    alpha: float = 0.05  # alpha_bound: level the p-value is judged against
+    exact: bool = False  # Enumerate small nulls exactly (else n_perm Monte Carlo)
+    exact_max_orders: int = EXACT_MAX_ORDERS  # exact: largest null enumerated
 
     def validate(self) -> List[str]:
         """
@@ -330,204 +780,1081 @@ class TestSpec:
             errors.append(f"Encoding '{self.encoding}' not registered")
         if self.null not in NULLS:
             errors.append(f"Null model '{self.null}' not registered")
+        elif self.corpus in CORPORA:
+            missing = set(NULLS[self.null].levels) - set(CORPORA[self.corpus].boundary_levels())
+            if missing:
+                errors.append(f"Null '{self.null}' needs corpus boundaries: {sorted(missing)}")
         if self.metric not in METRICS:
             errors.append(f"Metric '{self.metric}' not registered")
         if self.n_perm < 100:
             errors.append("n_perm must be >= 100 for meaningful p-value")
+        if self.seed_mode not in SEED_MODES:
+            errors.append(f"seed_mode must be one of {SEED_MODES}")
+        if self.stopping is not None and self.stopping not in STOPPING_RULES:
+            errors.append(f"stopping must be None or one of {STOPPING_RULES}")
+        if self.stop_h < 1:
+            errors.append("stop_h must be >= 1")
+        if not 0 < self.alpha < 1:
+            errors.append("alpha must be in (0, 1)")
+        if self.exact and self.null in NULLS and NULLS[self.null].exact_fn is None:
+            errors.append(f"Null '{self.null}' has no exact enumeration")
+        if self.exact_max_orders < 1:
+            errors.append("exact_max_orders must be >= 1")
         return errors
 
 
 @dataclass
 class TestResult:
-    """Result of a single test."""
+    """
+    Result of a single test.
+
+    null_distribution holds every null sample; in streaming mode it is
+    None and null_summary (constant memory, mergeable) is kept instead.
+    """
     spec: TestSpec
     observed: float
-    null_distribution: List[float]
+    null_distribution: Optional[List[float]]
     p_value: float
-    effect_bits_per_char: float
+    effect_bits_per_char: float  # In effect_unit(spec.metric): bits/char for code lengths
+    n_perm_used: Optional[int] = None  # < spec.n_perm if stopped early
+    null_summary: Optional[NullSummary] = field(default=None, compare=False, repr=False)
+    exact: bool = False  # Null enumerated exhaustively (n_perm_used = distinct orders)
+
+    def __post_init__(self):
+        if self.null_distribution is None and self.null_summary is None:
+            raise ValueError("TestResult needs null_distribution or null_summary")
+        if self.n_perm_used is None:
+            self.n_perm_used = (
+                len(self.null_distribution) if self.null_distribution is not None
+                else self.null_summary.n
+            )
+
+    @property
+    def summary_stats(self) -> NullSummary:
+        """Summary of the null (built once from the samples if needed)."""
+        if self.null_summary is None:
+            metric = METRICS.get(self.spec.metric)
+            lower = metric is None or metric.direction == MetricDirection.LOWER
+            self.null_summary = NullSummary.from_values(self.null_distribution, self.observed, lower)
+        return self.null_summary
+
+    @property
+    def stopped_early(self) -> bool:
+        return not self.exact and self.n_perm_used < self.spec.n_perm
 
     @property
     def null_mean(self) -> float:
-        return sum(self.null_distribution) / len(self.null_distribution)
+        return self.summary_stats.mean
 
     @property
     def null_std(self) -> float:
-        mean = self.null_mean
-        return (sum((x - mean)**2 for x in self.null_distribution) / len(self.null_distribution)) ** 0.5
+        return self.summary_stats.std
 
     def is_significant(self, alpha: float = 0.05) -> bool:
         return self.p_value < alpha
 
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form (used by the result cache)."""
+        data = {
+            "spec": asdict(self.spec),
+            "observed": self.observed,
+            "null_distribution": self.null_distribution,
+            "p_value": self.p_value,
+            "effect_bits_per_char": self.effect_bits_per_char,
+            "n_perm_used": self.n_perm_used,
+            "exact": self.exact,
+        }
+        if self.null_distribution is None:
+            data["null_summary"] = self.null_summary.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TestResult":
+        summary = data.get("null_summary")
+        return cls(
+            spec=TestSpec(**data["spec"]),
+            observed=data["observed"],
+            null_distribution=data["null_distribution"],
+            p_value=data["p_value"],
+            effect_bits_per_char=data["effect_bits_per_char"],
+            n_perm_used=data["n_perm_used"],
+            null_summary=NullSummary.from_dict(summary) if summary else None,
+            exact=data.get("exact", False),
+        )
+
     def summary(self) -> str:
         return (
             f"p={self.p_value:.4f}, "
-            f"effect={self.effect_bits_per_char:.4f} bits/char, "
+            f"effect={self.effect_bits_per_char:.4f} {effect_unit(self.spec.metric)}, "
             f"observed={self.observed:.4f}, "
             f"null={self.null_mean:.4f}±{self.null_std:.4f}"
+            + (f", stopped at n={self.n_perm_used}" if self.stopped_early else "")
+            + (f", exact over {self.n_perm_used} orders" if self.exact else "")
         )
 
 
 # ============================================================
-# TEST EXECUTION
+# WORD TABLES (pre-encoded word-level nulls)
 # ============================================================
 
-def run_test(spec: TestSpec) -> TestResult:
-    """
-    Execute a validated test specification.
+# Keyed by registry metadata, so re-registering a name invalidates the entry
+_WORD_TABLES: Dict[CorpusMeta, WordTable] = {}
+_LETTER_TABLES: Dict[CorpusMeta, LetterTable] = {}
+_SEGMENT_TABLES: Dict[Tuple[CorpusMeta, EncodingMeta, str], Optional[SegmentTable]] = {}
 
-    This is THE entry point. No escape from validation.
-    """
-    # Validate first
-    errors = spec.validate()
-    if errors:
-        raise ValueError(f"Invalid TestSpec: {'; '.join(errors)}")
 
-    # Get components
-    corpus = CORPORA[spec.corpus]
-    encoding = ENCODINGS[spec.encoding]
-    null = NULLS[spec.null]
-    metric = METRICS[spec.metric]
+def get_word_table(corpus: CorpusMeta) -> WordTable:
+    """Tokenise a corpus once."""
+    if corpus not in _WORD_TABLES:
+        _WORD_TABLES[corpus] = WordTable(corpus.text, corpus.boundary_levels())
+    return _WORD_TABLES[corpus]
 
-    rng = random.Random(spec.seed)
 
-    # Encode original text
-    bits = encoding.fn(corpus.text)
-    if not bits:
-        raise ValueError(f"Encoding {spec.encoding} produced empty bitstring")
+def get_letter_table(corpus: CorpusMeta) -> LetterTable:
+    """Tokenise a corpus into characters once."""
+    if corpus not in _LETTER_TABLES:
+        _LETTER_TABLES[corpus] = LetterTable(corpus.text)
+    return _LETTER_TABLES[corpus]
 
-    # Compute observed metric
-    observed = metric.fn(bits)
 
-    # Generate null distribution
-    null_distribution = []
+def get_token_table(corpus: CorpusMeta, unit: str = "word") -> TokenTable:
+    return get_letter_table(corpus) if unit == "letter" else get_word_table(corpus)
 
-    for _ in range(spec.n_perm):
-        if null.null_type == NullType.TEXT:
-            # Null operates on text, then encode
-            null_text = null.fn(corpus.text, rng)
-            null_bits = encoding.fn(null_text)
-        else:
-            # Null operates on bits directly
-            null_bits = null.fn(bits, rng)
 
-        null_distribution.append(metric.fn(null_bits))
+def get_segment_table(
+    corpus: CorpusMeta,
+    encoding: EncodingMeta,
+    bits: Bits,
+    unit: str = "word"
+) -> Optional[SegmentTable]:
+    """
+    Pre-encode every distinct corpus word (or character) once.
 
-    # Compute p-value
-    if metric.direction == MetricDirection.LOWER:
-        # Lower = more structure, count how many nulls are as extreme
-        count_extreme = sum(1 for x in null_distribution if x <= observed)
-    else:
-        # Higher = more structure
-        count_extreme = sum(1 for x in null_distribution if x >= observed)
+    Returns None if the encoding is not separable at that unit
+    (then nulls must re-encode the full permuted text).
+    """
+    key = (corpus, encoding, unit)
+    if key not in _SEGMENT_TABLES:
+        _SEGMENT_TABLES[key] = build_segment_table(
+            get_token_table(corpus, unit), encoding.fn, bits
+        )
+    return _SEGMENT_TABLES[key]
 
-    p_value = (count_extreme + 1) / (spec.n_perm + 1)
 
-    # Effect size in bits/char
-    null_mean = sum(null_distribution) / len(null_distribution)
-    effect_bits_per_char = (null_mean - observed) * 8  # CR difference * 8 bits/byte
+# ============================================================
+# RESULT CACHE
+# ============================================================
 
-    return TestResult(
-        spec=spec,
-        observed=observed,
-        null_distribution=null_distribution,
-        p_value=p_value,
-        effect_bits_per_char=effect_bits_per_char
-    )
+RESULT_CACHE: Optional[ResultCache] = None
 
 
-# ============================================================
-# LENGTH-SCALE DIAGNOSTIC
-# ============================================================
+def enable_result_cache(
+    directory: str = "output/cache",
+    max_bytes: int = DEFAULT_MAX_BYTES
+) -> ResultCache:
+    """
+    Persist run_test results on disk.
 
-@dataclass(frozen=True)
-class LengthScaleSpec:
-    """Specification for length-scale diagnostic."""
-    corpus: str
-    encoding: str
-    metric: str
-    block_sizes: Tuple[int, ...] = (1, 2, 4, 8, 16, 32, 64, 128)
-    n_perm: int = 1000
-    seed: int = 42
+    Keys cover the spec, corpus text and component implementations,
+    so a hit is always the result a fresh run would produce.
+    """
+    global RESULT_CACHE
+    RESULT_CACHE = ResultCache(directory, max_bytes)
+    return RESULT_CACHE
 
-    def validate(self) -> List[str]:
-        errors = []
-        if self.corpus not in CORPORA:
-            errors.append(f"Corpus '{self.corpus}' not registered")
-        if self.encoding not in ENCODINGS:
-            errors.append(f"Encoding '{self.encoding}' not registered")
-        if self.metric not in METRICS:
-            errors.append(f"Metric '{self.metric}' not registered")
-        return errors
 
+def disable_result_cache() -> None:
+    global RESULT_CACHE
+    RESULT_CACHE = None
 
-@dataclass
-class LengthScaleResult:
-    """Result of length-scale diagnostic."""
-    spec: LengthScaleSpec
-    curve: List[Tuple[int, float, float]]  # (block_size, effect_bits/char, p_value)
 
-    def vanishes_at(self, threshold: float = 0.01) -> Optional[int]:
-        """
-        At what block size does the effect vanish?
+def _null_boundaries(corpus: CorpusMeta, null: NullMeta) -> Dict[str, Tuple[int, ...]]:
+    """The corpus boundary levels a null reads (part of its input)."""
+    levels = corpus.boundary_levels()
+    return {level: levels[level] for level in null.levels}
 
-        Returns None if effect persists at all scales.
-        """
-        for block_size, effect, p in self.curve:
-            if abs(effect) < threshold or p > 0.05:
-                return block_size
-        return None
 
-    def interpretation(self) -> str:
-        """Human-readable interpretation."""
-        vanish = self.vanishes_at()
-        if vanish is None:
-            return "LONG-RANGE: Structure persists at all tested scales"
-        elif vanish <= 2:
-            return "LETTER-LOCAL: Structure is within adjacent letters only"
-        elif vanish <= 8:
-            return f"WORD-SCALE: Structure vanishes at ~{vanish} letters"
-        elif vanish <= 32:
-            return f"PHRASE-SCALE: Structure vanishes at ~{vanish} letters"
-        else:
-            return f"SENTENCE-SCALE: Structure vanishes at ~{vanish} letters"
+def _key_spec(spec: TestSpec) -> Dict[str, Any]:
+    """The spec plus any corpus boundaries its null reads."""
+    null = NULLS[spec.null]
+    key_spec = asdict(spec)
+    if not spec.exact:
+        del key_spec["exact_max_orders"]  # Unused: keys stay those of older specs
+    if null.levels:
+        key_spec["boundaries"] = _null_boundaries(CORPORA[spec.corpus], null)
+    return key_spec
+
+
+def _component_fns(spec: TestSpec) -> List[Optional[Callable]]:
+    null = NULLS[spec.null]
+    return [ENCODINGS[spec.encoding].fn, null.fn, null.index_fn, METRICS[spec.metric].fn,
+            _make_result]  # Engine: p-value / effect semantics
 
-    def summary_table(self) -> str:
-        """Format results as table."""
-        lines = ["Block Size | Effect (bits/char) | p-value"]
-        lines.append("-" * 45)
-        for block_size, effect, p in self.curve:
-            sig = "*" if p < 0.05 else ""
-            lines.append(f"{block_size:10d} | {effect:18.4f} | {p:.4f}{sig}")
-        lines.append("")
-        lines.append(f"Interpretation: {self.interpretation()}")
-        return "\n".join(lines)
 
+def _cache_key(spec: TestSpec) -> str:
+    return ResultCache.make_key(_key_spec(spec), CORPORA[spec.corpus].text, _component_fns(spec))
 
-def run_length_scale_test(spec: LengthScaleSpec) -> LengthScaleResult:
+
+def job_key(spec: TestSpec) -> str:
     """
-    Run length-scale diagnostic.
+    Stable identity of a test: spec + corpus, NOT the implementations.
 
-    Shows at what scale structure vanishes → reveals if structure
-    is letter-local, word-scale, phrase-scale, or long-range.
+    For job queues, whose entries must survive code edits; pair it with
+    code_fingerprint to tell whether a stored result is stale.
     """
-    errors = spec.validate()
-    if errors:
-        raise ValueError(f"Invalid LengthScaleSpec: {'; '.join(errors)}")
+    return ResultCache.make_key(_key_spec(spec), CORPORA[spec.corpus].text, [])
 
-    curve = []
 
-    for block_size in spec.block_sizes:
-        null_name = f"block_{block_size}"
+def code_fingerprint(spec: TestSpec) -> str:
+    """Hash of the implementations a test runs (encoding, null, metric, engine)."""
+    fingerprints = "|".join(fingerprint_fn(fn) for fn in _component_fns(spec))
+    return hashlib.sha256(fingerprints.encode()).hexdigest()
 
-        # Ensure null exists
-        if null_name not in NULLS:
-            register_null(
-                null_name,
-                lambda t, rng, k=block_size: null_block_shuffle_letters(t, k, rng),
-                NullType.TEXT,
-                preserves=f"Patterns within {block_size}-letter blocks",
-                destroys=f"Patterns across {block_size}-letter blocks"
-            )
+
+def _cached_result(spec: TestSpec, need_distribution: bool = True) -> Optional[TestResult]:
+    """Cached result, or None (also for summary-only entries when the full null is needed)."""
+    if RESULT_CACHE is None:
+        return None
+    data = RESULT_CACHE.get(_cache_key(spec))
+    if data is None:
+        return None
+    result = TestResult.from_dict(data)
+    if need_distribution and result.null_distribution is None:
+        return None
+    return result
+
+
+def _store_result(result: TestResult) -> None:
+    # Streaming results keep only a summary: never cache them under the
+    # key that full-distribution callers (batch, family) read
+    if RESULT_CACHE is not None and result.null_distribution is not None:
+        RESULT_CACHE.put(_cache_key(result.spec), result.to_dict())
+
+
+# ============================================================
+# PERMUTATION BANK
+# ============================================================
+
+PERMUTATION_BANK: Optional[PermutationBank] = None
+
+
+def enable_permutation_bank(
+    directory: str = "output/perm_bank",
+    max_bytes: int = MAX_BANK_BYTES
+) -> PermutationBank:
+    """
+    Draw index-null permutations once per (corpus, null, seed) and reuse
+    them, memory-mapped, in every later test. Same results as drawing.
+
+    Banks larger than max_bytes (letter-level nulls with many
+    permutations) are not stored; those tests draw as usual.
+    """
+    global PERMUTATION_BANK
+    PERMUTATION_BANK = PermutationBank(directory, max_bytes)
+    return PERMUTATION_BANK
+
+
+def disable_permutation_bank() -> None:
+    global PERMUTATION_BANK
+    PERMUTATION_BANK = None
+
+
+def _permutation_bank(sampler: "_NullSampler", spec: TestSpec) -> Optional[np.ndarray]:
+    """Bank rows for spec's draws (None if disabled or not an index null)."""
+    if PERMUTATION_BANK is None or sampler.table is None:
+        return None
+    if not PERMUTATION_BANK.fits(spec.n_perm, len(sampler.table)):
+        return None
+    null = sampler.null
+    key = PermutationBank.make_key(
+        sampler.corpus.text, null.name, null.index_fn, null.index_unit, spec.seed, spec.seed_mode,
+        _null_boundaries(sampler.corpus, null)
+    )
+
+    def draw(n: int) -> Iterator[np.ndarray]:
+        for rng in _PermutationRngs(spec)(0, n):
+            yield null.index_fn(sampler.table, rng)
+
+    return PERMUTATION_BANK.get_or_create(key, spec.n_perm, len(sampler.table), draw)
+
+
+# ============================================================
+# NULL DISTRIBUTION CACHE
+# ============================================================
+
+NULL_CACHE: Optional[NullDistributionCache] = None
+
+
+def enable_null_cache(directory: str = "output/null_cache") -> NullDistributionCache:
+    """
+    Compute the null distribution of density-only nulls (e.g. "random")
+    once per (metric, length, ones, seed) and reuse it in later tests,
+    whatever the corpus or encoding. Same results as sampling.
+    """
+    global NULL_CACHE
+    NULL_CACHE = NullDistributionCache(directory)
+    return NULL_CACHE
+
+
+def disable_null_cache() -> None:
+    global NULL_CACHE
+    NULL_CACHE = None
+
+
+def _cached_null_values(
+    spec: TestSpec,
+    metric: MetricMeta,
+    sampler: "_NullSampler",
+    workers: int
+) -> Optional[np.ndarray]:
+    """Null values of spec's draws from the null cache (None if not applicable)."""
+    null = sampler.null
+    if NULL_CACHE is None or not null.density_only:
+        return None
+    bits = sampler.bits
+    key = NullDistributionCache.make_key(
+        metric.name, metric.fn, null.name, null.fn,
+        len(bits), bits.count('1'), spec.seed, spec.seed_mode
+    )
+
+    def compute(n: int) -> List[float]:
+        rngs = _PermutationRngs(spec)
+
+        def task(start: int, stop: int) -> List[float]:
+            return [metric.fn(null_bits) for null_bits in sampler.sample_many(rngs(start, stop), start)]
+
+        return _map_permutations(task, n, workers)
+
+    return NULL_CACHE.get_or_create(key, spec.n_perm, compute)
+
+
+# ============================================================
+# TEST EXECUTION
+# ============================================================
+
+# Surrogates generated together by a null's batch_fn
+NULL_BATCH = 32
+
+
+class _NullSampler:
+    """Generates null bitstrings for one (corpus, encoding, null)."""
+
+    def __init__(
+        self,
+        corpus: CorpusMeta,
+        encoding: EncodingMeta,
+        null: NullMeta,
+        bits: Bits,
+        use_word_table: bool = True
+    ):
+        self.corpus = corpus
+        self.encoding = encoding
+        self.null = null
+        self.bits = bits
+
+        # Index nulls: pre-encode words (or letters) once.
+        # Hierarchical nulls always draw positions (their text form has
+        # no boundaries); without the word table they re-encode.
+        self.table = self.segments = None
+        if null.index_fn is not None and (use_word_table or null.levels):
+            self.table = get_token_table(corpus, null.index_unit)
+        if use_word_table and self.table is not None:
+            self.segments = get_segment_table(corpus, encoding, bits, null.index_unit)
+
+        self.bank: Optional[np.ndarray] = None  # Precomputed positions, see use_bank
+
+    def use_bank(self, spec: TestSpec) -> None:
+        """Read positions from the permutation bank for spec's draws (if enabled)."""
+        self.bank = _permutation_bank(self, spec)
+
+    def require_table(self) -> TokenTable:
+        """Token table for an index null, even without segments (re-encode path)."""
+        if self.table is None:
+            self.table = get_token_table(self.corpus, self.null.index_unit)
+        return self.table
+
+    def positions(self, rng: random.Random, index: Optional[int] = None) -> np.ndarray:
+        """Positions of permutation `index` (banked) or drawn from rng."""
+        if self.bank is not None and index is not None:
+            return self.bank[index]
+        return self.null.index_fn(self.table, rng)
+
+    def from_positions(self, positions: np.ndarray) -> Bits:
+        """Null bits for a position order drawn by the null's index_fn."""
+        if self.segments is not None:
+            if isinstance(self.bits, BitSeq):
+                return self.segments.bitseq_for(positions)
+            return self.segments.bits_for(positions)
+        return self.encoding.fn(self.table.text_for(positions))
+
+    def sample(self, rng: random.Random, index: Optional[int] = None) -> Bits:
+        """Draw one null bitstring (same form as the observed bits)."""
+        if self.table is not None:
+            return self.from_positions(self.positions(rng, index))
+        if self.null.null_type == NullType.TEXT:
+            # Null operates on text, then encode
+            return self.encoding.fn(self.null.fn(self.corpus.text, rng))
+        # Null operates on bits directly
+        return self.null.fn(self.bits, rng)
+
+    def sample_many(self, rngs: Iterable[random.Random], start: int = 0) -> Iterator[Bits]:
+        """Nulls start, start+1, ... one per rng (batched when the null supports it)."""
+        if self.null.batch_fn is None or self.table is not None:
+            for index, rng in enumerate(rngs, start):
+                yield self.sample(rng, index)
+            return
+        rngs = iter(rngs)
+        while True:
+            batch = list(itertools.islice(rngs, NULL_BATCH))
+            if not batch:
+                return
+            yield from self.null.batch_fn(self.bits, batch)
+
+
+class _BatchSampler:
+    """
+    One null draw per permutation, applied to several encodings.
+
+    Common random numbers: every encoding sees the same word order
+    (index / TEXT nulls). Bit-level nulls have no common draw: each
+    encoding is drawn from its own rngs, exactly as run_test draws it.
+    """
+
+    def __init__(self, samplers: List[_NullSampler]):
+        self.samplers = samplers
+
+    @property
+    def shares_draws(self) -> bool:
+        """Is one draw meaningful for every encoding (a word order or a text)?"""
+        first = self.samplers[0]
+        return first.table is not None or first.null.null_type == NullType.TEXT
+
+    def use_bank(self, spec: TestSpec) -> None:
+        self.samplers[0].use_bank(spec)
+
+    def sample(self, rng: random.Random, index: Optional[int] = None) -> List[Bits]:
+        first = self.samplers[0]
+        if len(self.samplers) == 1:
+            return [first.sample(rng, index)]
+
+        null = first.null
+        if first.table is not None:
+            positions = first.positions(rng, index)
+            return [s.from_positions(positions) for s in self.samplers]
+        if null.null_type == NullType.TEXT:
+            null_text = null.fn(first.corpus.text, rng)
+            return [s.encoding.fn(null_text) for s in self.samplers]
+        raise ValueError(f"Null '{null.name}' has no draw shared across encodings")
+
+    def task(self, spec: TestSpec, metrics: List[MetricMeta]) -> Callable[[int, int], List[List[List[float]]]]:
+        """
+        Metric values of permutations [start, stop), one row per
+        permutation: [encoding][metric]. Each encoding's values equal
+        run_test on its own TestSpec (spec gives seed and seed mode).
+        """
+        if self.shares_draws:
+            self.use_bank(spec)
+            rngs = _PermutationRngs(spec)
+
+            def shared(start: int, stop: int) -> List[List[List[float]]]:
+                return [
+                    [[m.fn(null_bits) for m in metrics] for null_bits in self.sample(rng, index)]
+                    for index, rng in enumerate(rngs(start, stop), start)
+                ]
+            return shared
+
+        encoding_rngs = [_PermutationRngs(spec) for _ in self.samplers]
+
+        def separate(start: int, stop: int) -> List[List[List[float]]]:
+            columns = [
+                [[m.fn(null_bits) for m in metrics] for null_bits in s.sample_many(r(start, stop), start)]
+                for s, r in zip(self.samplers, encoding_rngs)
+            ]
+            return [list(row) for row in zip(*columns)]
+        return separate
+
+
+def permutation_rng(seed: int, index: int) -> random.Random:
+    """
+    Independent rng for permutation `index` (seed_mode="spawn").
+
+    Equivalent to SeedSequence(seed).spawn(n)[index], so each null sample
+    depends only on (seed, index) - not on which worker draws it.
+    """
+    state = np.random.SeedSequence(seed, spawn_key=(index,)).generate_state(4)
+    return random.Random(int.from_bytes(state.tobytes(), 'little'))
+
+
+class _PermutationRngs:
+    """Rng for each permutation index, in either seed mode."""
+
+    def __init__(self, spec: TestSpec):
+        self.seed = spec.seed
+        self.stream = random.Random(spec.seed) if spec.seed_mode == "stream" else None
+        self.next = 0
+
+    def __call__(self, start: int, stop: int):
+        """Rngs for permutations [start, stop)."""
+        if self.stream is None:
+            return (permutation_rng(self.seed, i) for i in range(start, stop))
+        # One stream: chunks must be consumed in order, in this process
+        if start != self.next:
+            raise ValueError("seed_mode='stream' must draw permutations in order")
+        self.next = stop
+        return (self.stream for _ in range(start, stop))
+
+    def getstate(self) -> Optional[list]:
+        """JSON-serialisable position (None in spawn mode: nothing to save)."""
+        if self.stream is None:
+            return None
+        version, internal, gauss = self.stream.getstate()
+        return [self.next, version, list(internal), gauss]
+
+    def setstate(self, state: Optional[list]) -> None:
+        if state is None:
+            return
+        self.next, version, internal, gauss = state
+        self.stream.setstate((version, tuple(internal), gauss))
+
+
+# Task inherited by forked workers (set only while a pool is running)
+_WORKER_TASK: Optional[Callable[[int, int], list]] = None
+
+
+def _run_worker_task(bounds: Tuple[int, int]) -> list:
+    return _WORKER_TASK(*bounds)
+
+
+def _map_permutations(
+    task: Callable[[int, int], list],
+    n: int,
+    workers: int = 1,
+    start: int = 0
+) -> list:
+    """
+    Run task(start, stop) over permutation indices [start, n).
+
+    With workers > 1, contiguous chunks run in forked processes and are
+    concatenated in index order. Registries (including lambdas) are
+    inherited through fork, so nothing needs to be pickled but the output.
+    """
+    global _WORKER_TASK
+
+    size = n - start
+    if workers <= 1 or size <= 1 or "fork" not in mp.get_all_start_methods():
+        return task(start, n)
+
+    n_chunks = min(size, workers * 4)
+    bounds = [
+        (start + size * k // n_chunks, start + size * (k + 1) // n_chunks)
+        for k in range(n_chunks)
+    ]
+
+    _WORKER_TASK = task
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("fork")) as pool:
+            chunks = list(pool.map(_run_worker_task, bounds))
+    finally:
+        _WORKER_TASK = None
+
+    return [x for chunk in chunks for x in chunk]
+
+
+def _prepare_test(
+    spec: TestSpec,
+    use_word_table: bool,
+    workers: int = 1
+) -> Tuple[MetricMeta, float, _NullSampler, "_PermutationRngs", Callable[[int, int], List[float]], Optional[int]]:
+    """
+    Encode, score the observed text and set up null sampling for a spec.
+
+    The last value is the number of distinct null orders when the null
+    is enumerated exactly (spec.exact and small enough), else None.
+    """
+    # Get components
+    corpus = CORPORA[spec.corpus]
+    encoding = ENCODINGS[spec.encoding]
+    null = NULLS[spec.null]
+    metric = METRICS[spec.metric]
+
+    # Encode original text
+    bits = encoding.fn(corpus.text)
+    if not bits:
+        raise ValueError(f"Encoding {spec.encoding} produced empty bitstring")
+
+    # Compute observed metric
+    observed = metric.fn(bits)
+
+    # Generate null distribution
+    sampler = _NullSampler(corpus, encoding, null, bits, use_word_table)
+    rngs = _PermutationRngs(spec)
+
+    # Exact mode: every distinct order once, read like a permutation bank
+    n_exact = None
+    if spec.exact:
+        orders = null.exact_fn(sampler.require_table(), spec.exact_max_orders)
+        if orders is not None:
+            sampler.bank = orders
+            n_exact = len(orders)
+    if n_exact is None:
+        sampler.use_bank(spec)
+
+    cached = _cached_null_values(spec, metric, sampler, workers)
+    if n_exact is not None:
+        memo: Dict[Bits, float] = {}  # Different orders can encode alike
+
+        def task(start: int, stop: int) -> List[float]:
+            values = []
+            for index in range(start, stop):
+                null_bits = sampler.from_positions(sampler.bank[index])
+                if null_bits not in memo:
+                    memo[null_bits] = metric.fn(null_bits)
+                values.append(memo[null_bits])
+            return values
+    elif cached is not None:
+        def task(start: int, stop: int) -> List[float]:
+            rngs(start, stop)  # Same in-order checks as sampling
+            return cached[start:stop].tolist()
+    else:
+        def task(start: int, stop: int) -> List[float]:
+            return [metric.fn(null_bits) for null_bits in sampler.sample_many(rngs(start, stop), start)]
+
+    return metric, observed, sampler, rngs, task, n_exact
+
+
+def run_test(
+    spec: TestSpec,
+    use_word_table: bool = True,
+    workers: int = 1,
+    use_cache: bool = True,
+    streaming: bool = False
+) -> TestResult:
+    """
+    Execute a validated test specification.
+
+    This is THE entry point. No escape from validation.
+
+    Args:
+        spec: Frozen test specification
+        use_word_table: Assemble word/letter-level nulls from pre-encoded
+            tokens (same null distribution as re-encoding, much faster).
+            Falls back automatically for non-separable encodings.
+        workers: Processes for the null distribution. Requires
+            seed_mode="spawn"; results are identical for any worker count.
+        use_cache: Read/write the result cache (if enabled). Streaming
+            results are read from cached full runs but never stored.
+        streaming: Keep a constant-memory NullSummary instead of every
+            null sample (result.null_distribution is None). Same p-value.
+
+    With spec.exact, a null with at most spec.exact_max_orders distinct orders
+    is enumerated instead of sampled (exact p-value; streaming and
+    stopping do not apply). Larger nulls use n_perm Monte Carlo draws.
+    """
+    # Validate first
+    errors = spec.validate()
+    if errors:
+        raise ValueError(f"Invalid TestSpec: {'; '.join(errors)}")
+    if workers > 1 and spec.seed_mode != "spawn":
+        raise ValueError("workers > 1 requires seed_mode='spawn'")
+    if streaming and spec.stopping is not None:
+        raise ValueError("streaming mode does not support sequential stopping")
+
+    if use_cache:
+        cached = _cached_result(spec, need_distribution=not streaming)
+        if cached is not None:
+            return cached
+
+    metric, observed, sampler, rngs, task, n_exact = _prepare_test(spec, use_word_table, workers)
+
+    if n_exact is not None:
+        result = _make_exact_result(spec, metric, observed, _map_permutations(task, n_exact, workers))
+    elif streaming:
+        lower = metric.direction == MetricDirection.LOWER
+
+        def summary_task(start: int, stop: int) -> List[NullSummary]:
+            # NULL_BATCH values at a time: memory does not grow with the range
+            summary = NullSummary(observed, lower)
+            for chunk_start in range(start, stop, NULL_BATCH):
+                summary.extend(task(chunk_start, min(stop, chunk_start + NULL_BATCH)))
+            return [summary]
+
+        chunks = _map_permutations(summary_task, spec.n_perm, workers)
+        summary = chunks[0]
+        for chunk in chunks[1:]:
+            summary.merge(chunk)
+        result = TestResult(
+            spec=spec,
+            observed=observed,
+            null_distribution=None,
+            p_value=summary.p_value,
+            effect_bits_per_char=metric.effect(observed, summary.mean),
+            null_summary=summary
+        )
+    elif spec.stopping is not None:
+        result = _run_sequential(spec, metric, observed, task, workers)
+    else:
+        null_distribution = _map_permutations(task, spec.n_perm, workers)
+        result = _make_result(spec, metric, observed, null_distribution)
+
+    if use_cache:
+        _store_result(result)
+    return result
+
+
+def run_test_resumable(
+    spec: TestSpec,
+    checkpoint: Optional[Callable[[Dict[str, Any]], None]] = None,
+    resume: Optional[Dict[str, Any]] = None,
+    checkpoint_every: int = 100,
+    use_word_table: bool = True,
+    workers: int = 1,
+    use_cache: bool = True
+) -> TestResult:
+    """
+    run_test that can be killed and resumed.
+
+    After every `checkpoint_every` permutations, checkpoint(state) is
+    called with the partial null distribution and rng position (JSON
+    serialisable). Passing that state back as `resume` continues from
+    where it stopped; the final result equals an uninterrupted run_test.
+    """
+    errors = spec.validate()
+    if errors:
+        raise ValueError(f"Invalid TestSpec: {'; '.join(errors)}")
+    if workers > 1 and spec.seed_mode != "spawn":
+        raise ValueError("workers > 1 requires seed_mode='spawn'")
+
+    if use_cache:
+        cached = _cached_result(spec)
+        if cached is not None:
+            return cached
+
+    metric, observed, sampler, rngs, task, n_exact = _prepare_test(spec, use_word_table, workers)
+
+    values: List[float] = []
+    if resume is not None:
+        values = list(resume["values"])
+        rngs.setstate(resume["rng_state"])
+
+    result = None
+    if n_exact is not None:
+        result = _make_exact_result(spec, metric, observed, _map_permutations(task, n_exact, workers))
+    stopper = _SequentialStop(spec, metric, observed)
+    while result is None:
+        if spec.stopping is not None:
+            decision = stopper.update(values)
+            if decision is not None:
+                n_used, p_value = decision
+                result = _make_result(spec, metric, observed, values[:n_used], p_value)
+                break
+        if len(values) >= spec.n_perm:
+            result = _make_result(spec, metric, observed, values)
+            break
+
+        stop = min(spec.n_perm, len(values) + checkpoint_every)
+        values.extend(_map_permutations(task, stop, workers, start=len(values)))
+        if checkpoint is not None:
+            checkpoint({"values": values, "rng_state": rngs.getstate()})
+
+    if use_cache:
+        _store_result(result)
+    return result
+
+
+def _is_extreme(metric: MetricMeta, value: float, observed: float) -> bool:
+    """Is a null value at least as structured as the observed one?"""
+    if metric.direction == MetricDirection.LOWER:
+        # Lower = more structure
+        return value <= observed
+    # Higher = more structure
+    return value >= observed
+
+
+def _binomial_cdf(k: int, n: int, p: float) -> float:
+    """P(X <= k) for X ~ Binomial(n, p)."""
+    if k < 0:
+        return 0.0
+    if k >= n:
+        return 1.0
+    log_p, log_q = math.log(p), math.log1p(-p)
+    log_norm = math.lgamma(n + 1)
+    return min(1.0, sum(
+        math.exp(log_norm - math.lgamma(i + 1) - math.lgamma(n - i + 1)
+                 + i * log_p + (n - i) * log_q)
+        for i in range(k + 1)
+    ))
+
+
+class _SequentialStop:
+    """
+    The spec's stopping rule applied to null values as they arrive.
+
+    Keeps a running exceedance count, so every value is looked at once.
+    The decision depends only on the values, never on chunking.
+    """
+
+    def __init__(self, spec: TestSpec, metric: MetricMeta, observed: float):
+        self.spec = spec
+        self.metric = metric
+        self.observed = observed
+        self.n = 0  # Values seen
+        self.count_extreme = 0
+        # alpha_bound: Bonferroni over the planned looks keeps total error <= delta
+        self.delta = SEQUENTIAL_DELTA / max(1, spec.n_perm // SEQUENTIAL_LOOK)
+
+    def update(self, values: List[float]) -> Optional[Tuple[int, float]]:
+        """
+        Read the values not seen yet (values[self.n:]).
+
+        Returns (n_perm_used, p_value) if the test can stop, else None.
+        """
+        spec = self.spec
+        for x in itertools.islice(values, self.n, None):
+            self.n += 1
+            if _is_extreme(self.metric, x, self.observed):
+                self.count_extreme += 1
+            n, k = self.n, self.count_extreme
+            if spec.stopping == "besag_clifford":
+                if k == spec.stop_h:
+                    return n, spec.stop_h / n
+            elif n % SEQUENTIAL_LOOK == 0:
+                too_few = _binomial_cdf(k, n, spec.alpha) < self.delta  # p clearly < alpha
+                too_many = 1 - _binomial_cdf(k - 1, n, spec.alpha) < self.delta  # p clearly > alpha
+                if too_few or too_many:
+                    return n, (k + 1) / (n + 1)
+        return None
+
+
+def _run_sequential(
+    spec: TestSpec,
+    metric: MetricMeta,
+    observed: float,
+    task: Callable[[int, int], List[float]],
+    workers: int
+) -> TestResult:
+    """Draw permutations in rounds until the stopping rule fires."""
+    values: List[float] = []
+    step = SEQUENTIAL_LOOK * max(1, workers)
+    stopper = _SequentialStop(spec, metric, observed)
+
+    while len(values) < spec.n_perm:
+        stop = min(spec.n_perm, len(values) + step)
+        values.extend(_map_permutations(task, stop, workers, start=len(values)))
+
+        decision = stopper.update(values)
+        if decision is not None:
+            n_used, p_value = decision
+            return _make_result(spec, metric, observed, values[:n_used], p_value)
+
+    return _make_result(spec, metric, observed, values)
+
+
+def _make_result(
+    spec: TestSpec,
+    metric: MetricMeta,
+    observed: float,
+    null_distribution: List[float],
+    p_value: Optional[float] = None
+) -> TestResult:
+    """Compute p-value (unless given) and effect size from a null distribution."""
+    if p_value is None:
+        count_extreme = sum(1 for x in null_distribution if _is_extreme(metric, x, observed))
+        p_value = (count_extreme + 1) / (len(null_distribution) + 1)
+
+    # Effect size in bits/char
+    null_mean = sum(null_distribution) / len(null_distribution)
+    effect_bits_per_char = metric.effect(observed, null_mean)
+
+    return TestResult(
+        spec=spec,
+        observed=observed,
+        null_distribution=null_distribution,
+        p_value=p_value,
+        effect_bits_per_char=effect_bits_per_char
+    )
+
+
+def _make_exact_result(
+    spec: TestSpec,
+    metric: MetricMeta,
+    observed: float,
+    null_distribution: List[float]
+) -> TestResult:
+    """Result over ALL distinct null orders (the observed one included)."""
+    count_extreme = sum(1 for x in null_distribution if _is_extreme(metric, x, observed))
+    result = _make_result(spec, metric, observed, null_distribution, count_extreme / len(null_distribution))
+    result.exact = True
+    return result
+
+
+# ============================================================
+# LENGTH-SCALE DIAGNOSTIC
+# ============================================================
+
+@dataclass(frozen=True)
+class LengthScaleSpec:
+    """Specification for length-scale diagnostic."""
+    corpus: str
+    encoding: str
+    metric: str
+    block_sizes: Tuple[int, ...] = (1, 2, 4, 8, 16, 32, 64, 128)
+    n_perm: int = 1000
+    seed: int = 42
+    seed_mode: str = "stream"
+
+    def validate(self) -> List[str]:
+        errors = []
+        if self.corpus not in CORPORA:
+            errors.append(f"Corpus '{self.corpus}' not registered")
+        if self.encoding not in ENCODINGS:
+            errors.append(f"Encoding '{self.encoding}' not registered")
+        if self.metric not in METRICS:
+            errors.append(f"Metric '{self.metric}' not registered")
+        if any(k < 1 for k in self.block_sizes):
+            errors.append("block_sizes must be >= 1")
+        if self.seed_mode not in SEED_MODES:
+            errors.append(f"seed_mode must be one of {SEED_MODES}")
+        return errors
+
+
+@dataclass
+class LengthScaleResult:
+    """Result of length-scale diagnostic."""
+    spec: LengthScaleSpec
+    curve: List[Tuple[int, float, float]]  # (block_size, effect_bits/char, p_value)
+
+    def vanishes_at(self, threshold: float = 0.01) -> Optional[int]:
+        """
+        At what block size does the effect vanish?
+
+        Returns None if effect persists at all scales.
+        """
+        for block_size, effect, p in self.curve:
+            if abs(effect) < threshold or p > 0.05:
+                return block_size
+        return None
+
+    def interpretation(self) -> str:
+        """Human-readable interpretation."""
+        vanish = self.vanishes_at()
+        if vanish is None:
+            return "LONG-RANGE: Structure persists at all tested scales"
+        elif vanish <= 2:
+            return "LETTER-LOCAL: Structure is within adjacent letters only"
+        elif vanish <= 8:
+            return f"WORD-SCALE: Structure vanishes at ~{vanish} letters"
+        elif vanish <= 32:
+            return f"PHRASE-SCALE: Structure vanishes at ~{vanish} letters"
+        else:
+            return f"SENTENCE-SCALE: Structure vanishes at ~{vanish} letters"
+
+    def summary_table(self) -> str:
+        """Format results as table."""
+        lines = ["Block Size | Effect (bits/char) | p-value"]
+        lines.append("-" * 45)
+        for block_size, effect, p in self.curve:
+            sig = "*" if p < 0.05 else ""
+            lines.append(f"{block_size:10d} | {effect:18.4f} | {p:.4f}{sig}")
+        lines.append("")
+        lines.append(f"Interpretation: {self.interpretation()}")
+        return "\n".join(lines)
+
+
+def run_length_scale_test(
+    spec: LengthScaleSpec,
+    use_word_table: bool = True,
+    workers: int = 1,
+    use_cache: bool = True
+) -> LengthScaleResult:
+    """
+    Run length-scale diagnostic.
+
+    Shows at what scale structure vanishes → reveals if structure
+    is letter-local, word-scale, phrase-scale, or long-range.
+
+    All block sizes run in ONE pass: the corpus is tokenised into
+    characters and encoded once, each block shuffle is a vectorised
+    position permutation, and every scale is drawn per permutation
+    index. Each curve point equals run_test on its block_k TestSpec.
+    Block sizes >= the longest word leave the text unchanged, so their
+    null is the observed value without sampling.
+
+    Args:
+        workers: Processes (requires spec.seed_mode="spawn")
+    """
+    test_specs = length_scale_test_specs(spec)
+    if workers > 1 and spec.seed_mode != "spawn":
+        raise ValueError("workers > 1 requires seed_mode='spawn'")
+
+    results: List[Optional[TestResult]] = [None] * len(test_specs)
+    if use_cache:
+        results = [_cached_result(s) for s in test_specs]
+    if all(r is not None for r in results):
+        return length_scale_result(spec, results)
+
+    corpus = CORPORA[spec.corpus]
+    encoding = ENCODINGS[spec.encoding]
+    metric = METRICS[spec.metric]
+
+    bits = encoding.fn(corpus.text)
+    if not bits:
+        raise ValueError(f"Encoding {spec.encoding} produced empty bitstring")
+    observed = metric.fn(bits)
+
+    todo = [i for i, r in enumerate(results) if r is None]
+    letters = get_letter_table(corpus)
+    # Identity shortcut needs the space-normalised text to encode the same
+    unchanged = any(spec.block_sizes[i] >= letters.max_word_len for i in todo) and (
+        as_str(encoding.fn(letters.text_for(np.arange(len(letters))))) == as_str(bits)
+    )
+    sampled = []
+    for i in todo:
+        if unchanged and spec.block_sizes[i] >= letters.max_word_len:
+            # Identity permutation: every null sample equals the observed value
+            results[i] = _make_result(test_specs[i], metric, observed, [observed] * spec.n_perm)
+        else:
+            sampled.append(i)
+
+    samplers = [
+        _NullSampler(corpus, encoding, NULLS[test_specs[i].null], bits, use_word_table)
+        for i in sampled
+    ]
+    rngs = [_PermutationRngs(test_specs[i]) for i in sampled]
+    for sampler, i in zip(samplers, sampled):
+        sampler.use_bank(test_specs[i])
+
+    def task(start: int, stop: int) -> List[List[float]]:
+        # One row per permutation index: one value per sampled scale
+        return [
+            [metric.fn(sampler.sample(rng, index)) for sampler, rng in zip(samplers, draws)]
+            for index, draws in enumerate(zip(*(r(start, stop) for r in rngs)), start)
+        ]
+
+    if sampled:
+        rows = _map_permutations(task, spec.n_perm, workers)
+        for j, i in enumerate(sampled):
+            results[i] = _make_result(test_specs[i], metric, observed, [row[j] for row in rows])
+
+    if use_cache:
+        for i in todo:
+            _store_result(results[i])
+    return length_scale_result(spec, results)
+
+
+def length_scale_test_specs(spec: LengthScaleSpec) -> List[TestSpec]:
+    """One TestSpec per block size (registers block_k nulls as needed)."""
+    errors = spec.validate()
+    if errors:
+        raise ValueError(f"Invalid LengthScaleSpec: {'; '.join(errors)}")
+
+    test_specs = []
+
+    for block_size in spec.block_sizes:
+        null_name = f"block_{block_size}"
+
+        # Ensure null exists
+        if null_name not in NULLS:
+            _register_block_null(block_size)
 
         test_spec = TestSpec(
             corpus=spec.corpus,
@@ -535,12 +1862,20 @@ def run_length_scale_test(spec: LengthScaleSpec) -> LengthScaleResult:
             null=null_name,
             metric=spec.metric,
             n_perm=spec.n_perm,
-            seed=spec.seed + block_size  # Different seed per block size
+            seed=spec.seed + block_size,  # Different seed per block size
+            seed_mode=spec.seed_mode
         )
+        test_specs.append(test_spec)
+
+    return test_specs
 
-        result = run_test(test_spec)
-        curve.append((block_size, result.effect_bits_per_char, result.p_value))
 
+def length_scale_result(spec: LengthScaleSpec, results: List[TestResult]) -> LengthScaleResult:
+    """Assemble the curve from per-block results (in block_sizes order)."""
+    curve = [
+        (block_size, result.effect_bits_per_char, result.p_value)
+        for block_size, result in zip(spec.block_sizes, results)
+    ]
     return LengthScaleResult(spec=spec, curve=curve)
 
 
@@ -576,31 +1911,594 @@ def run_robustness_test(
     encoding: str,
     null: str = "word_perm",
     n_perm: int = 1000,
-    seed: int = 42
+    seed: int = 42,
+    seed_mode: str = "stream",
+    workers: int = 1
 ) -> RobustnessResult:
     """
     Test encoding with all compressors.
 
     If effect only appears with one compressor → compressor quirk, not real structure.
     """
-    results = {}
+    return run_multi_metric_test(
+        corpus, encoding, null, ["zlib", "bz2", "lzma"],
+        n_perm=n_perm, seed=seed, seed_mode=seed_mode, workers=workers
+    )
 
-    for metric_name in ["zlib", "bz2", "lzma"]:
-        spec = TestSpec(
-            corpus=corpus,
-            encoding=encoding,
-            null=null,
-            metric=metric_name,
-            n_perm=n_perm,
-            seed=seed
-        )
-        results[metric_name] = run_test(spec)
 
+def run_multi_metric_test(
+    corpus: str,
+    encoding: str,
+    null: str = "word_perm",
+    metrics: Optional[List[str]] = None,
+    n_perm: int = 1000,
+    seed: int = 42,
+    seed_mode: str = "stream",
+    use_word_table: bool = True,
+    workers: int = 1,
+    use_cache: bool = True
+) -> RobustnessResult:
+    """
+    Test one encoding against one null with several metrics at once.
+
+    Each null bitstring is generated ONCE and scored by every metric, so
+    all per-metric results share the same permutations (paired design).
+    Each result equals run_test on its own TestSpec.
+
+    Args:
+        metrics: Metric names (default: zlib, bz2, lzma)
+    """
+    if metrics is None:
+        metrics = ["zlib", "bz2", "lzma"]
+    batch = run_batch_test(
+        corpus, [encoding], null, metrics,
+        n_perm=n_perm, seed=seed, seed_mode=seed_mode,
+        use_word_table=use_word_table, workers=workers, use_cache=use_cache
+    )
     return RobustnessResult(
         encoding=encoding,
         null=null,
         corpus=corpus,
-        results=results
+        results=batch.results[encoding]
+    )
+
+
+# ============================================================
+# BATCHED MULTI-ENCODING TEST
+# ============================================================
+
+@dataclass
+class BatchResult:
+    """Encoding × metric results on shared permutations."""
+    corpus: str
+    null: str
+    encodings: List[str]
+    metrics: List[str]
+    results: Dict[str, Dict[str, TestResult]]  # encoding -> metric -> result
+
+    def matrix(self, attr: str = "p_value") -> List[List[float]]:
+        """Rows = encodings, columns = metrics."""
+        return [
+            [getattr(self.results[e][m], attr) for m in self.metrics]
+            for e in self.encodings
+        ]
+
+    def paired_difference(self, encoding_a: str, encoding_b: str, metric: str) -> List[float]:
+        """
+        Per-permutation difference in effect (null - observed for LOWER
+        metrics, observed - null for HIGHER), a minus b.
+
+        Valid pairing: both encodings were scored on the same permutations.
+        """
+        a = self.results[encoding_a][metric]
+        b = self.results[encoding_b][metric]
+        sign = 1.0 if METRICS[metric].direction == MetricDirection.LOWER else -1.0
+        return [
+            sign * ((xa - a.observed) - (xb - b.observed))
+            for xa, xb in zip(a.null_distribution, b.null_distribution)
+        ]
+
+    def summary_table(self) -> str:
+        width = max(len("encoding"), *(len(e) for e in self.encodings))
+        lines = [f"Batch test vs {self.null} on {self.corpus} (p-value / effect bits/char)"]
+        lines.append(f"{'encoding':<{width}} | " + " | ".join(f"{m:>17}" for m in self.metrics))
+        lines.append("-" * (width + 20 * len(self.metrics)))
+        for e in self.encodings:
+            cells = []
+            for m in self.metrics:
+                r = self.results[e][m]
+                sig = "*" if r.is_significant() else " "
+                cells.append(f"{r.p_value:.4f}{sig} {r.effect_bits_per_char:+.4f}")
+            lines.append(f"{e:<{width}} | " + " | ".join(f"{c:>17}" for c in cells))
+        return "\n".join(lines)
+
+
+def run_batch_test(
+    corpus: str,
+    encodings: List[str],
+    null: str = "word_perm",
+    metrics: Optional[List[str]] = None,
+    n_perm: int = 1000,
+    seed: int = 42,
+    seed_mode: str = "stream",
+    use_word_table: bool = True,
+    workers: int = 1,
+    use_cache: bool = True
+) -> BatchResult:
+    """
+    Test several encodings × metrics on the SAME permutations.
+
+    Each permuted word order is drawn once and applied to every encoding
+    (common random numbers), then every encoding × metric is scored.
+    Each result equals run_test on its own TestSpec: BITS nulls (which
+    have no draw to share across encodings of different bits) give each
+    encoding its own rng stream, exactly as run_test draws it.
+
+    Args:
+        metrics: Metric names (default: zlib, bz2, lzma)
+    """
+    if metrics is None:
+        metrics = ["zlib", "bz2", "lzma"]
+
+    specs = {
+        (e, m): TestSpec(
+            corpus=corpus,
+            encoding=e,
+            null=null,
+            metric=m,
+            n_perm=n_perm,
+            seed=seed,
+            seed_mode=seed_mode
+        )
+        for e in encodings for m in metrics
+    }
+    for spec in specs.values():
+        errors = spec.validate()
+        if errors:
+            raise ValueError(f"Invalid TestSpec: {'; '.join(errors)}")
+    if workers > 1 and seed_mode != "spawn":
+        raise ValueError("workers > 1 requires seed_mode='spawn'")
+
+    if use_cache:
+        cached = {key: _cached_result(spec) for key, spec in specs.items()}
+        if all(r is not None for r in cached.values()):
+            return BatchResult(corpus, null, list(encodings), list(metrics), {
+                e: {m: cached[(e, m)] for m in metrics} for e in encodings
+            })
+
+    corpus_meta = CORPORA[corpus]
+    null_meta = NULLS[null]
+    metric_metas = [METRICS[m] for m in metrics]
+
+    samplers = []
+    observed = []
+    for e in encodings:
+        encoding_meta = ENCODINGS[e]
+        bits = encoding_meta.fn(corpus_meta.text)
+        if not bits:
+            raise ValueError(f"Encoding {e} produced empty bitstring")
+        observed.append([m.fn(bits) for m in metric_metas])
+        samplers.append(_NullSampler(corpus_meta, encoding_meta, null_meta, bits, use_word_table))
+
+    task = _BatchSampler(samplers).task(next(iter(specs.values())), metric_metas)
+    rows = _map_permutations(task, n_perm, workers)
+
+    results: Dict[str, Dict[str, TestResult]] = {}
+    for i, e in enumerate(encodings):
+        results[e] = {}
+        for j, (m, metric) in enumerate(zip(metrics, metric_metas)):
+            null_distribution = [row[i][j] for row in rows]
+            results[e][m] = _make_result(specs[(e, m)], metric, observed[i][j], null_distribution)
+            if use_cache:
+                _store_result(results[e][m])
+
+    return BatchResult(corpus, null, list(encodings), list(metrics), results)
+
+
+# ============================================================
+# FAMILY-WISE CORRECTION (WESTFALL-YOUNG MAX-T)
+# ============================================================
+
+@dataclass
+class FamilyResult:
+    """
+    Null × encoding × metric family.
+
+    adjusted_p controls the family-wise error rate over ALL tests: max-T
+    within each null (its encodings and metrics share permutations),
+    Holm across nulls.
+    """
+    corpus: str
+    nulls: List[str]
+    encodings: List[str]
+    metrics: List[str]
+    results: Dict[str, Dict[str, Dict[str, TestResult]]]  # null -> encoding -> metric
+    adjusted_p: Dict[str, Dict[str, Dict[str, float]]]
+
+    @property
+    def n_tests(self) -> int:
+        return len(self.nulls) * len(self.encodings) * len(self.metrics)
+
+    def significant(self, alpha: float = 0.05) -> List[Tuple[str, str, str]]:
+        """(null, encoding, metric) tests with adjusted p < alpha."""
+        return [
+            (n, e, m)
+            for n in self.nulls for e in self.encodings for m in self.metrics
+            if self.adjusted_p[n][e][m] < alpha
+        ]
+
+    def summary_table(self) -> str:
+        lines = [f"Family of {self.n_tests} tests on {self.corpus} (raw p / max-T adjusted p)"]
+        lines.append("-" * 70)
+        for n in self.nulls:
+            for e in self.encodings:
+                for m in self.metrics:
+                    r = self.results[n][e][m]
+                    adj = self.adjusted_p[n][e][m]
+                    sig = "*" if adj < 0.05 else ""
+                    lines.append(f"  {n:>12} {e:>20} {m:>8}: p={r.p_value:.4f}  adj={adj:.4f}{sig}")
+        return "\n".join(lines)
+
+
+def _standardized(metric: MetricMeta, values: List[float], mean: float, std: float) -> List[float]:
+    """Studentize so larger = more structure, comparable across tests."""
+    std = std or 1.0
+    sign = 1.0 if metric.direction == MetricDirection.LOWER else -1.0
+    return [sign * (mean - x) / std for x in values]
+
+
+def run_family_test(
+    corpus: str,
+    encodings: List[str],
+    nulls: Optional[List[str]] = None,
+    metrics: Optional[List[str]] = None,
+    n_perm: int = 1000,
+    seed: int = 42,
+    seed_mode: str = "stream",
+    use_word_table: bool = True,
+    workers: int = 1
+) -> FamilyResult:
+    """
+    Joint permutation test with Westfall-Young max-T correction.
+
+    Per null, one batched pass: each permutation draw is applied to
+    every encoding and metric, so the joint null of those statistics is
+    available and step-down max-T adjusted p-values can be computed.
+    Replaces Bonferroni, which ignores the strong dependence between
+    encodings and compressors.
+
+    Different nulls draw different objects (a word order, a text, a bit
+    shuffle), so there is no joint null across them: each null is drawn
+    as in run_test and the nulls are combined with Holm.
+
+    Args:
+        nulls: Null names (default: word_perm)
+        metrics: Metric names (default: zlib, bz2, lzma)
+    """
+    if nulls is None:
+        nulls = ["word_perm"]
+    if metrics is None:
+        metrics = ["zlib", "bz2", "lzma"]
+
+    specs = {
+        (n, e, m): TestSpec(
+            corpus=corpus,
+            encoding=e,
+            null=n,
+            metric=m,
+            n_perm=n_perm,
+            seed=seed,
+            seed_mode=seed_mode
+        )
+        for n in nulls for e in encodings for m in metrics
+    }
+    for spec in specs.values():
+        errors = spec.validate()
+        if errors:
+            raise ValueError(f"Invalid TestSpec: {'; '.join(errors)}")
+    if workers > 1 and seed_mode != "spawn":
+        raise ValueError("workers > 1 requires seed_mode='spawn'")
+
+    corpus_meta = CORPORA[corpus]
+    metric_metas = [METRICS[m] for m in metrics]
+
+    # Encode once per encoding, samplers per (null, encoding)
+    observed = {}
+    bits_by_encoding = {}
+    for e in encodings:
+        bits = ENCODINGS[e].fn(corpus_meta.text)
+        if not bits:
+            raise ValueError(f"Encoding {e} produced empty bitstring")
+        bits_by_encoding[e] = bits
+        observed[e] = [m.fn(bits) for m in metric_metas]
+
+    # Per null: its own sampler and rngs, as run_test would draw it
+    null_tasks = [
+        _BatchSampler([
+            _NullSampler(corpus_meta, ENCODINGS[e], NULLS[n], bits_by_encoding[e], use_word_table)
+            for e in encodings
+        ]).task(specs[(n, encodings[0], metrics[0])], metric_metas)
+        for n in nulls
+    ]
+
+    def task(start: int, stop: int) -> List[List[List[List[float]]]]:
+        # One row per permutation: [null][encoding][metric]
+        return [list(row) for row in zip(*(null_task(start, stop) for null_task in null_tasks))]
+
+    rows = _map_permutations(task, n_perm, workers)
+
+    results: Dict[str, Dict[str, Dict[str, TestResult]]] = {}
+    keys = []
+    family_p = []
+    for a, n in enumerate(nulls):
+        results[n] = {}
+        t_observed = []
+        t_null_columns = []
+        for i, e in enumerate(encodings):
+            results[n][e] = {}
+            for j, (m, metric) in enumerate(zip(metrics, metric_metas)):
+                null_distribution = [row[a][i][j] for row in rows]
+                result = _make_result(specs[(n, e, m)], metric, observed[e][j], null_distribution)
+                results[n][e][m] = result
+
+                mean, std = result.null_mean, result.null_std
+                keys.append((n, e, m))
+                t_observed.append(_standardized(metric, [result.observed], mean, std)[0])
+                t_null_columns.append(_standardized(metric, null_distribution, mean, std))
+
+        t_null = [list(col) for col in zip(*t_null_columns)]
+        family_p.append(westfall_young_maxT(t_observed, t_null))
+
+    adjusted = [p for family in holm_across_families(family_p) for p in family]
+    adjusted_p: Dict[str, Dict[str, Dict[str, float]]] = {
+        n: {e: {} for e in encodings} for n in nulls
+    }
+    for (n, e, m), p in zip(keys, adjusted):
+        adjusted_p[n][e][m] = p
+
+    return FamilyResult(corpus, list(nulls), list(encodings), list(metrics), results, adjusted_p)
+
+
+# ============================================================
+# RARE-EVENT P-VALUES (MULTILEVEL SPLITTING)
+# ============================================================
+
+@dataclass
+class RareEventResult:
+    """Tail p-value estimated by multilevel splitting, with standard error."""
+    spec: TestSpec
+    observed: float
+    p_value: float
+    std_error: float
+    null_mean: float  # Of the plain null draws (first level)
+    thresholds: List[float]  # Metric value bounding each splitting level
+    n_evaluations: int  # Metric evaluations spent
+    reached: bool  # False: ran out of levels, p_value is an upper estimate
+
+    @property
+    def effect_bits_per_char(self) -> float:
+        return METRICS[self.spec.metric].effect(self.observed, self.null_mean)
+
+    def is_significant(self, alpha: float = 0.05) -> bool:
+        return self.p_value < alpha
+
+    def summary(self) -> str:
+        return (
+            f"p={self.p_value:.3g} ± {self.std_error:.2g} (splitting, "
+            f"{len(self.thresholds)} levels, {self.n_evaluations} evaluations), "
+            f"effect={self.effect_bits_per_char:.4f} {effect_unit(self.spec.metric)}, "
+            f"observed={self.observed:.4f}, null={self.null_mean:.4f}"
+            + ("" if self.reached else ", max_levels reached")
+        )
+
+
+def run_rare_event_test(
+    spec: TestSpec,
+    n_per_level: int = 200,
+    p0: float = 0.1,
+    max_levels: int = 10,
+    use_word_table: bool = True
+) -> RareEventResult:
+    """
+    Estimate a p-value far below 1/n_perm by multilevel splitting.
+
+    Level 0 is the first n_per_level permutations run_test would draw
+    (same seed). Each further level runs Markov chains of the null's
+    move_fn conditioned on ever more extreme metric values and gains a
+    factor ~1/p0, so p ~ 1e-6 costs ~n_per_level * 7 evaluations.
+    spec.n_perm, stopping and exact are not used.
+    """
+    errors = spec.validate()
+    if errors:
+        raise ValueError(f"Invalid TestSpec: {'; '.join(errors)}")
+    null = NULLS[spec.null]
+    if null.move_fn is None:
+        raise ValueError(f"Null '{spec.null}' has no move_fn for rare-event estimation")
+
+    corpus = CORPORA[spec.corpus]
+    encoding = ENCODINGS[spec.encoding]
+    metric = METRICS[spec.metric]
+    bits = encoding.fn(corpus.text)
+    if not bits:
+        raise ValueError(f"Encoding {spec.encoding} produced empty bitstring")
+    observed = metric.fn(bits)
+
+    sampler = _NullSampler(corpus, encoding, null, bits, use_word_table)
+    table = sampler.require_table()
+    states = [sampler.positions(rng) for rng in _PermutationRngs(spec)(0, n_per_level)]
+
+    # Splitting works on "larger = more extreme"
+    sign = -1.0 if metric.direction == MetricDirection.LOWER else 1.0
+    estimate = multilevel_splitting(
+        states,
+        score=lambda positions: sign * metric.fn(sampler.from_positions(positions)),
+        move=lambda positions, gen: null.move_fn(table, positions, gen),
+        target=sign * observed,
+        gen=np.random.default_rng(spec.seed),
+        p0=p0,
+        max_levels=max_levels
+    )
+
+    return RareEventResult(
+        spec=spec,
+        observed=observed,
+        p_value=estimate.p_value,
+        std_error=estimate.std_error,
+        null_mean=sign * estimate.initial_mean,
+        thresholds=[sign * t for t in estimate.thresholds],
+        n_evaluations=estimate.n_evaluations,
+        reached=estimate.reached
+    )
+
+
+# ============================================================
+# CODE-LENGTH ATTRIBUTION
+# ============================================================
+
+ATTRIBUTION_LEVELS = ("word",)  # Plus any boundary level of the corpus
+
+
+@dataclass(frozen=True)
+class AttributionSpec:
+    """Specification for a per-segment code-length attribution map."""
+    corpus: str
+    encoding: str
+    null: str = "word_perm"
+    level: str = "verse"  # "word" or a corpus boundary level
+    order: int = 16  # KT context bits
+    n_perm: int = 100
+    seed: int = 42
+    seed_mode: str = "stream"
+
+    def validate(self) -> List[str]:
+        errors = []
+        if self.corpus not in CORPORA:
+            errors.append(f"Corpus '{self.corpus}' not registered")
+        elif self.level not in ATTRIBUTION_LEVELS and \
+                self.level not in CORPORA[self.corpus].boundary_levels():
+            errors.append(f"Corpus '{self.corpus}' has no '{self.level}' boundaries")
+        if self.encoding not in ENCODINGS:
+            errors.append(f"Encoding '{self.encoding}' not registered")
+        if self.null not in NULLS:
+            errors.append(f"Null '{self.null}' not registered")
+        elif NULLS[self.null].index_fn is None or NULLS[self.null].index_unit != "word":
+            errors.append(f"Null '{self.null}' does not permute word positions")
+        if self.order < 0:
+            errors.append("order must be >= 0")
+        if self.n_perm < 1:
+            errors.append("n_perm must be >= 1")
+        if self.seed_mode not in SEED_MODES:
+            errors.append(f"seed_mode must be one of {SEED_MODES}")
+        return errors
+
+
+@dataclass
+class AttributionResult:
+    """
+    Code length of every segment, observed vs null.
+
+    Costs are in bits under the sequential order-k KT model. A segment's
+    null cost is the cost of ITS words wherever the null placed them, so
+    excess = null_mean - observed is how much its own context (the real
+    word order around it) makes it cheaper.
+    """
+    spec: AttributionSpec
+    observed: np.ndarray  # Bits per segment
+    null_mean: np.ndarray
+    null_std: np.ndarray
+    p_values: np.ndarray  # One-sided: null cost <= observed
+    n_bits: np.ndarray  # Encoded bits per segment
+
+    @property
+    def excess(self) -> np.ndarray:
+        """Bits saved by the real order (positive = more compressible)."""
+        return self.null_mean - self.observed
+
+    @property
+    def excess_per_bit(self) -> np.ndarray:
+        return self.excess / np.maximum(self.n_bits, 1)
+
+    @property
+    def z_scores(self) -> np.ndarray:
+        return np.divide(self.excess, self.null_std, out=np.zeros_like(self.excess),
+                         where=self.null_std > 0)
+
+    def top(self, k: int = 10) -> List[int]:
+        """Segments with the largest excess."""
+        return np.argsort(-self.excess, kind="stable")[:k].tolist()
+
+    def summary_table(self, k: int = 10) -> str:
+        lines = [f"{self.spec.level:>8} | bits | excess | excess/bit | z | p"]
+        lines.append("-" * 60)
+        for i in self.top(k):
+            lines.append(
+                f"{i:8d} | {self.n_bits[i]:5d} | {self.excess[i]:8.2f} | "
+                f"{self.excess_per_bit[i]:8.4f} | {self.z_scores[i]:6.2f} | {self.p_values[i]:.4f}"
+            )
+        lines.append(f"Total excess: {self.excess.sum():.1f} bits "
+                     f"over {len(self.observed)} segments")
+        return "\n".join(lines)
+
+
+def run_attribution(spec: AttributionSpec) -> AttributionResult:
+    """
+    Where does the corpus beat the null? One pass per permutation.
+
+    Every bit's sequential KT cost is summed into its word, and word
+    costs into segments of spec.level (verse, surah, ...). Null bits
+    are attributed back to the corpus word they came from, so every
+    segment gets its own null distribution from the SAME n_perm draws -
+    no per-segment tests. Needs a word-separable encoding.
+    """
+    errors = spec.validate()
+    if errors:
+        raise ValueError(f"Invalid AttributionSpec: {'; '.join(errors)}")
+    corpus = CORPORA[spec.corpus]
+    encoding = ENCODINGS[spec.encoding]
+    null = NULLS[spec.null]
+    bits = encoding.fn(corpus.text)
+    if not bits:
+        raise ValueError(f"Encoding {spec.encoding} produced empty bitstring")
+
+    sampler = _NullSampler(corpus, encoding, null, bits)
+    words = sampler.require_table()
+    if sampler.segments is None:
+        raise ValueError(
+            f"Encoding {spec.encoding} is not word-separable: bits cannot be attributed to words"
+        )
+    word_len = sampler.segments.word_len
+    segment = np.arange(len(words)) if spec.level == "word" else words.segment_ids(spec.level)
+    n_segments = int(segment.max()) + 1 if len(segment) else 0
+
+    def segment_costs(positions: np.ndarray) -> np.ndarray:
+        costs = kt_bit_costs(sampler.from_positions(positions), spec.order)
+        owner = np.repeat(segment[positions], word_len[positions])
+        return np.bincount(owner, weights=costs, minlength=n_segments)
+
+    identity = np.arange(len(words))
+    observed = segment_costs(identity)
+    total = np.zeros(n_segments)
+    total_sq = np.zeros(n_segments)
+    as_low = np.zeros(n_segments, dtype=np.int64)
+    for rng in _PermutationRngs(spec)(0, spec.n_perm):
+        positions = sampler.positions(rng)
+        if len(positions) != len(words) or \
+                np.bincount(positions, minlength=len(words)).max(initial=0) > 1:
+            raise ValueError(f"Null '{spec.null}' does not permute word positions")
+        costs = segment_costs(positions)
+        total += costs
+        total_sq += costs * costs
+        as_low += costs <= observed
+
+    null_mean = total / spec.n_perm
+    null_var = np.maximum(total_sq / spec.n_perm - null_mean ** 2, 0.0)
+    return AttributionResult(
+        spec=spec,
+        observed=observed,
+        null_mean=null_mean,
+        null_std=np.sqrt(null_var),
+        p_values=(as_low + 1) / (spec.n_perm + 1),
+        n_bits=np.bincount(segment, weights=word_len, minlength=n_segments).astype(np.int64)
     )
 
 
@@ -621,14 +2519,18 @@ def list_registered() -> Dict[str, List[str]]:
 def quick_test(
     corpus: str,
     encoding: str,
-    n_perm: int = 1000
+    n_perm: int = 1000,
+    seed_mode: str = "stream",
+    workers: int = 1
 ) -> Dict[str, Any]:
     """
     Quick test with critical null (word_perm) and all compressors.
 
     This is the minimum bar for any claim about cross-word structure.
     """
-    robustness = run_robustness_test(corpus, encoding, "word_perm", n_perm)
+    robustness = run_robustness_test(
+        corpus, encoding, "word_perm", n_perm, seed_mode=seed_mode, workers=workers
+    )
 
     return {
         "encoding": encoding,
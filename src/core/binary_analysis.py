@@ -13,6 +13,8 @@ from collections import Counter
 from typing import Callable, List, Dict, Tuple, Any
 import re
 
+from core.bitseq import Bits, as_str
+
 
 def load_quran(path: str = "data/quran/quran.json") -> List[Dict]:
     """Load Quran from JSON."""
@@ -155,11 +157,12 @@ def pattern_search(bitstring: str, pattern: str) -> List[int]:
 # MAIN ANALYSIS
 # ============================================================
 
-def analyze_bitstring(bitstring: str, label: str = "") -> Dict[str, Any]:
+def analyze_bitstring(bitstring: Bits, label: str = "") -> Dict[str, Any]:
     """
-    Full analysis of a bitstring.
+    Full analysis of a bitstring (str or BitSeq).
     Returns metrics that reveal non-random structure.
     """
+    bitstring = as_str(bitstring)
     return {
         "label": label,
         "length": len(bitstring),
@@ -0,0 +1,202 @@
+"""
+BIT SEQUENCES
+
+Compact bit-sequence type for encodings, nulls and metrics.
+
+The legacy representation is a Python str of '0'/'1' (1 byte per bit,
+copy on every slice). BitSeq packs 8 bits per byte in a NumPy array
+and slices without copying. Both forms are accepted everywhere in
+core; `as_bitseq` / `as_str` convert between them.
+"""
+
+from typing import Iterable, Union
+
+import numpy as np
+
+
+class BitSeq:
+    """
+    Immutable bit sequence, packed MSB-first.
+
+    A BitSeq is a view (start, length) onto a packed uint8 buffer,
+    so contiguous slices share memory with their parent.
+    """
+
+    __slots__ = ("_data", "_start", "_len")
+
+    def __init__(self, data: np.ndarray, start: int = 0, length: int = None):
+        data = np.asarray(data, dtype=np.uint8)
+        if length is None:
+            length = 8 * len(data) - start
+        if start < 0 or length < 0 or start + length > 8 * len(data):
+            raise ValueError("BitSeq view out of range")
+        self._data = data
+        self._start = start
+        self._len = length
+
+    # ------------------------------------------------------------
+    # Construction / conversion
+    # ------------------------------------------------------------
+
+    @classmethod
+    def from_bits(cls, bits: np.ndarray) -> "BitSeq":
+        """From an array of 0/1 values (any integer or bool dtype)."""
+        bits = np.asarray(bits)
+        if bits.dtype != np.bool_ and bits.size and bits.max() > 1:
+            raise ValueError("BitSeq values must be 0 or 1")
+        return cls(np.packbits(bits.astype(np.uint8, copy=False)), 0, bits.size)
+
+    @classmethod
+    def from_str(cls, bits: str) -> "BitSeq":
+        """From the legacy '0'/'1' string form."""
+        codes = np.frombuffer(bits.encode('ascii'), dtype=np.uint8) - ord('0')
+        if codes.size and codes.max() > 1:
+            raise ValueError("BitSeq string must contain only 0s and 1s")
+        return cls.from_bits(codes)
+
+    @classmethod
+    def from_packed(cls, packed: bytes, length: int) -> "BitSeq":
+        """From MSB-first packed bytes (e.g. BitSeq.packed())."""
+        return cls(np.frombuffer(packed, dtype=np.uint8), 0, length)
+
+    @classmethod
+    def concat(cls, seqs: Iterable["BitSeq"]) -> "BitSeq":
+        arrays = [as_bitseq(s).to_array() for s in seqs]
+        if not arrays:
+            return cls(np.zeros(0, dtype=np.uint8), 0, 0)
+        return cls.from_bits(np.concatenate(arrays))
+
+    def to_array(self) -> np.ndarray:
+        """Unpacked uint8 array of 0/1 (new array)."""
+        lo = self._start // 8
+        hi = (self._start + self._len + 7) // 8
+        offset = self._start - 8 * lo
+        return np.unpackbits(self._data[lo:hi])[offset:offset + self._len]
+
+    def to_str(self) -> str:
+        """Legacy '0'/'1' string form."""
+        return self.ascii().decode('ascii')
+
+    def ascii(self) -> bytes:
+        """'0'/'1' bytes, i.e. what legacy metrics compressed."""
+        codes = self.to_array()
+        codes += ord('0')
+        return codes.tobytes()
+
+    def packed(self) -> bytes:
+        """MSB-first packed bytes (last byte zero-padded)."""
+        if self._start % 8 == 0:
+            lo = self._start // 8
+            data = self._data[lo:lo + (self._len + 7) // 8].copy()
+            if self._len % 8:
+                data[-1] &= (0xFF << (8 - self._len % 8)) & 0xFF
+            return data.tobytes()
+        return np.packbits(self.to_array()).tobytes()
+
+    # ------------------------------------------------------------
+    # Sequence protocol
+    # ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._len)
+            if step == 1:
+                # Zero-copy view
+                return BitSeq(self._data, self._start + start, max(0, stop - start))
+            return BitSeq.from_bits(self.to_array()[key])
+        if key < 0:
+            key += self._len
+        if not 0 <= key < self._len:
+            raise IndexError("BitSeq index out of range")
+        pos = self._start + key
+        return int((self._data[pos // 8] >> (7 - pos % 8)) & 1)
+
+    def __add__(self, other) -> "BitSeq":
+        return BitSeq.concat([self, other])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, str):
+            return self.to_str() == other
+        if not isinstance(other, BitSeq):
+            return NotImplemented
+        return self._len == other._len and bool(np.array_equal(self.to_array(), other.to_array()))
+
+    def __hash__(self) -> int:
+        # Equal to an equal str, so both forms can share sets and dict keys
+        return hash(self.to_str())
+
+    def __str__(self) -> str:
+        return self.to_str()
+
+    def __repr__(self) -> str:
+        head = self[:32].to_str()
+        return f"BitSeq('{head}{'...' if self._len > 32 else ''}', len={self._len})"
+
+    def count(self, value: str = '1') -> int:
+        """Count '1's or '0's (same call as str.count for one char)."""
+        ones = int(np.count_nonzero(self.to_array()))
+        if value == '1':
+            return ones
+        if value == '0':
+            return self._len - ones
+        raise ValueError("BitSeq.count takes '0' or '1'")
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of packed storage covered by this view."""
+        return (self._start % 8 + self._len + 7) // 8
+
+
+Bits = Union[str, BitSeq]
+
+
+def as_bitseq(bits: Bits) -> BitSeq:
+    """Accept either form, return a BitSeq."""
+    return bits if isinstance(bits, BitSeq) else BitSeq.from_str(bits)
+
+
+def as_str(bits: Bits) -> str:
+    """Accept either form, return the legacy string."""
+    return bits.to_str() if isinstance(bits, BitSeq) else bits
+
+
+def ascii_bytes(bits: Bits) -> bytes:
+    """'0'/'1' bytes of either form (input to the ASCII compressor metrics)."""
+    return bits.ascii() if isinstance(bits, BitSeq) else bits.encode()
+
+
+def symbol_bytes(bits: Bits, width: int = 8) -> bytes:
+    """
+    One byte per `width` consecutive bits (MSB-first, zero-padded tail).
+
+    width=8 is plain bit packing (8x less input than ascii_bytes);
+    width=5 puts each 5-bit ordinal symbol in its own byte.
+    """
+    if not 1 <= width <= 8:
+        raise ValueError("width must be in 1..8")
+    seq = as_bitseq(bits)
+    if width == 8:
+        return seq.packed()
+    arr = seq.to_array()
+    if len(arr) % width:
+        arr = np.concatenate([arr, np.zeros(width - len(arr) % width, dtype=np.uint8)])
+    weights = (1 << np.arange(width - 1, -1, -1)).astype(np.uint8)
+    return (arr.reshape(-1, width) * weights).sum(axis=1, dtype=np.uint8).tobytes()
+
+
+def block_shuffle_array(arr: np.ndarray, block_size: int, gen: np.random.Generator) -> np.ndarray:
+    """
+    Shuffle consecutive blocks of an array (last block may be short).
+
+    One permuted gather: block b covers indices b*k .. b*k+k-1, and the
+    out-of-range indices of the ragged tail block are dropped.
+    """
+    n_blocks = (len(arr) + block_size - 1) // block_size
+    order = gen.permutation(n_blocks)
+    idx = (order[:, None] * block_size + np.arange(block_size)).ravel()
+    if len(arr) % block_size:
+        idx = idx[idx < len(arr)]
+    return arr[idx]
@@ -0,0 +1,166 @@
+"""
+RESULT CACHE
+
+Content-addressed on-disk cache for test results.
+
+A result is fully determined by:
+- the frozen spec (corpus, encoding, null, metric, n_perm, seed, ...)
+- the corpus TEXT (not just its name)
+- the encoding, null and metric IMPLEMENTATIONS (not just their names)
+- the engine sources (core/*.py: word tables, BitSeq, Markov fitting,
+  code lengths, ... - helpers the components reach through other modules)
+
+All of these go into the key, so editing a mapping table, a metric or
+an engine helper invalidates old entries automatically. Size-bounded: least recently
+used entries are evicted first.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# Bump when the stored format or engine semantics change
+CACHE_VERSION = 1
+
+DEFAULT_MAX_BYTES = 1 << 30  # 1 GiB
+
+ENGINE_DIR = Path(__file__).resolve().parent  # core/
+
+# (file stamps, digest) of the last engine hash
+_engine_hash: Tuple[tuple, str] = ((), "")
+
+
+def hash_text(text: str) -> str:
+    """SHA-256 of a corpus text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def engine_fingerprint() -> str:
+    """
+    Hash of every engine source file (core/*.py).
+
+    Rehashed only when a file's size or mtime changes.
+    """
+    global _engine_hash
+    paths = sorted(ENGINE_DIR.glob("*.py"))
+    stamps = tuple((p.name, st.st_mtime_ns, st.st_size) for p in paths for st in [p.stat()])
+    if stamps != _engine_hash[0]:
+        h = hashlib.sha256()
+        for p in paths:
+            h.update(p.name.encode())
+            h.update(p.read_bytes())
+        _engine_hash = (stamps, h.hexdigest())
+    return _engine_hash[1]
+
+
+def fingerprint_fn(fn: Optional[Callable]) -> str:
+    """
+    Hash of a function's implementation.
+
+    Covers the function source, its defaults (e.g. block size bound in a
+    lambda), the source of its whole module (mapping tables, helpers)
+    and the engine sources it may call into (engine_fingerprint).
+    Falls back to the code object when source is unavailable.
+    """
+    if fn is None:
+        return "none"
+
+    h = hashlib.sha256()
+    h.update(engine_fingerprint().encode())
+    h.update(f"{getattr(fn, '__module__', '')}.{getattr(fn, '__qualname__', '')}".encode())
+    h.update(repr(getattr(fn, '__defaults__', None)).encode())
+
+    try:
+        h.update(inspect.getsource(fn).encode())
+        module = inspect.getmodule(fn)
+        if module is not None:
+            h.update(inspect.getsource(module).encode())
+    except (OSError, TypeError):
+        code = getattr(fn, '__code__', None)
+        if code is not None:
+            h.update(code.co_code)
+            h.update(repr(code.co_consts).encode())
+        else:
+            h.update(repr(fn).encode())
+
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Directory of JSON results, one file per key.
+
+    Access time is tracked through file mtime (touched on every hit).
+    """
+
+    def __init__(self, directory: str = "output/cache", max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(spec: Dict[str, Any], corpus_text: str, fns: Iterable[Optional[Callable]]) -> str:
+        """Content address for a spec + corpus + implementations."""
+        payload = {
+            "version": CACHE_VERSION,
+            "spec": spec,
+            "corpus": hash_text(corpus_text),
+            "fns": [fingerprint_fn(fn) for fn in fns],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored data, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)  # Mark as recently used
+        return data
+
+    def put(self, key: str, data: Dict[str, Any]) -> None:
+        """Store data, then evict down to max_bytes."""
+        path = self._path(key)
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)  # Atomic: readers never see partial files
+        self.evict()
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.directory.glob("*.json"))
+
+    def evict(self) -> int:
+        """Delete least recently used entries until under max_bytes."""
+        entries = []
+        for p in self.directory.glob("*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        for p in self.directory.glob("*.json"):
+            p.unlink()
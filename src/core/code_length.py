@@ -0,0 +1,122 @@
+"""
+CODE LENGTH METRICS
+
+Exact ideal code length (in bits) of a bit sequence under adaptive
+context models - a header-free, deterministic stand-in for compressors.
+
+KT estimator: an adaptive binary source that has seen a zeros and b ones
+predicts the next bit with (count + 1/2) / (a + b + 1). The probability
+it assigns to a whole sequence depends only on the final counts:
+
+    P_KT(a, b) = G(a + 1/2) G(b + 1/2) / (pi G(a + b + 1))
+
+so a sequential coder's total code length is a sum over contexts of
+-log2 P_KT(counts) - one bincount, no per-bit loop.
+
+- Order-k model: one KT estimator per k-bit context.
+- Context-tree weighting (CTW, depth D): mixes ALL context trees up to
+  depth D. Node probabilities depend only on node counts too, so the
+  tree is evaluated bottom-up one depth at a time, over the contexts
+  that actually occur (at most min(n, 2^d) nodes per depth).
+
+The first k (or D) bits, which have no full context, cost 1 bit each.
+
+Per-bit costs (kt_bit_costs) split the order-k code length over the
+positions: bit i costs -log2 of the KT prediction made from the counts
+of its context BEFORE i. They sum to kt_code_length exactly, so any
+reduction over positions (letters, words, verses) attributes the total.
+"""
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+from core.bitseq import Bits, as_bitseq
+from core.markov import context_codes
+
+LOG2E = 1 / math.log(2)
+
+
+def _lgamma(x: np.ndarray) -> np.ndarray:
+    """Elementwise lgamma (evaluated once per distinct value)."""
+    values, inverse = np.unique(x, return_inverse=True)
+    table = np.array([math.lgamma(v) for v in values.tolist()])
+    return table[inverse].reshape(x.shape)
+
+
+def kt_log_prob(zeros: np.ndarray, ones: np.ndarray) -> np.ndarray:
+    """Natural log of the KT block probability for each (zeros, ones) pair."""
+    zeros = zeros.astype(np.float64)
+    ones = ones.astype(np.float64)
+    return _lgamma(zeros + 0.5) + _lgamma(ones + 0.5) - _lgamma(zeros + ones + 1) - math.log(math.pi)
+
+
+def context_counts(bits: Bits, depth: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (contexts, zeros, ones) for every depth-bit context that occurs.
+
+    Context code = preceding bits MSB-first (most recent bit lowest), so
+    the depth-d suffix of a context is code mod 2^d. Contexts that never
+    occur have KT probability 1 and are left out.
+    """
+    arr = as_bitseq(bits).to_array().astype(np.int64)
+    grams = (context_codes(arr, depth) << 1) | arr[depth:]
+    counts = np.bincount(grams, minlength=2 << depth).reshape(-1, 2)
+    contexts = np.flatnonzero(counts.any(axis=1))
+    return contexts, counts[contexts, 0], counts[contexts, 1]
+
+
+def kt_code_length(bits: Bits, order: int) -> float:
+    """Code length in bits under an adaptive order-k KT context model."""
+    n = len(bits)
+    if n <= order:
+        return float(n)
+    _, zeros, ones = context_counts(bits, order)
+    return order - kt_log_prob(zeros, ones).sum() * LOG2E
+
+
+def _prior_counts(keys: np.ndarray) -> np.ndarray:
+    """For each position, how many earlier positions hold the same key."""
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    group_start = np.repeat(starts, np.diff(np.r_[starts, len(keys)]))
+    prior = np.empty(len(keys), dtype=np.int64)
+    prior[order] = np.arange(len(keys)) - group_start
+    return prior
+
+
+def kt_bit_costs(bits: Bits, order: int) -> np.ndarray:
+    """Sequential order-k KT code length of every bit (float64, sums to kt_code_length)."""
+    arr = as_bitseq(bits).to_array().astype(np.int64)
+    costs = np.ones(len(arr), dtype=np.float64)
+    if len(arr) <= order:
+        return costs
+    contexts = context_codes(arr, order)
+    seen_pair = _prior_counts((contexts << 1) | arr[order:])
+    seen_context = _prior_counts(contexts)
+    costs[order:] = np.log2(seen_context + 1.0) - np.log2(seen_pair + 0.5)
+    return costs
+
+
+def ctw_code_length(bits: Bits, depth: int) -> float:
+    """Code length in bits under context-tree weighting of the given depth."""
+    n = len(bits)
+    if n <= depth:
+        return float(n)
+    nodes, zeros, ones = context_counts(bits, depth)
+    log_half = math.log(0.5)
+
+    # Leaves: plain KT. Internal node s (depth d) has children s and
+    # s + 2^d at depth d+1 (one more, older, context bit); absent
+    # children have weighted probability 1 (log 0).
+    log_pw = kt_log_prob(zeros, ones)
+    for d in range(depth - 1, -1, -1):
+        nodes, parent = np.unique(nodes & ((1 << d) - 1), return_inverse=True)
+        zeros = np.bincount(parent, weights=zeros)
+        ones = np.bincount(parent, weights=ones)
+        children = np.bincount(parent, weights=log_pw)
+        log_pw = log_half + np.logaddexp(kt_log_prob(zeros, ones), children)
+
+    return depth - float(log_pw[0]) * LOG2E
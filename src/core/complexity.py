@@ -0,0 +1,157 @@
+"""
+COMPLEXITY METRICS
+
+Compressor-free structure measures of a bit sequence.
+
+Block entropy: H_k = Shannon entropy (bits) of the overlapping k-bit
+blocks, counted as rolling integer codes with one bincount. H_k / k
+tends to the entropy rate from above; k up to MAX_BLOCK.
+
+LZ76 complexity (Lempel & Ziv 1976, Kaspar & Schuster parsing): the
+number of phrases when the sequence is parsed left to right, each
+phrase being the longest prefix of the remainder that already occurs
+starting earlier (overlap allowed), plus one new bit.
+
+The parse needs L[i] = length of the longest match of position i with
+an earlier start. It is computed for ALL positions at once by refining
+groups of positions that share their first l bits (a breadth-first
+suffix trie), STAGE_BITS levels per stage:
+
+1. Sort the active positions by (group, next STAGE_BITS-bit block).
+2. A position whose whole block repeats an earlier one in its group
+   has L >= level + STAGE_BITS.
+3. For the first position of every distinct block, L inside the stage
+   is its longest common prefix with the nearest EARLIER position on
+   either side in sorted order (found by pointer jumping).
+4. Positions whose extended group is a singleton leave.
+
+Everything is vectorised; the work is about sum(L) / STAGE_BITS sorted
+elements plus one step per phrase for the parse itself.
+"""
+
+import math
+
+import numpy as np
+
+from core.bitseq import Bits, as_bitseq
+from core.markov import context_codes
+
+MAX_BLOCK = 20
+STAGE_BITS = 16
+
+
+def block_codes(arr: np.ndarray, k: int) -> np.ndarray:
+    """Integer code of every overlapping k-bit block, MSB-first."""
+    # context_codes stops one short (it codes contexts, not blocks)
+    return context_codes(np.append(arr, 0), k)
+
+
+def block_entropy(bits: Bits, k: int) -> float:
+    """Entropy H_k in bits of the overlapping k-bit blocks."""
+    if not 1 <= k <= MAX_BLOCK:
+        raise ValueError(f"k must be in 1..{MAX_BLOCK}")
+    arr = as_bitseq(bits).to_array().astype(np.int64)
+    if len(arr) < k:
+        return 0.0
+    codes = block_codes(arr, k)
+    if len(codes) << 4 < 1 << k:
+        counts = np.unique(codes, return_counts=True)[1]  # Sparse: few blocks occur
+    else:
+        counts = np.bincount(codes)
+    p = counts[counts > 0] / len(codes)
+    return float(-(p * np.log2(p)).sum())
+
+
+def _nearest_earlier(pos: np.ndarray) -> np.ndarray:
+    """Index of the nearest entry to the left holding a smaller value (-1 if none)."""
+    nearest = np.arange(-1, len(pos) - 1)
+    active = np.arange(1, len(pos))
+    while len(active):
+        # Everything strictly between nearest[r] and r exceeds pos[r]
+        candidate = nearest[active]
+        jump = pos[candidate] > pos[active]
+        active = active[jump]
+        nearest[active] = nearest[candidate[jump]]
+        active = active[nearest[active] >= 0]
+    return nearest
+
+
+_BIT_LENGTH = np.frexp(np.arange(1 << STAGE_BITS, dtype=np.float64))[1].astype(np.int64)
+
+
+def _common_prefix(a: np.ndarray, b: np.ndarray, width: int) -> np.ndarray:
+    """Shared leading bits of width-bit codes (0 unless the bits above width agree)."""
+    x = a ^ b
+    return np.where(x >> width == 0, width - _BIT_LENGTH[x & ((1 << width) - 1)], 0)
+
+
+def match_lengths(arr: np.ndarray) -> np.ndarray:
+    """L[i] = longest l such that arr[i:i+l] also starts at some j < i."""
+    n, k = len(arr), STAGE_BITS
+    lengths = np.zeros(n, dtype=np.int64)
+    blocks = block_codes(np.append(arr, np.zeros(k - 1, dtype=arr.dtype)), k)  # Zero-padded
+    pos = np.arange(n, dtype=np.int64)  # Ordered by (group, position)
+    group = np.zeros(n, dtype=np.int64)
+    level = 0
+    packable = (n * n) << k < 1 << 63  # Group ids stay below n
+    while len(pos):
+        key = (group << k) | blocks[pos + level]
+        if packable:
+            # Sorting (key, position) packed in one int64 beats a stable argsort
+            key, pos = np.divmod(np.sort(key * n + pos), n)
+        else:
+            order = np.argsort(key, kind="stable")
+            pos, key = pos[order], key[order]
+
+        # The last few positions see padding: cap their matches by hand
+        whole = pos + level + k <= n
+        for e in np.flatnonzero(~whole).tolist():
+            lo, hi = np.searchsorted(key, [key[e] >> k << k, (key[e] >> k) + 1 << k])
+            earlier = pos[lo:hi] < pos[e]
+            if earlier.any():
+                common = _common_prefix(key[lo:hi][earlier], key[e], k).max()
+                lengths[pos[e]] = level + min(int(common), n - level - int(pos[e]))
+        pos, key = pos[whole], key[whole]
+        if not len(pos):
+            break
+
+        first = np.r_[True, key[1:] != key[:-1]]
+        lengths[pos[~first]] = level + k
+        rep_pos, rep_key = pos[first], key[first]
+        best = np.zeros(len(rep_pos), dtype=np.int64)
+        for side in (slice(None), slice(None, None, -1)):
+            side_pos, side_key, side_best = rep_pos[side], rep_key[side], best[side]
+            nearest = _nearest_earlier(side_pos)
+            has = nearest >= 0
+            common = _common_prefix(side_key[has], side_key[nearest[has]], k)
+            side_best[has] = np.maximum(side_best[has], common)
+        hit = best > 0
+        lengths[rep_pos[hit]] = level + best[hit]
+
+        level += k
+        group = np.cumsum(first) - 1
+        keep = (np.bincount(group)[group] > 1) & (pos + level < n)
+        pos, group = pos[keep], group[keep]
+        if len(group):
+            group = np.cumsum(np.r_[True, group[1:] != group[:-1]]) - 1
+    return lengths
+
+
+def lz76_phrases(bits: Bits) -> int:
+    """Number of LZ76 phrases (Kaspar-Schuster complexity c(n))."""
+    arr = as_bitseq(bits).to_array().astype(np.int64)
+    n = len(arr)
+    lengths = match_lengths(arr).tolist()
+    phrases, i = 0, 0
+    while i < n:
+        i += lengths[i] + 1
+        phrases += 1
+    return phrases
+
+
+def lz76_complexity(bits: Bits) -> float:
+    """Normalised LZ76 complexity c(n) log2(n) / n (about 1 for random bits)."""
+    n = len(bits)
+    if n < 2:
+        return 1.0
+    return lz76_phrases(bits) * math.log2(n) / n
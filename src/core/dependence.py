@@ -0,0 +1,75 @@
+"""
+LAGGED DEPENDENCE
+
+Mutual information and autocorrelation between bits k apart, for every
+lag k = 1..L at once.
+
+Both need only, per lag, the number of pairs (x_i, x_{i+k}) that are
+both 1:
+
+    n11[k] = sum_i x_i x_{i+k}
+
+which is the raw autocorrelation of the bit sequence - one FFT of the
+zero-padded sequence gives all lags. With the ones counts of the two
+overlapping windows (cumulative sums) that fixes the 2x2 joint table
+of every lag, hence its mutual information; the autocorrelation
+function is the same sum centred on the mean.
+"""
+
+import numpy as np
+
+from core.bitseq import Bits, as_bitseq
+
+
+def _pair_counts(arr: np.ndarray, max_lag: int) -> np.ndarray:
+    """n11[k] for k = 0..max_lag (exact integers)."""
+    size = 1 << int(2 * len(arr) - 1).bit_length()
+    spectrum = np.fft.rfft(arr, size)
+    raw = np.fft.irfft(spectrum * spectrum.conj(), size)[:max_lag + 1]
+    return np.rint(raw).astype(np.int64)
+
+
+def lagged_mutual_information(bits: Bits, max_lag: int) -> np.ndarray:
+    """I(x_i; x_{i+k}) in bits for k = 1..max_lag (shorter if the sequence is)."""
+    arr = as_bitseq(bits).to_array().astype(np.float64)
+    n = len(arr)
+    max_lag = min(max_lag, n - 1)
+    if max_lag < 1:
+        return np.zeros(0)
+
+    lags = np.arange(1, max_lag + 1)
+    ones = np.r_[0, np.cumsum(arr)]
+    pairs = (n - lags).astype(np.float64)
+    n11 = _pair_counts(arr, max_lag)[1:].astype(np.float64)
+    first = ones[n - lags]  # Ones in x[:n-k]
+    second = ones[n] - ones[lags]  # Ones in x[k:]
+
+    # Joint table (x_i, x_{i+k}) and its margins, per lag
+    joint = np.stack([pairs - first - second + n11, second - n11, first - n11, n11]) / pairs
+    p_first = np.stack([1 - first / pairs, 1 - first / pairs, first / pairs, first / pairs])
+    p_second = np.stack([1 - second / pairs, second / pairs, 1 - second / pairs, second / pairs])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = joint * np.log2(joint / (p_first * p_second))
+    return np.where(joint > 0, terms, 0.0).sum(axis=0).clip(min=0.0)
+
+
+def autocorrelation_function(bits: Bits, max_lag: int) -> np.ndarray:
+    """
+    Autocorrelation rho(k) for k = 1..max_lag.
+
+    Same estimator as binary_analysis.autocorrelation (sum over the
+    overlap, normalised by the total variance), for all lags at once.
+    """
+    arr = as_bitseq(bits).to_array().astype(np.float64)
+    n = len(arr)
+    max_lag = min(max_lag, n - 1)
+    if max_lag < 1:
+        return np.zeros(0)
+
+    centred = arr - arr.mean()
+    size = 1 << int(2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(centred, size)
+    acov = np.fft.irfft(spectrum * spectrum.conj(), size)[:max_lag + 1]
+    if acov[0] <= 0:
+        return np.zeros(max_lag)  # Constant sequence
+    return acov[1:] / acov[0]
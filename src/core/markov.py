@@ -0,0 +1,215 @@
+"""
+MARKOV SURROGATES
+
+Order-k binary Markov chains fitted to a bitstring, for surrogate nulls:
+"does structure exceed order-k Markov?"
+
+Fitting is one vectorised n-gram count. Generation is inherently
+sequential, so it is parallelised over chunks instead of bits:
+
+1. Split the sequence into chunks; run every chunk from ALL 2^k start
+   states for a short warm-up with shared uniforms. Trajectories
+   driven by the same uniforms usually coalesce, after which the
+   chunk's end state no longer depends on where it started.
+2. Chunks that did not coalesce are run from all start states to the
+   end (exact, just slower).
+3. Stitch chunk start states sequentially, then generate the bits of
+   every chunk (and every surrogate in the batch) in one vectorised
+   pass from the true starts.
+
+The result is exactly the chain a bit-by-bit loop would produce from
+the same uniforms (MarkovModel.sample documents their layout).
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from core.bitseq import BitSeq, Bits, as_bitseq
+
+MAX_ORDER = 8
+
+CHUNK_LEN = 2048  # Bits per chunk
+WARMUP = 64  # Steps from all start states before checking coalescence
+DEDUP_EVERY = 8  # Warm-up steps between merging coalesced trajectories
+MAX_BATCH_BITS = 1 << 22  # Bits generated at once (8 bytes of uniforms each)
+
+
+def context_codes(arr: np.ndarray, order: int) -> np.ndarray:
+    """
+    Integer code of the `order` bits preceding each position >= order.
+
+    codes[i] = arr[i : i+order] read MSB-first (predicts arr[i+order]).
+    """
+    n = len(arr) - order
+    codes = np.zeros(max(n, 0), dtype=np.int64)
+    for j in range(order):
+        codes = (codes << 1) | arr[j:j + n]
+    return codes
+
+
+class MarkovModel:
+    """
+    Order-k binary Markov chain.
+
+    p_one[context] = P(next bit = 1 | previous k bits), 0.5 for
+    contexts never followed by a bit in the training data.
+    """
+
+    def __init__(self, order: int, p_one: np.ndarray, initial: np.ndarray):
+        if not 1 <= order <= MAX_ORDER:
+            raise ValueError(f"order must be in 1..{MAX_ORDER}")
+        self.order = order
+        self.p_one = p_one
+        self.initial = initial  # First k bits (surrogates start with them)
+
+    @classmethod
+    def fit(cls, bits: Bits, order: int) -> "MarkovModel":
+        """Maximum-likelihood transition table from (k+1)-gram counts."""
+        arr = as_bitseq(bits).to_array().astype(np.int64)
+        if len(arr) <= order:
+            raise ValueError("bitstring shorter than Markov order")
+
+        n_states = 1 << order
+        grams = (context_codes(arr, order) << 1) | arr[order:]
+        counts = np.bincount(grams, minlength=2 * n_states).reshape(n_states, 2)
+        totals = counts.sum(axis=1)
+        p_one = np.where(totals > 0, counts[:, 1] / np.maximum(totals, 1), 0.5)
+        return cls(order, p_one, arr[:order].astype(np.uint8))
+
+    def sample(self, n_bits: int, gens: List[np.random.Generator]) -> np.ndarray:
+        """
+        Generate surrogates of length n_bits, one per generator.
+
+        Each generator draws one (CHUNK_LEN, n_chunks) block of uniforms;
+        bit k + c*CHUNK_LEN + t uses uniform [t, c]. Surrogates are
+        generated MAX_BATCH_BITS at a time (each depends only on its
+        generator, so this does not change them).
+        Returns uint8 array (len(gens), n_bits) of 0/1.
+        """
+        k = self.order
+        mask = (1 << k) - 1
+        n_samples = len(gens)
+        n_steps = n_bits - k
+        if n_steps < 0:
+            raise ValueError("n_bits shorter than Markov order")
+        per_batch = max(1, MAX_BATCH_BITS // max(n_bits, 1))
+        if n_samples > per_batch:
+            return np.concatenate([
+                self.sample(n_bits, gens[i:i + per_batch])
+                for i in range(0, n_samples, per_batch)
+            ])
+
+        out = np.empty((n_samples, n_bits), dtype=np.uint8)
+        out[:, :k] = self.initial
+        if n_steps == 0 or n_samples == 0:
+            return out
+
+        start_state = 0
+        for b in self.initial.tolist():
+            start_state = (start_state << 1) | b
+
+        # Rows = (sample, chunk) pairs, sample-major; stored step-major
+        # so each step reads one contiguous row of uniforms.
+        # The last chunk is padded; its end state is never used.
+        n_chunks = (n_steps + CHUNK_LEN - 1) // CHUNK_LEN
+        u = np.concatenate([g.random((CHUNK_LEN, n_chunks)) for g in gens], axis=1)
+
+        end_states = self._chunk_end_states(u, mask)
+
+        # Stitch: true start state of every chunk
+        starts = np.empty((n_samples, n_chunks), dtype=np.int64)
+        state = np.full(n_samples, start_state, dtype=np.int64)
+        ends = end_states.reshape(n_samples, n_chunks, -1)
+        rows = np.arange(n_samples)
+        for c in range(n_chunks):
+            starts[:, c] = state
+            state = ends[rows, c, state]
+
+        # Generate from the true starts
+        state = starts.reshape(-1)
+        chunk_bits = np.empty(u.shape, dtype=np.uint8)
+        for t in range(CHUNK_LEN):
+            bit = u[t] < self.p_one[state]
+            chunk_bits[t] = bit
+            state = ((state << 1) | bit) & mask
+
+        # (step, sample, chunk) -> (sample, chunk, step) = time order
+        ordered = chunk_bits.reshape(CHUNK_LEN, n_samples, n_chunks).transpose(1, 2, 0)
+        out[:, k:] = ordered.reshape(n_samples, -1)[:, :n_steps]
+        return out
+
+    def _chunk_end_states(self, u: np.ndarray, mask: int) -> np.ndarray:
+        """End state of every chunk row for every start state: (rows, 2^k)."""
+        chunk_len, n_rows = u.shape
+        n_states = mask + 1
+        p_one = self.p_one
+
+        def run(states: np.ndarray, u_rows: np.ndarray, t0: int, t1: int) -> np.ndarray:
+            for t in range(t0, t1):
+                bit = u_rows[t, :, None] < p_one[states]
+                states = ((states << 1) | bit) & mask
+            return states
+
+        # Warm-up from all start states, merging trajectories as they meet.
+        # col[row, start] = column of `states` that start's trajectory is in.
+        states = np.tile(np.arange(n_states), (n_rows, 1))
+        col = np.tile(np.arange(n_states), (n_rows, 1))
+        warm = min(WARMUP, chunk_len)
+        for t0 in range(0, warm, DEDUP_EVERY):
+            states = run(states, u, t0, min(warm, t0 + DEDUP_EVERY))
+            states, merged = _distinct_per_row(states)
+            col = np.take_along_axis(merged, col, axis=1)
+
+        # Coalesced rows need one trajectory from here on; the rest
+        # (usually few) keep every distinct trajectory
+        split = ~(states == states[:, :1]).all(axis=1)
+        rest = states[split]
+        states = np.repeat(run(states[:, :1], u, warm, chunk_len), states.shape[1], axis=1)
+        if len(rest):
+            states[split] = run(rest, u[:, split], warm, chunk_len)
+        return np.take_along_axis(states, col, axis=1)
+
+
+def _distinct_per_row(states: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Deduplicate each row of a state matrix.
+
+    Returns (distinct, index): distinct is (rows, width) with each row's
+    distinct states (padded by repeating its first), and
+    distinct[r, index[r, j]] == states[r, j].
+    """
+    order = np.argsort(states, axis=1, kind='stable')
+    ordered = np.take_along_axis(states, order, axis=1)
+    new = np.ones(ordered.shape, dtype=bool)
+    new[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    rank = np.cumsum(new, axis=1) - 1
+
+    width = int(rank[:, -1].max()) + 1
+    distinct = np.repeat(ordered[:, :1], width, axis=1)
+    rows = np.repeat(np.arange(len(states)), states.shape[1])
+    distinct[rows, rank.ravel()] = ordered.ravel()
+
+    index = np.empty_like(rank)
+    np.put_along_axis(index, order, rank, axis=1)
+    return distinct, index
+
+
+def sample_surrogates(
+    bits: Bits,
+    order: int,
+    gens: List[np.random.Generator],
+    model: Optional[MarkovModel] = None
+) -> List[Bits]:
+    """
+    One order-k surrogate of `bits` per generator, generated together.
+
+    Output has the same form (str or BitSeq) as the input.
+    """
+    if model is None:
+        model = MarkovModel.fit(bits, order)
+    arrays = model.sample(len(bits), gens)
+
+    if isinstance(bits, BitSeq):
+        return [BitSeq.from_bits(a) for a in arrays]
+    return [(a + ord('0')).tobytes().decode('ascii') for a in arrays]
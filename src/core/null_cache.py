@@ -0,0 +1,100 @@
+"""
+NULL DISTRIBUTION CACHE
+
+Persisted null distributions for density-only nulls.
+
+A null like the full bit shuffle ("random") sees nothing of the
+bitstring but its length and number of ones, so its null distribution
+under a metric depends only on
+
+    (metric, length, ones, seed, seed mode)
+
+- not on the corpus or the encoding. The cache computes it ONCE and
+stores the metric values as a float64 .npy file; every later test with
+the same length and density reads it back instead of recompressing
+n_perm shuffles.
+
+Value i depends only on the seed, so a file with fewer values than
+requested is regenerated larger and existing values never change.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from core.cache import fingerprint_fn
+
+NULL_CACHE_VERSION = 1
+
+
+class NullDistributionCache:
+    """Directory of null distributions keyed by bitstring density."""
+
+    def __init__(self, directory: str = "output/null_cache"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(
+        metric_name: str,
+        metric_fn: Callable,
+        null_name: str,
+        null_fn: Callable,
+        n_bits: int,
+        n_ones: int,
+        seed: int,
+        seed_mode: str
+    ) -> str:
+        payload = {
+            "version": NULL_CACHE_VERSION,
+            "metric": metric_name,
+            "metric_fn": fingerprint_fn(metric_fn),
+            "null": null_name,
+            "null_fn": fingerprint_fn(null_fn),
+            "n_bits": n_bits,
+            "n_ones": n_ones,
+            "seed": seed,
+            "seed_mode": seed_mode,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npy"
+
+    def load(self, key: str, n_perm: int) -> Optional[np.ndarray]:
+        """The first n_perm null values, or None if not stored."""
+        try:
+            values = np.load(self._path(key))
+        except (OSError, ValueError):
+            return None
+        return values[:n_perm] if len(values) >= n_perm else None
+
+    def get_or_create(
+        self,
+        key: str,
+        n_perm: int,
+        compute: Callable[[int], np.ndarray]
+    ) -> np.ndarray:
+        """
+        At least the first n_perm null values.
+
+        compute(n) must return the values of permutations 0..n-1.
+        """
+        values = self.load(key, n_perm)
+        if values is not None:
+            return values
+
+        values = np.asarray(compute(n_perm), dtype=np.float64)
+        path = self._path(key)
+        tmp = path.with_suffix(f".tmp{os.getpid()}.npy")
+        np.save(tmp, values)
+        os.replace(tmp, path)  # Atomic: readers never see partial files
+        return values
+
+    def clear(self) -> None:
+        for p in self.directory.glob("*.npy"):
+            p.unlink()
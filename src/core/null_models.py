@@ -9,6 +9,11 @@ import random
 import re
 from typing import List, Callable
 
+import numpy as np
+
+from core.bitseq import block_shuffle_array
+from core.markov import sample_surrogates
+
 
 def null_random_shuffle(bits: str) -> str:
     """
@@ -27,9 +32,9 @@ def null_block_shuffle(bits: str, block_size: int = 20) -> str:
     Preserves: Local patterns within blocks
     Destroys: Long-range structure
     """
-    blocks = [bits[i:i+block_size] for i in range(0, len(bits), block_size)]
-    random.shuffle(blocks)
-    return ''.join(blocks)
+    gen = np.random.default_rng(random.getrandbits(64))
+    codes = np.frombuffer(bits.encode('ascii'), dtype=np.uint8)
+    return block_shuffle_array(codes, block_size, gen).tobytes().decode('ascii')
 
 
 def null_markov_surrogate(bits: str) -> str:
@@ -43,30 +48,9 @@ def null_markov_surrogate(bits: str) -> str:
     if len(bits) < 2:
         return bits
 
-    # Count transitions
-    transitions = {'0': {'0': 0, '1': 0}, '1': {'0': 0, '1': 0}}
-    for i in range(len(bits) - 1):
-        transitions[bits[i]][bits[i+1]] += 1
-
-    # Convert to probabilities
-    probs = {}
-    for prev in ['0', '1']:
-        total = transitions[prev]['0'] + transitions[prev]['1']
-        if total > 0:
-            probs[prev] = transitions[prev]['1'] / total
-        else:
-            probs[prev] = 0.5
-
-    # Generate surrogate
-    result = [bits[0]]  # Start with same first bit
-    for _ in range(len(bits) - 1):
-        prev = result[-1]
-        if random.random() < probs[prev]:
-            result.append('1')
-        else:
-            result.append('0')
-
-    return ''.join(result)
+    # Vectorised fit + generation (core.markov); seeded from `random`
+    gen = np.random.default_rng(random.getrandbits(64))
+    return sample_surrogates(bits, 1, [gen])[0]
 
 
 def null_word_permutation(text: str, encode_fn: Callable) -> str:
@@ -0,0 +1,112 @@
+"""
+PERMUTATION BANK
+
+Precomputed index-null permutations, shared across tests.
+
+The positions drawn by an index null (word_perm, block_k, ...) depend
+only on the corpus, the null and the seed - not on the encoding or the
+metric under test. The bank draws them ONCE and stores them as a
+(n_perm, n_tokens) uint32 .npy file; tests read rows through a
+read-only memory map, so forked workers share the pages (zero copy).
+
+Files are keyed by (corpus hash, null implementation, seed, seed mode)
+plus the corpus boundaries a hierarchical null reads.
+A bank with fewer rows than requested is regenerated larger: permutation
+i depends only on the seed, so existing rows never change.
+
+Size: n_perm * n_tokens * 4 bytes. 1000 word permutations of the
+Quran corpus (~78k words) take ~300 MB; letter-level nulls (block_k,
+~330k letters) take ~1.3 GB per 1000 permutations. Banks above
+max_bytes (MAX_BANK_BYTES by default) are not written: those tests
+draw their permutations instead, with the same results.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from core.cache import fingerprint_fn, hash_text
+
+BANK_VERSION = 1
+MAX_BANK_BYTES = 1 << 30
+
+
+class PermutationBank:
+    """Directory of memory-mapped permutation arrays."""
+
+    def __init__(self, directory: str = "output/perm_bank", max_bytes: int = MAX_BANK_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def fits(self, n_perm: int, n_tokens: int) -> bool:
+        """Is a (n_perm, n_tokens) bank within max_bytes?"""
+        return n_perm * n_tokens * np.dtype(np.uint32).itemsize <= self.max_bytes
+
+    @staticmethod
+    def make_key(
+        corpus_text: str,
+        null_name: str,
+        index_fn: Callable,
+        unit: str,
+        seed: int,
+        seed_mode: str,
+        boundaries: Optional[Dict[str, Tuple[int, ...]]] = None
+    ) -> str:
+        payload = {
+            "version": BANK_VERSION,
+            "corpus": hash_text(corpus_text),
+            "null": null_name,
+            "index_fn": fingerprint_fn(index_fn),
+            "unit": unit,
+            "seed": seed,
+            "seed_mode": seed_mode,
+        }
+        if boundaries:
+            payload["boundaries"] = boundaries
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npy"
+
+    def load(self, key: str, n_perm: int) -> Optional[np.ndarray]:
+        """Read-only memory map with >= n_perm rows, or None."""
+        try:
+            bank = np.load(self._path(key), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        return bank if len(bank) >= n_perm else None
+
+    def get_or_create(
+        self,
+        key: str,
+        n_perm: int,
+        n_tokens: int,
+        draw: Callable[[int], Iterator[np.ndarray]]
+    ) -> np.ndarray:
+        """
+        Memory-mapped bank with at least n_perm rows.
+
+        draw(n) must yield the positions of permutations 0..n-1 in order.
+        """
+        bank = self.load(key, n_perm)
+        if bank is not None:
+            return bank
+
+        path = self._path(key)
+        tmp = path.with_suffix(f".tmp{os.getpid()}.npy")
+        out = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.uint32, shape=(n_perm, n_tokens))
+        for i, positions in enumerate(draw(n_perm)):
+            out[i] = positions
+        out.flush()
+        del out
+        os.replace(tmp, path)  # Atomic: readers never see partial banks
+        return np.load(path, mmap_mode='r')
+
+    def clear(self) -> None:
+        for p in self.directory.glob("*.npy"):
+            p.unlink()
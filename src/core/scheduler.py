@@ -0,0 +1,361 @@
+"""
+JOB SCHEDULER
+
+Persistent local queue for sweeps of TestSpec / LengthScaleSpec.
+
+- SQLite file, no external broker
+- Identical specs are deduplicated: jobs are keyed by spec + corpus text
+  (api.job_key), which survives code edits. The implementations' hash
+  (api.code_fingerprint) is stored alongside; a checkpoint or result
+  from other code is stale - not resumed, not returned, and redone when
+  the spec is resubmitted
+- Higher priority runs first, ties in submission order
+- A pool of forked workers claims jobs from the database
+- Partial null distributions are checkpointed, so a killed sweep
+  resumes mid-test instead of starting over
+
+Usage:
+    scheduler = Scheduler("output/jobs.db")
+    scheduler.submit_many(specs, priority=1)
+    scheduler.submit(LengthScaleSpec("quran", "ord_5bit", "zlib"))
+    scheduler.run(workers=8)
+    result = scheduler.result(specs[0])
+
+Components must be registered before submit() and run(): workers are
+forked from the calling process and inherit its registries.
+"""
+
+import json
+import multiprocessing as mp
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from core.api import (
+    TestSpec,
+    TestResult,
+    LengthScaleSpec,
+    LengthScaleResult,
+    run_test_resumable,
+    length_scale_test_specs,
+    length_scale_result,
+    job_key,
+    code_fingerprint,
+)
+
+Spec = Union[TestSpec, LengthScaleSpec]
+
+
+class JobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    spec TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    worker_pid INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    checkpoint TEXT,
+    result TEXT,
+    fingerprint TEXT,
+    error TEXT,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, seq);
+"""
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Scheduler:
+    """
+    SQLite-backed job queue for TestSpecs.
+
+    A LengthScaleSpec is expanded into one TestSpec job per block size;
+    its result is assembled once all of them are done.
+
+    Args:
+        path: Database file (created if missing)
+        checkpoint_every: Permutations between checkpoints
+    """
+
+    def __init__(self, path: str = "output/jobs.db", checkpoint_every: int = 100):
+        self.path = Path(path)
+        self.checkpoint_every = checkpoint_every
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+            columns = [row[1] for row in db.execute("PRAGMA table_info(jobs)")]
+            if "fingerprint" not in columns:  # Databases from before fingerprints
+                db.execute("ALTER TABLE jobs ADD COLUMN fingerprint TEXT")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation: safe across fork
+        db = sqlite3.connect(str(self.path), timeout=60, isolation_level=None)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    # ------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------
+
+    def submit(self, spec: Spec, priority: int = 0) -> List[str]:
+        """
+        Queue a spec. Returns the job keys it maps to.
+
+        Resubmitting a queued spec only raises its priority; a job run
+        (or checkpointed) with other code is reset to pending.
+        """
+        if isinstance(spec, LengthScaleSpec):
+            test_specs = length_scale_test_specs(spec)
+        else:
+            errors = spec.validate()
+            if errors:
+                raise ValueError(f"Invalid TestSpec: {'; '.join(errors)}")
+            test_specs = [spec]
+
+        keys = []
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            for test_spec in test_specs:
+                key = job_key(test_spec)
+                fingerprint = code_fingerprint(test_spec)
+                seq = db.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM jobs").fetchone()[0]
+                db.execute(
+                    "INSERT OR IGNORE INTO jobs (key, seq, spec, priority, status, fingerprint, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, seq, json.dumps(asdict(test_spec)), priority,
+                     JobStatus.PENDING.value, fingerprint, time.time())
+                )
+                db.execute(
+                    "UPDATE jobs SET status = ?, checkpoint = NULL, result = NULL, error = NULL, "
+                    "attempts = 0, fingerprint = ? "
+                    "WHERE key = ? AND fingerprint IS NOT ? AND status != ?",
+                    (JobStatus.PENDING.value, fingerprint, key, fingerprint, JobStatus.RUNNING.value)
+                )
+                db.execute(
+                    "UPDATE jobs SET priority = ? WHERE key = ? AND priority < ?",
+                    (priority, key, priority)
+                )
+                keys.append(key)
+            db.execute("COMMIT")
+        return keys
+
+    def submit_many(self, specs: Iterable[Spec], priority: int = 0) -> List[str]:
+        keys = []
+        for spec in specs:
+            keys.extend(self.submit(spec, priority))
+        return keys
+
+    # ------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------
+
+    def recover(self) -> int:
+        """Requeue jobs left RUNNING by dead workers (checkpoints kept)."""
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            rows = db.execute(
+                "SELECT key, worker_pid FROM jobs WHERE status = ?",
+                (JobStatus.RUNNING.value,)
+            ).fetchall()
+            stale = [key for key, pid in rows if not _pid_alive(pid)]
+            for key in stale:
+                db.execute(
+                    "UPDATE jobs SET status = ?, worker_pid = NULL WHERE key = ?",
+                    (JobStatus.PENDING.value, key)
+                )
+            db.execute("COMMIT")
+        return len(stale)
+
+    def retry_failed(self) -> int:
+        """Requeue FAILED jobs."""
+        with self._connect() as db:
+            return db.execute(
+                "UPDATE jobs SET status = ?, error = NULL WHERE status = ?",
+                (JobStatus.PENDING.value, JobStatus.FAILED.value)
+            ).rowcount
+
+    def _claim(self) -> Optional[tuple]:
+        """Atomically take the highest-priority pending job."""
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute(
+                "SELECT key, spec, checkpoint, fingerprint FROM jobs WHERE status = ? "
+                "ORDER BY priority DESC, seq LIMIT 1",
+                (JobStatus.PENDING.value,)
+            ).fetchone()
+            if row is not None:
+                db.execute(
+                    "UPDATE jobs SET status = ?, worker_pid = ?, attempts = attempts + 1, "
+                    "updated = ? WHERE key = ?",
+                    (JobStatus.RUNNING.value, os.getpid(), time.time(), row[0])
+                )
+            db.execute("COMMIT")
+        return row
+
+    def _update(self, key: str, **fields: Any) -> None:
+        fields["updated"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as db:
+            db.execute(f"UPDATE jobs SET {columns} WHERE key = ?", (*fields.values(), key))
+
+    def _run_job(
+        self,
+        key: str,
+        spec_json: str,
+        checkpoint_json: Optional[str],
+        fingerprint: Optional[str],
+        use_word_table: bool
+    ) -> None:
+        spec = TestSpec(**json.loads(spec_json))
+        current = code_fingerprint(spec)
+        # A checkpoint from other code would mix two null distributions
+        if fingerprint != current:
+            checkpoint_json = None
+            self._update(key, checkpoint=None, fingerprint=current)
+        resume = json.loads(checkpoint_json) if checkpoint_json else None
+
+        def checkpoint(state: Dict[str, Any]) -> None:
+            self._update(key, checkpoint=json.dumps(state))
+
+        try:
+            result = run_test_resumable(
+                spec,
+                checkpoint=checkpoint,
+                resume=resume,
+                checkpoint_every=self.checkpoint_every,
+                use_word_table=use_word_table
+            )
+        except Exception as e:
+            self._update(key, status=JobStatus.FAILED.value, worker_pid=None,
+                         error=f"{type(e).__name__}: {e}")
+            return
+
+        self._update(key, status=JobStatus.DONE.value, worker_pid=None, checkpoint=None,
+                     result=json.dumps(result.to_dict()), fingerprint=current)
+
+    def work(self, use_word_table: bool = True, max_jobs: Optional[int] = None) -> int:
+        """Run jobs in this process until the queue is empty. Returns jobs run."""
+        n = 0
+        while max_jobs is None or n < max_jobs:
+            row = self._claim()
+            if row is None:
+                break
+            self._run_job(*row, use_word_table=use_word_table)
+            n += 1
+        return n
+
+    def run(self, workers: int = 1, use_word_table: bool = True) -> Dict[str, int]:
+        """
+        Drain the queue with a pool of worker processes.
+
+        Each worker runs whole jobs (one test at a time, single-process),
+        so parallelism is across specs. Returns status counts.
+        """
+        self.recover()
+
+        if workers <= 1 or "fork" not in mp.get_all_start_methods():
+            self.work(use_word_table)
+            return self.status()
+
+        ctx = mp.get_context("fork")
+        procs = [
+            ctx.Process(target=self.work, args=(use_word_table,))
+            for _ in range(workers)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+
+        self.recover()  # Jobs of workers that died mid-run go back to the queue
+        return self.status()
+
+    # ------------------------------------------------------------
+    # Inspection
+    # ------------------------------------------------------------
+
+    def status(self) -> Dict[str, int]:
+        """Job counts per status."""
+        counts = {s.value: 0 for s in JobStatus}
+        with self._connect() as db:
+            for status, n in db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+                counts[status] = n
+        return counts
+
+    def progress(self, spec: TestSpec) -> int:
+        """Permutations done so far (checkpointed) for a queued spec; 0 if stale."""
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT status, checkpoint, result, fingerprint FROM jobs WHERE key = ?",
+                (job_key(spec),)
+            ).fetchone()
+        if row is None:
+            return 0
+        status, checkpoint, result, fingerprint = row
+        if fingerprint != code_fingerprint(spec):
+            return 0
+        if status == JobStatus.DONE.value:
+            return json.loads(result)["n_perm_used"]
+        return len(json.loads(checkpoint)["values"]) if checkpoint else 0
+
+    def failures(self) -> List[Dict[str, Any]]:
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT spec, error, attempts FROM jobs WHERE status = ? ORDER BY seq",
+                (JobStatus.FAILED.value,)
+            ).fetchall()
+        return [{"spec": json.loads(s), "error": e, "attempts": a} for s, e, a in rows]
+
+    def _test_result(self, spec: TestSpec) -> Optional[TestResult]:
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT result FROM jobs WHERE key = ? AND status = ? AND fingerprint = ?",
+                (job_key(spec), JobStatus.DONE.value, code_fingerprint(spec))
+            ).fetchone()
+        return TestResult.from_dict(json.loads(row[0])) if row else None
+
+    def result(self, spec: Spec) -> Optional[Union[TestResult, LengthScaleResult]]:
+        """Result of a finished spec, or None if not (fully) done or stale."""
+        if isinstance(spec, LengthScaleSpec):
+            results = [self._test_result(s) for s in length_scale_test_specs(spec)]
+            if any(r is None for r in results):
+                return None
+            return length_scale_result(spec, results)
+        return self._test_result(spec)
+
+    def results(self) -> Iterator[TestResult]:
+        """All finished TestResults, in submission order (stale ones included)."""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT result FROM jobs WHERE status = ? ORDER BY seq",
+                (JobStatus.DONE.value,)
+            ).fetchall()
+        for (data,) in rows:
+            yield TestResult.from_dict(json.loads(data))
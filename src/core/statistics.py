@@ -13,6 +13,10 @@ import lzma
 from typing import Dict, List, Callable, Any
 from dataclasses import dataclass
 
+import numpy as np
+
+from core.bitseq import Bits, ascii_bytes, symbol_bytes
+
 
 # ============================================================
 # COMPRESSION FUNCTIONS
@@ -40,16 +44,28 @@ COMPRESSORS = {
 }
 
 
-def compression_ratio(bits: str, compressor: str = 'zlib') -> float:
+def compression_ratio(bits: Bits, compressor: str = 'zlib') -> float:
     """Compute compression ratio using specified compressor."""
     if not bits:
         return 1.0
-    data = bits.encode()
+    data = ascii_bytes(bits)
     original = len(data)
     compressed = COMPRESSORS[compressor](data)
     return compressed / original
 
 
+def compression_bits_per_bit(bits: Bits, compressor: str = 'zlib', width: int = 8) -> float:
+    """
+    Compressed size in bits per input bit, compressing symbol_bytes.
+
+    width=8: bit-packed input; width=5: one byte per 5-bit symbol.
+    Comparable to 8 * compression_ratio (which is per ASCII byte).
+    """
+    if not bits:
+        return 1.0
+    return 8 * COMPRESSORS[compressor](symbol_bytes(bits, width)) / len(bits)
+
+
 def compression_all(bits: str) -> Dict[str, float]:
     """Compute compression ratio with all compressors."""
     return {name: compression_ratio(bits, name) for name in COMPRESSORS}
@@ -189,3 +205,64 @@ def bonferroni_threshold(alpha: float, n_tests: int) -> float:
 def is_significant_corrected(p_value: float, alpha: float, n_tests: int) -> bool:
     """Check if p-value is significant after Bonferroni correction."""
     return p_value < bonferroni_threshold(alpha, n_tests)
+
+
+# ============================================================
+# WESTFALL-YOUNG MAX-T CORRECTION
+# ============================================================
+
+def westfall_young_maxT(observed: List[float], null: List[List[float]]) -> List[float]:
+    """
+    Step-down max-T adjusted p-values (Westfall & Young 1993, Alg. 4.1).
+
+    Unlike Bonferroni, accounts for dependence between tests: the null
+    of the MAXIMUM statistic is taken from the same permutations.
+
+    Args:
+        observed: Statistic per test (larger = more extreme)
+        null: null[b][j] = statistic of test j on permutation b.
+            All tests MUST be evaluated on the same permutations.
+
+    Returns:
+        Adjusted p-value per test, (count + 1) / (B + 1) convention.
+    """
+    t = np.asarray(observed, dtype=float)
+    null_t = np.asarray(null, dtype=float).reshape(-1, len(t))
+    n_perm = null_t.shape[0]
+
+    # Most extreme first
+    order = np.argsort(-t, kind="stable")
+
+    # u[b, k] = max over the k-th and all less extreme tests
+    u = np.maximum.accumulate(null_t[:, order][:, ::-1], axis=1)[:, ::-1]
+
+    counts = (u >= t[order]).sum(axis=0)
+    p_ordered = (counts + 1) / (n_perm + 1)
+
+    # Step-down monotonicity
+    p_ordered = np.maximum.accumulate(p_ordered)
+
+    adjusted = np.empty_like(p_ordered)
+    adjusted[order] = p_ordered
+    return adjusted.tolist()
+
+
+def holm_across_families(family_p: List[List[float]]) -> List[List[float]]:
+    """
+    Combine per-family adjusted p-values with Holm across the families.
+
+    Each family's p-values must already control the FWER inside it (e.g.
+    max-T on that family's own permutations); no joint null across
+    families is needed. Families are ordered by their smallest p-value
+    and the k-th is scaled by (K - k); the running maximum keeps the
+    step-down monotone.
+    """
+    n_families = len(family_p)
+    adjusted: List[List[float]] = [[] for _ in family_p]
+    floor = 0.0
+    order = sorted(range(n_families), key=lambda f: min(family_p[f], default=1.0))
+    for rank, f in enumerate(order):
+        scale = n_families - rank
+        floor = max(floor, min(1.0, scale * min(family_p[f], default=1.0)))
+        adjusted[f] = [max(floor, min(1.0, scale * p)) for p in family_p[f]]
+    return adjusted
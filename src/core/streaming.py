@@ -0,0 +1,230 @@
+"""
+STREAMING NULL SUMMARIES
+
+Constant-memory summary of a null distribution.
+
+Keeps everything a TestResult reports without storing the samples:
+- count, min, max
+- exact moments (mean, std)
+- count of nulls as extreme as observed (→ permutation p-value)
+- a quantile sketch (relative-error log buckets, DDSketch-style)
+
+Summaries MERGE: workers summarise their chunks, the parent merges.
+Moments use exact (Shewchuk) summation and the sketch uses integer
+counts, so a merged summary does not depend on how samples were split.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class ExactSum:
+    """Exact float sum as non-overlapping partials (order-independent)."""
+
+    def __init__(self, partials: Optional[List[float]] = None):
+        self.partials: List[float] = list(partials or [])
+
+    def add(self, x: float) -> None:
+        partials = self.partials
+        i = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                partials[i] = lo
+                i += 1
+            x = hi
+        partials[i:] = [x]
+
+    def merge(self, other: "ExactSum") -> None:
+        for p in other.partials:
+            self.add(p)
+
+    @property
+    def value(self) -> float:
+        return math.fsum(self.partials)
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative accuracy.
+
+    Value x > 0 goes to bucket ceil(log_gamma(x)); negatives are mirrored.
+    Any quantile is returned within relative_accuracy of a true sample.
+    """
+
+    def __init__(self, relative_accuracy: float = 1e-4):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+
+    def _key(self, x: float) -> int:
+        return math.ceil(math.log(x) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        if x > 0:
+            k = self._key(x)
+            self.positive[k] = self.positive.get(k, 0) + 1
+        elif x < 0:
+            k = self._key(-x)
+            self.negative[k] = self.negative.get(k, 0) + 1
+        else:
+            self.zero += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for k, c in other.positive.items():
+            self.positive[k] = self.positive.get(k, 0) + c
+        for k, c in other.negative.items():
+            self.negative[k] = self.negative.get(k, 0) + c
+        self.zero += other.zero
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return float('nan')
+        rank = q * (self.count - 1)
+        seen = 0
+        # Ascending order: most negative first
+        for k in sorted(self.negative, reverse=True):
+            seen += self.negative[k]
+            if seen > rank:
+                return -self._value(k)
+        seen += self.zero
+        if seen > rank:
+            return 0.0
+        for k in sorted(self.positive):
+            seen += self.positive[k]
+            if seen > rank:
+                return self._value(k)
+        return self._value(max(self.positive))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "positive": {str(k): c for k, c in self.positive.items()},
+            "negative": {str(k): c for k, c in self.negative.items()},
+            "zero": self.zero,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(data["relative_accuracy"])
+        sketch.positive = {int(k): c for k, c in data["positive"].items()}
+        sketch.negative = {int(k): c for k, c in data["negative"].items()}
+        sketch.zero = data["zero"]
+        sketch.count = sketch.zero + sum(sketch.positive.values()) + sum(sketch.negative.values())
+        return sketch
+
+
+class NullSummary:
+    """
+    Streaming summary of null samples for one test.
+
+    Args:
+        observed: Observed metric value (extremeness reference; also the
+            shift for the moment sums, which keeps them well conditioned)
+        lower_is_extreme: True for MetricDirection.LOWER metrics
+    """
+
+    def __init__(self, observed: float, lower_is_extreme: bool = True, relative_accuracy: float = 1e-4):
+        self.observed = observed
+        self.lower_is_extreme = lower_is_extreme
+        self.n = 0
+        self.count_extreme = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._s1 = ExactSum()  # sum(x - observed)
+        self._s2 = ExactSum()  # sum((x - observed)^2)
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    @classmethod
+    def from_values(cls, values: Iterable[float], observed: float, lower_is_extreme: bool = True) -> "NullSummary":
+        summary = cls(observed, lower_is_extreme)
+        summary.extend(values)
+        return summary
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        if (x <= self.observed) if self.lower_is_extreme else (x >= self.observed):
+            self.count_extreme += 1
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        d = x - self.observed
+        self._s1.add(d)
+        self._s2.add(d * d)
+        self.sketch.add(x)
+
+    def extend(self, values: Iterable[float]) -> None:
+        for x in values:
+            self.add(x)
+
+    def merge(self, other: "NullSummary") -> "NullSummary":
+        """Fold another summary (same observed/direction) into this one."""
+        if other.observed != self.observed or other.lower_is_extreme != self.lower_is_extreme:
+            raise ValueError("Cannot merge summaries of different tests")
+        self.n += other.n
+        self.count_extreme += other.count_extreme
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._s1.merge(other._s1)
+        self._s2.merge(other._s2)
+        self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def mean(self) -> float:
+        return self.observed + self._s1.value / self.n
+
+    @property
+    def variance(self) -> float:
+        """Population variance (divides by n, like TestResult.null_std)."""
+        s1 = self._s1.value
+        return max(0.0, (self._s2.value - s1 * s1 / self.n) / self.n)
+
+    @property
+    def std(self) -> float:
+        return self.variance ** 0.5
+
+    def quantile(self, q: float) -> float:
+        return self.sketch.quantile(q)
+
+    @property
+    def p_value(self) -> float:
+        return (self.count_extreme + 1) / (self.n + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "observed": self.observed,
+            "lower_is_extreme": self.lower_is_extreme,
+            "n": self.n,
+            "count_extreme": self.count_extreme,
+            "min": self.min,
+            "max": self.max,
+            "s1": self._s1.partials,
+            "s2": self._s2.partials,
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NullSummary":
+        summary = cls(data["observed"], data["lower_is_extreme"])
+        summary.n = data["n"]
+        summary.count_extreme = data["count_extreme"]
+        summary.min = data["min"]
+        summary.max = data["max"]
+        summary._s1 = ExactSum(data["s1"])
+        summary._s2 = ExactSum(data["s2"])
+        summary.sketch = QuantileSketch.from_dict(data["sketch"])
+        return summary
@@ -0,0 +1,122 @@
+"""
+WORD MARKOV SURROGATES
+
+Word bigram / trigram models fitted to a corpus, for surrogate nulls:
+"does structure exceed ordinary word-to-word (syntactic) statistics?"
+
+The model stores, for every context seen in the corpus (previous word,
+or previous two words), the distribution of the next word as an alias
+table, so each generated word costs O(1): one uniform picks a slot,
+a second picks the slot's word or its alias.
+
+A context with no successor (it only occurs at the corpus end) backs
+off to the shorter context, and finally to the unigram distribution.
+
+Surrogates are sequences of word ids the length of the corpus,
+starting with its first `order` words.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+MAX_ORDER = 2
+
+
+def alias_tables(
+    offsets: np.ndarray,
+    weights: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vose alias tables for many distributions stored back to back.
+
+    Distribution c occupies slots offsets[c]:offsets[c+1] of weights.
+    Returns (accept, alias): slot k keeps its own outcome if u < accept[k],
+    else takes slot alias[k] (an absolute slot index).
+    """
+    accept = np.ones(len(weights), dtype=np.float64)
+    alias = np.arange(len(weights), dtype=np.int64)
+    for c in range(len(offsets) - 1):
+        lo, hi = int(offsets[c]), int(offsets[c + 1])
+        if hi - lo < 2:
+            continue
+        scaled = (weights[lo:hi] * ((hi - lo) / weights[lo:hi].sum())).tolist()
+        small = [k for k, p in enumerate(scaled) if p < 1.0]
+        large = [k for k, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large[-1]
+            accept[lo + s] = scaled[s]
+            alias[lo + s] = lo + l
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0:
+                small.append(large.pop())
+    return accept, alias
+
+
+class _ContextTable:
+    """Next-word alias tables for one context length."""
+
+    def __init__(self, contexts: np.ndarray, nexts: np.ndarray):
+        # Distinct (context, next) pairs with counts, grouped by context
+        pairs, counts = np.unique(np.stack([contexts, nexts], axis=1), axis=0, return_counts=True)
+        keys, starts = np.unique(pairs[:, 0], return_index=True)
+        self.index: Dict[int, int] = dict(zip(keys.tolist(), range(len(keys))))
+        offsets = np.append(starts, len(pairs)).astype(np.int64)
+        accept, alias = alias_tables(offsets, counts.astype(np.float64))
+        # Python lists: the sampler reads them one element at a time
+        self.offsets: List[int] = offsets.tolist()
+        self.words: List[int] = pairs[:, 1].tolist()
+        self.accept: List[float] = accept.tolist()
+        self.alias: List[int] = alias.tolist()
+
+
+class WordMarkovModel:
+    """
+    Word n-gram model (order 1 = bigram, 2 = trigram) over word ids.
+
+    Contexts are encoded as integers: w for order 1, w1 * vocab_size + w2
+    for order 2.
+    """
+
+    def __init__(self, ids: np.ndarray, order: int):
+        if not 1 <= order <= MAX_ORDER:
+            raise ValueError(f"order must be in 1..{MAX_ORDER}")
+        if len(ids) <= order:
+            raise ValueError("corpus shorter than model order")
+        self.order = order
+        self.vocab_size = int(ids.max()) + 1
+        self.initial = ids[:order].tolist()
+
+        # Tables for every context length up to order (backoff chain)
+        ids = ids.astype(np.int64)
+        self.tables: List[_ContextTable] = []
+        for k in range(1, order + 1):
+            context = np.zeros(len(ids) - k, dtype=np.int64)
+            for j in range(k):
+                context = context * self.vocab_size + ids[j:len(ids) - k + j]
+            self.tables.append(_ContextTable(context, ids[k:]))
+        self.unigram = _ContextTable(np.zeros(len(ids), dtype=np.int64), ids)
+
+    def sample(self, n_words: int, gen: np.random.Generator) -> np.ndarray:
+        """One surrogate of n_words word ids."""
+        out = list(self.initial[:n_words])
+        u = gen.random((max(n_words - len(out), 0), 2)).tolist()
+        v = self.vocab_size
+        tables = self.tables[::-1]  # Longest context first
+        unigram = self.unigram
+
+        for u_slot, u_alias in u:
+            for k, table in zip(range(self.order, 0, -1), tables):
+                context = out[-1] if k == 1 else out[-2] * v + out[-1]
+                c = table.index.get(context)
+                if c is not None:
+                    break
+            else:
+                table, c = unigram, 0
+            lo = table.offsets[c]
+            slot = lo + int(u_slot * (table.offsets[c + 1] - lo))
+            if u_alias >= table.accept[slot]:
+                slot = table.alias[slot]
+            out.append(table.words[slot])
+
+        return np.array(out, dtype=np.int64)
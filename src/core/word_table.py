@@ -0,0 +1,307 @@
+"""
+WORD TABLE
+
+Pre-encoded corpus representation for word- and letter-level nulls.
+
+A word-level null only reorders whole words, so every distinct word
+needs to be encoded ONCE. A null bitstring is then assembled by
+concatenating the per-word bit segments in the permuted order.
+
+Letter-level nulls (block shuffles) work the same way one level down:
+the corpus is tokenised into characters (LetterTable), each distinct
+character is encoded once, and a null is a permutation of character
+positions.
+
+Only valid for separable encodings:
+    f(w1 + ' ' + w2) == f(w1) + f(w2)
+This is CHECKED when the table is built - encodings that look across
+word boundaries (e.g. ord_delta_sign) get no table and fall back to
+re-encoding the permuted text.
+"""
+
+import math
+import random
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.bitseq import BitSeq, Bits, as_str
+
+
+def expand_units(unit_start: np.ndarray, unit_len: np.ndarray) -> np.ndarray:
+    """
+    Positions of consecutive units laid end to end.
+
+    Unit j covers unit_start[j] .. unit_start[j] + unit_len[j] - 1;
+    the result lists every unit's positions in the given unit order.
+    """
+    if len(unit_len) == 0:
+        return np.zeros(0, dtype=np.int64)
+    ends = np.cumsum(unit_len)
+    # Output index j comes from source index j + (src_start - dst_start)
+    shift = np.repeat(unit_start - (ends - unit_len), unit_len)
+    return np.arange(int(ends[-1]), dtype=np.int64) + shift
+
+
+def grouped_permutation(group: np.ndarray, gen: np.random.Generator) -> np.ndarray:
+    """
+    Indices sorted by group, uniformly shuffled within each group.
+
+    Sort key = group id in the high bits, random bits below it.
+    With contiguous ascending groups this is a within-group shuffle.
+    """
+    n = len(group)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    shift = 63 - max(1, int(group.max()).bit_length())
+    keys = (group.astype(np.int64) << shift) | gen.integers(0, 1 << shift, size=n, dtype=np.int64)
+    return np.argsort(keys)
+
+
+def count_distinct_orders(ids: np.ndarray, limit: int) -> Optional[int]:
+    """
+    Number of distinct reorderings of a token sequence, n! / prod(count!).
+
+    None if it exceeds limit (stops early, so long corpora are cheap).
+    """
+    count = 1
+    placed = 0
+    for c in np.unique(ids, return_counts=True)[1].tolist():
+        count *= math.comb(placed + c, c)
+        placed += c
+        if count > limit:
+            return None
+    return count
+
+
+def distinct_orders(ids: np.ndarray, limit: int) -> Optional[np.ndarray]:
+    """
+    Every distinct reordering of a token sequence, as position arrays.
+
+    Orders that only swap equal tokens give the same text, so each is
+    listed once (lexicographic in ids). Returns (n_orders, n) int64,
+    or None if there are more than limit orders.
+    """
+    n_orders = count_distinct_orders(ids, limit)
+    if n_orders is None:
+        return None
+    n = len(ids)
+
+    # Multiset permutations by next-permutation on the sorted sequence
+    seq = sorted(ids.tolist())
+    rows = np.empty((n_orders, n), dtype=np.int64)
+    for r in range(n_orders):
+        rows[r] = seq
+        i = n - 2
+        while i >= 0 and seq[i] >= seq[i + 1]:
+            i -= 1
+        if i < 0:
+            break
+        j = n - 1
+        while seq[j] <= seq[i]:
+            j -= 1
+        seq[i], seq[j] = seq[j], seq[i]
+        seq[i + 1:] = reversed(seq[i + 1:])
+
+    # k-th occurrence of a token in a row -> its k-th position in the corpus
+    positions = np.empty_like(rows)
+    source = np.broadcast_to(np.argsort(ids, kind='stable'), rows.shape)
+    np.put_along_axis(positions, np.argsort(rows, axis=1, kind='stable'), source, axis=1)
+    return positions
+
+
+class WordTable:
+    """
+    Corpus tokenised into words.
+
+    positions: 0..n_words-1 in corpus order
+    ids[position] -> index into vocab
+    first_position[id] -> a position holding that word
+
+    Optional boundary levels (e.g. "verse", "surah") give the word
+    offset where each segment starts; hierarchical nulls permute within
+    or across these segments.
+    """
+
+    def __init__(self, text: str, boundaries: Optional[Mapping[str, Sequence[int]]] = None):
+        tokens = text.split()
+        index: Dict[str, int] = {}
+        ids = []
+        for token in tokens:
+            ids.append(index.setdefault(token, len(index)))
+
+        self.vocab: List[str] = list(index)
+        self.ids = np.array(ids, dtype=np.int64)
+        # First corpus position of each vocab entry (ids are first-seen order)
+        self.first_position = np.unique(self.ids, return_index=True)[1].astype(np.int64)
+
+        self.levels: Dict[str, np.ndarray] = {
+            level: np.asarray(offsets, dtype=np.int64)
+            for level, offsets in (boundaries or {}).items()
+        }
+        self._segment_ids: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def spans(self, level: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(start, length) in words of every segment at a boundary level."""
+        if level not in self.levels:
+            raise ValueError(f"Corpus has no '{level}' boundaries")
+        starts = self.levels[level]
+        lens = np.diff(np.append(starts, len(self)))
+        return starts, lens
+
+    def segment_ids(self, level: str) -> np.ndarray:
+        """Segment index of every word position (computed once)."""
+        if level not in self._segment_ids:
+            _, lens = self.spans(level)
+            self._segment_ids[level] = np.repeat(np.arange(len(lens)), lens)
+        return self._segment_ids[level]
+
+    def text_for(self, positions: np.ndarray) -> str:
+        """Rebuild text from word positions (legacy re-encode path)."""
+        vocab = self.vocab
+        return ' '.join(vocab[i] for i in self.ids[positions].tolist())
+
+
+def block_layout(
+    word_start: np.ndarray,
+    word_len: np.ndarray,
+    block_size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split every word longer than block_size into blocks (ragged tail).
+
+    Returns (block_word, block_start, block_len, letters):
+    blocks in corpus order, the word each belongs to, and the
+    character positions of all such words in corpus order.
+    """
+    long_words = np.flatnonzero(word_len > block_size)
+    lens = word_len[long_words]
+    starts = word_start[long_words]
+    n_blocks = (lens + block_size - 1) // block_size
+
+    block_word = np.repeat(np.arange(len(long_words)), n_blocks)
+    first_block = np.cumsum(n_blocks) - n_blocks
+    j = np.arange(len(block_word)) - np.repeat(first_block, n_blocks)
+    block_start = starts[block_word] + j * block_size
+    block_len = np.minimum(block_size, lens[block_word] - j * block_size)
+
+    letter_offset = np.arange(int(lens.sum())) - np.repeat(np.cumsum(lens) - lens, lens)
+    letters = np.repeat(starts, lens) + letter_offset
+
+    return block_word, block_start, block_len, letters
+
+
+class LetterTable:
+    """
+    Corpus tokenised into characters (words joined by single spaces).
+
+    positions: 0..n_chars-1 in corpus order
+    codes[position] -> Unicode code point
+    ids[position] -> index into vocab (distinct characters)
+    Words are the runs between spaces: word_start / word_len,
+    word_groups (see __init__).
+    """
+
+    def __init__(self, text: str):
+        normalized = ' '.join(text.split())
+        self.codes = np.frombuffer(normalized.encode('utf-32-le'), dtype=np.uint32)
+        vocab_codes, ids = np.unique(self.codes, return_inverse=True)
+        self.vocab: List[str] = [chr(c) for c in vocab_codes.tolist()]
+        self.ids = ids.astype(np.int64).reshape(-1)
+
+        # Word boundaries from the space positions
+        spaces = np.flatnonzero(self.codes == ord(' '))
+        self.word_start = np.concatenate(([0], spaces + 1)).astype(np.int64)
+        word_end = np.concatenate((spaces, [len(self.codes)])).astype(np.int64)
+        self.word_len = word_end - self.word_start
+        if len(self.codes) == 0:
+            self.word_start = self.word_len = np.zeros(0, dtype=np.int64)
+        self.max_word_len = int(self.word_len.max()) if len(self.word_len) else 0
+
+        # Non-decreasing group per position: letters of word w -> 2w, the
+        # space after it -> 2w+1 (a singleton). grouped_permutation over
+        # it shuffles letters within every word at once.
+        is_space = (self.codes == ord(' ')).astype(np.int64)
+        self.word_groups = 2 * np.cumsum(is_space) - is_space
+
+        self._blocks: Dict[int, Tuple[np.ndarray, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def text_for(self, positions: np.ndarray) -> str:
+        """Rebuild text from character positions."""
+        return self.codes[positions].tobytes().decode('utf-32-le')
+
+    def blocks(self, block_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """block_layout of the corpus words (computed once per size)."""
+        if block_size not in self._blocks:
+            self._blocks[block_size] = block_layout(self.word_start, self.word_len, block_size)
+        return self._blocks[block_size]
+
+
+TokenTable = Union[WordTable, LetterTable]
+
+
+class SegmentTable:
+    """
+    Per-token bit segments for one encoding over a Word/LetterTable.
+
+    Bits are stored as ASCII '0'/'1' codes so a gather + decode yields
+    exactly the legacy bitstring.
+    """
+
+    def __init__(self, words: TokenTable, encode_fn: Callable[[str], Bits]):
+        segments = [as_str(encode_fn(w)) for w in words.vocab]
+        lengths = np.array([len(s) for s in segments], dtype=np.int64)
+        starts = np.zeros(len(segments), dtype=np.int64)
+        if len(segments) > 1:
+            np.cumsum(lengths[:-1], out=starts[1:])
+
+        self.bits = np.frombuffer(''.join(segments).encode('ascii'), dtype=np.uint8)
+        # Per-position lookups (corpus order)
+        self.word_len = lengths[words.ids]
+        self.word_start = starts[words.ids]
+
+    def _gather(self, positions: np.ndarray) -> np.ndarray:
+        """ASCII bit codes of the token segments in position order."""
+        return self.bits[expand_units(self.word_start[positions], self.word_len[positions])]
+
+    def bits_for(self, positions: np.ndarray) -> str:
+        """Concatenate token segments in the given position order."""
+        return self._gather(positions).tobytes().decode('ascii')
+
+    def bitseq_for(self, positions: np.ndarray) -> BitSeq:
+        """Same as bits_for, packed."""
+        return BitSeq.from_bits(self._gather(positions) - ord('0'))
+
+
+def build_segment_table(
+    words: TokenTable,
+    encode_fn: Callable[[str], Bits],
+    reference_bits: Bits,
+    check_seed: int = 0
+) -> Optional[SegmentTable]:
+    """
+    Build a SegmentTable, or None if the encoding is not separable.
+
+    Checks:
+    1. Corpus order reproduces reference_bits (the observed encoding)
+    2. One shuffled order reproduces f(shuffled text)
+    """
+    table = SegmentTable(words, encode_fn)
+
+    identity = np.arange(len(words))
+    if table.bits_for(identity) != as_str(reference_bits):
+        return None
+
+    order = list(range(len(words)))
+    random.Random(check_seed).shuffle(order)
+    shuffled = np.array(order, dtype=np.int64)
+    if table.bits_for(shuffled) != as_str(encode_fn(words.text_for(shuffled))):
+        return None
+
+    return table
@@ -0,0 +1,52 @@
+"""Shared fixtures: a small registered corpus and a temporary result cache."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from core import api  # noqa: E402
+from core.bitseq import as_bitseq  # noqa: E402
+from encoding_functions.f_ordinal import (  # noqa: E402
+    encode_ordinal_5bit_abjad, encode_ordinal_delta_sign
+)
+
+N_SURAHS = 12  # Last surahs of the Quran: a few thousand bits, fast to test
+
+
+def encode_ordinal_5bit_abjad_packed(text: str):
+    return as_bitseq(encode_ordinal_5bit_abjad(text))
+
+
+@pytest.fixture(scope="session")
+def corpus() -> str:
+    """Name of a registered corpus with verse and surah boundaries."""
+    from core.binary_analysis import load_quran
+
+    quran = load_quran(str(ROOT / "data/quran/quran.json"))
+    texts, verse_offsets, surah_offsets = [], [], []
+    n_words = 0
+    for surah in quran[-N_SURAHS:]:
+        surah_offsets.append(n_words)
+        for verse in surah["verses"]:
+            verse_offsets.append(n_words)
+            n_words += len(verse["text"].split())
+            texts.append(verse["text"])
+    api.register_corpus(
+        "test_tail", " ".join(texts), "data/quran/quran.json",
+        boundaries={"verse": verse_offsets, "surah": surah_offsets}
+    )
+    api.register_encoding("test_o5", encode_ordinal_5bit_abjad, "5-bit abjad", "test")
+    api.register_encoding("test_o5_packed", encode_ordinal_5bit_abjad_packed, "5-bit abjad, BitSeq", "test")
+    api.register_encoding("test_delta", encode_ordinal_delta_sign, "Delta sign (not separable)", "test")
+    return "test_tail"
+
+
+@pytest.fixture
+def result_cache(tmp_path):
+    cache = api.enable_result_cache(str(tmp_path / "cache"))
+    yield cache
+    api.disable_result_cache()
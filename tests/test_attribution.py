@@ -0,0 +1,30 @@
+"""Attribution maps add up to the whole-sequence KT code length."""
+
+import pytest
+
+from core import api
+from core.api import CORPORA, ENCODINGS, run_attribution, run_test
+from core.code_length import kt_code_length
+
+
+@pytest.mark.parametrize("level", ["word", "verse", "surah"])
+@pytest.mark.parametrize("encoding", ["test_o5", "test_o5_packed"])
+def test_observed_costs_sum_to_kt_code_length(corpus, level, encoding):
+    bits = ENCODINGS[encoding].fn(CORPORA[corpus].text)
+    result = run_attribution(api.AttributionSpec(corpus, encoding, level=level, order=8, n_perm=20))
+    assert result.observed.sum() == pytest.approx(kt_code_length(bits, 8), rel=1e-12)
+    assert result.n_bits.sum() == len(bits)
+    assert ((result.p_values > 0) & (result.p_values <= 1)).all()
+
+
+def test_null_costs_match_run_test_draws(corpus):
+    # Same seed: the attribution's null draws are run_test's, so the totals agree
+    bits = ENCODINGS["test_o5"].fn(CORPORA[corpus].text)
+    result = run_attribution(api.AttributionSpec(corpus, "test_o5", level="verse", order=8, n_perm=100))
+    single = run_test(api.TestSpec(corpus, "test_o5", "word_perm", "kt_8", n_perm=100), use_cache=False)
+    assert result.null_mean.sum() == pytest.approx(single.null_mean * len(bits), rel=1e-9)
+
+
+def test_non_separable_encoding_is_rejected(corpus):
+    with pytest.raises(ValueError, match="not word-separable"):
+        run_attribution(api.AttributionSpec(corpus, "test_delta", n_perm=5))
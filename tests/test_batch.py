@@ -0,0 +1,37 @@
+"""run_batch_test results equal run_test on each TestSpec (and the cache)."""
+
+import pytest
+
+from core import api
+from core.api import run_batch_test, run_test
+
+ENCODINGS = ["test_o5", "test_delta"]
+
+
+@pytest.mark.parametrize("null", ["word_perm", "random", "markov_2"])
+def test_batch_matches_run_test(corpus, null):
+    batch = run_batch_test(corpus, ENCODINGS, null, ["zlib"], n_perm=100, use_cache=False)
+    for e in ENCODINGS:
+        single = run_test(api.TestSpec(corpus, e, null, "zlib", n_perm=100), use_cache=False)
+        assert batch.results[e]["zlib"].null_distribution == single.null_distribution
+
+
+def test_batch_independent_of_other_encodings(corpus):
+    alone = run_batch_test(corpus, ["test_o5"], "markov_2", ["zlib"], n_perm=100, use_cache=False)
+    paired = run_batch_test(corpus, ENCODINGS, "markov_2", ["zlib"], n_perm=100, use_cache=False)
+    assert alone.results["test_o5"]["zlib"].null_distribution == \
+        paired.results["test_o5"]["zlib"].null_distribution
+
+
+def test_batch_cache_agrees_with_run_test(corpus, result_cache):
+    batch = run_batch_test(corpus, ENCODINGS, "random", ["zlib"], n_perm=100, seed=3)
+    for e in ENCODINGS:
+        spec = api.TestSpec(corpus, e, "random", "zlib", n_perm=100, seed=3)
+        cached = run_test(spec)
+        assert cached.null_distribution == batch.results[e]["zlib"].null_distribution
+        assert cached.null_distribution == run_test(spec, use_cache=False).null_distribution
+
+
+def test_multi_metric_default_is_the_compressors(corpus):
+    result = api.run_multi_metric_test(corpus, "test_o5", n_perm=100, use_cache=False)
+    assert sorted(result.results) == ["bz2", "lzma", "zlib"]
@@ -0,0 +1,68 @@
+"""BitSeq against the legacy '0'/'1' string form."""
+
+import numpy as np
+import pytest
+
+from core.bitseq import BitSeq, as_bitseq, as_str, ascii_bytes, symbol_bytes
+
+S = "".join(np.random.default_rng(6).choice(["0", "1"], 203))
+
+
+def test_hash_and_eq_agree_with_str():
+    seq = BitSeq.from_str(S)
+    assert seq == S and hash(seq) == hash(S)
+    assert len({seq, S, BitSeq.from_str(S)[:], seq[0:len(S)]}) == 1
+    assert {S: 1}[seq] == 1
+    assert seq[3:50] == S[3:50] and hash(seq[3:50]) == hash(S[3:50])
+    assert seq != S[:-1] and seq != BitSeq.from_str(S[:-1])
+
+
+@pytest.mark.parametrize("key", [slice(None), slice(5, 77), slice(3, 11), slice(-40, None), slice(9, 9),
+                                 slice(None, None, 3), slice(100, 7, -2), slice(250, 300)])
+def test_slicing(key):
+    seq = BitSeq.from_str(S)
+    view = seq[key]
+    assert as_str(view) == S[key]
+    assert len(view) == len(S[key])
+    if key.step is None:
+        assert np.shares_memory(view._data, seq._data)  # Zero-copy view
+
+
+def test_offset_views():
+    seq = BitSeq.from_str(S)
+    for start in range(0, 17):
+        for stop in (start, start + 1, start + 8, start + 13, len(S)):
+            view = seq[start:stop]
+            sub = S[start:stop]
+            assert view.to_str() == sub
+            assert view.to_array().tolist() == [int(b) for b in sub]
+            assert view.count("1") == sub.count("1") and view.count("0") == sub.count("0")
+            assert [view[i] for i in range(-len(sub), len(sub))] == [int(b) for b in sub * 2]
+            assert view.packed() == np.packbits(np.array([int(b) for b in sub], dtype=np.uint8)).tobytes()
+            assert BitSeq.from_packed(view.packed(), len(view)) == sub
+            # A view of a view
+            assert view[1:5] == sub[1:5]
+    with pytest.raises(IndexError):
+        seq[len(S)]
+
+
+def test_construction_and_concat():
+    assert BitSeq.from_bits(np.array([True, False, True])) == "101"
+    with pytest.raises(ValueError):
+        BitSeq.from_str("0120")
+    parts = [S[:5], S[5:64], S[64:]]
+    assert BitSeq.concat([as_bitseq(p) for p in parts]) == S
+    assert as_bitseq(S[:9]) + as_bitseq(S[9:]) == S
+    assert len(BitSeq.concat([])) == 0
+    assert ascii_bytes(as_bitseq(S)[7:90]) == S[7:90].encode()
+
+
+@pytest.mark.parametrize("width", range(1, 9))
+@pytest.mark.parametrize("n", [0, 1, 7, 8, 13, 40, 203])
+def test_symbol_bytes(width, n):
+    padded = S[:n] + "0" * (-n % width)
+    naive = bytes(int(padded[i:i + width], 2) for i in range(0, len(padded), width))
+    assert symbol_bytes(S[:n], width) == naive
+    assert symbol_bytes(as_bitseq(S)[:n], width) == naive
+    offset = as_bitseq("101" + S)[3:3 + n]  # Unaligned view
+    assert symbol_bytes(offset, width) == naive
@@ -0,0 +1,78 @@
+"""KT and CTW code lengths against sequential / dense-tree implementations."""
+
+import math
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from core.code_length import ctw_code_length, kt_bit_costs, kt_code_length
+
+
+def naive_kt_costs(s: str, order: int) -> list:
+    """Bit-by-bit adaptive KT coder: -log2 P(bit | counts of its context so far)."""
+    counts = defaultdict(lambda: [0, 0])
+    costs = []
+    for i, b in enumerate(s):
+        if i < order:
+            costs.append(1.0)
+            continue
+        c = counts[s[i - order:i]]
+        bit = int(b)
+        costs.append(-math.log2((c[bit] + 0.5) / (c[0] + c[1] + 1)))
+        c[bit] += 1
+    return costs
+
+
+def _log2_kt(zeros: int, ones: int) -> float:
+    """log2 of the KT probability of a sequence with these counts, coded sequentially."""
+    total, a, b = 0.0, 0, 0
+    for bit in [0] * zeros + [1] * ones:
+        total += math.log2(((b if bit else a) + 0.5) / (a + b + 1))
+        a, b = a + (not bit), b + bit
+    return total
+
+
+def naive_ctw(s: str, depth: int) -> float:
+    """Dense context tree: every node up to `depth`, weighted recursively."""
+    counts = defaultdict(lambda: [0, 0])
+    for i in range(depth, len(s)):
+        context = s[i - depth:i][::-1]  # Most recent bit first
+        for d in range(depth + 1):
+            counts[context[:d]][int(s[i])] += 1
+
+    def log2_pw(node: str) -> float:
+        pe = _log2_kt(*counts[node])
+        if len(node) == depth:
+            return pe
+        children = log2_pw(node + "0") + log2_pw(node + "1")
+        return -1 + max(pe, children) + math.log2(1 + 2 ** (min(pe, children) - max(pe, children)))
+
+    return depth - log2_pw("")
+
+
+def _sequences():
+    rng = np.random.default_rng(2)
+    yield "".join(rng.choice(["0", "1"], 400))
+    yield "".join(rng.choice(["0", "1"], 400, p=[0.8, 0.2]))
+    yield ("0010111" * 60)[:419]
+    yield "1" * 50
+
+
+@pytest.mark.parametrize("order", [0, 1, 3, 8])
+def test_kt(order):
+    for s in _sequences():
+        naive = naive_kt_costs(s, order)
+        assert kt_bit_costs(s, order) == pytest.approx(naive, abs=1e-9)
+        assert kt_code_length(s, order) == pytest.approx(sum(naive), abs=1e-8)
+
+
+@pytest.mark.parametrize("depth", [1, 2, 4, 7])
+def test_ctw(depth):
+    for s in _sequences():
+        assert ctw_code_length(s, depth) == pytest.approx(naive_ctw(s, depth), abs=1e-8)
+
+
+def test_short_sequences_cost_one_bit_per_bit():
+    assert kt_code_length("101", 4) == 3.0
+    assert ctw_code_length("101", 4) == 3.0
@@ -0,0 +1,84 @@
+"""LZ76 and block entropy against naive implementations."""
+
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from core.complexity import STAGE_BITS, block_entropy, lz76_phrases, match_lengths
+
+
+def naive_match_lengths(s: str) -> list:
+    """L[i] = longest l with s[i:i+l] starting at some j < i (overlap allowed)."""
+    n = len(s)
+    lengths = []
+    for i in range(n):
+        best = 0
+        for j in range(i):
+            l = 0
+            while i + l < n and s[j + l] == s[i + l]:
+                l += 1
+            best = max(best, l)
+        lengths.append(best)
+    return lengths
+
+
+def kaspar_schuster(s: str) -> int:
+    """LZ76 complexity, Kaspar & Schuster (1987) algorithm."""
+    n = len(s)
+    if n < 2:
+        return n
+    c, l, i, k, k_max = 1, 1, 0, 1, 1
+    while True:
+        if s[i + k - 1] == s[l + k - 1]:
+            k += 1
+            if l + k > n:
+                c += 1
+                break
+        else:
+            k_max = max(k, k_max)
+            i += 1
+            if i == l:
+                c += 1
+                l += k_max
+                if l + 1 > n:
+                    break
+                i, k, k_max = 0, 1, 1
+            else:
+                k = 1
+    return c
+
+
+def _sequences():
+    rng = np.random.default_rng(1)
+    period = "".join(rng.choice(["0", "1"], 37))
+    yield "".join(rng.choice(["0", "1"], 300))  # Short matches
+    yield "".join(rng.choice(["0", "1"], 300, p=[0.9, 0.1]))  # Long runs
+    yield (period * 10)[:333]  # Matches spanning several stages
+    noisy = list(period * 12)
+    for i in rng.choice(len(noisy), 5, replace=False):
+        noisy[i] = "1" if noisy[i] == "0" else "0"
+    yield "".join(noisy)
+    yield "0" * (2 * STAGE_BITS + 3)
+    yield "01" * 40 + "1"
+
+
+@pytest.mark.parametrize("s", list(_sequences()))
+def test_match_lengths(s):
+    arr = np.array([int(b) for b in s], dtype=np.int64)
+    assert match_lengths(arr).tolist() == naive_match_lengths(s)
+
+
+@pytest.mark.parametrize("s", list(_sequences()) + ["0", "01", "0001", "1011"])
+def test_lz76_phrases(s):
+    assert lz76_phrases(s) == kaspar_schuster(s)
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 5, 8, 16, 20])
+def test_block_entropy(k):
+    for s in _sequences():
+        counts = Counter(s[i:i + k] for i in range(len(s) - k + 1))
+        total = sum(counts.values())
+        naive = -sum(c / total * math.log2(c / total) for c in counts.values())
+        assert block_entropy(s, k) == pytest.approx(naive, abs=1e-12)
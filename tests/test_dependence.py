@@ -0,0 +1,44 @@
+"""Lagged MI / ACF from one FFT against per-lag direct counts."""
+
+import math
+
+import numpy as np
+import pytest
+
+from core.binary_analysis import autocorrelation
+from core.dependence import autocorrelation_function, lagged_mutual_information
+
+
+def naive_mi(s: str, lag: int) -> float:
+    pairs = [(s[i], s[i + lag]) for i in range(len(s) - lag)]
+    n = len(pairs)
+    joint = {p: pairs.count(p) / n for p in set(pairs)}
+    first = {a: sum(v for (x, _), v in joint.items() if x == a) for a in "01"}
+    second = {b: sum(v for (_, y), v in joint.items() if y == b) for b in "01"}
+    return sum(v * math.log2(v / (first[a] * second[b])) for (a, b), v in joint.items())
+
+
+def _sequences():
+    rng = np.random.default_rng(3)
+    yield "".join(rng.choice(["0", "1"], 700))
+    yield "".join(rng.choice(["0", "1"], 700, p=[0.9, 0.1]))
+    yield ("00101101110" * 70)[:757]
+
+
+@pytest.mark.parametrize("max_lag", [1, 16, 64])
+def test_lagged_mutual_information(max_lag):
+    for s in _sequences():
+        naive = [naive_mi(s, k) for k in range(1, max_lag + 1)]
+        assert lagged_mutual_information(s, max_lag) == pytest.approx(naive, abs=1e-9)
+
+
+@pytest.mark.parametrize("max_lag", [1, 16, 64])
+def test_autocorrelation_function(max_lag):
+    for s in _sequences():
+        naive = [autocorrelation(s, k) for k in range(1, max_lag + 1)]
+        assert autocorrelation_function(s, max_lag) == pytest.approx(naive, abs=1e-9)
+
+
+def test_lags_capped_by_length_and_constant_input():
+    assert len(lagged_mutual_information("0110", 10)) == 3
+    assert autocorrelation_function("1111", 3).tolist() == [0.0, 0.0, 0.0]
@@ -0,0 +1,39 @@
+"""Editing an engine helper module invalidates every cache key."""
+
+import shutil
+
+import pytest
+
+from core import api, cache
+from core.api import run_test
+from core.null_cache import NullDistributionCache
+
+
+@pytest.fixture
+def engine_copy(tmp_path, monkeypatch):
+    """Fingerprint a copy of core/*.py that the test can edit."""
+    copy = tmp_path / "core"
+    copy.mkdir()
+    for path in cache.ENGINE_DIR.glob("*.py"):
+        shutil.copy(path, copy / path.name)
+    monkeypatch.setattr(cache, "ENGINE_DIR", copy)
+    return copy
+
+
+@pytest.mark.parametrize("helper", ["word_table.py", "bitseq.py", "markov.py", "statistics.py"])
+def test_helper_edit_invalidates_cached_results(corpus, result_cache, engine_copy, helper):
+    spec = api.TestSpec(corpus, "test_o5", "word_perm", "zlib", n_perm=100)
+    run_test(spec)
+    assert api._cached_result(spec) is not None
+    job, code = api.job_key(spec), api.code_fingerprint(spec)
+    null_key = NullDistributionCache.make_key("zlib", api.METRICS["zlib"].fn, "random",
+                                              api.NULLS["random"].fn, 100, 50, 42, "stream")
+
+    with open(engine_copy / helper, "a") as f:
+        f.write("\n# edited\n")
+
+    assert api._cached_result(spec) is None
+    assert api.code_fingerprint(spec) != code
+    assert api.job_key(spec) == job  # Job identity survives code edits
+    assert null_key != NullDistributionCache.make_key("zlib", api.METRICS["zlib"].fn, "random",
+                                                      api.NULLS["random"].fn, 100, 50, 42, "stream")
@@ -0,0 +1,78 @@
+"""Exact mode against brute-force enumeration of word orders."""
+
+from dataclasses import asdict, replace
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from core import api
+from core.api import CORPORA, ENCODINGS, METRICS, run_test
+from core.word_table import count_distinct_orders, distinct_orders
+
+
+@pytest.fixture(scope="module")
+def short_corpus(corpus):
+    w = CORPORA[corpus].text.split()
+    words = [w[0], w[1], w[0], w[2], w[1], w[3], w[0]]  # 7! / (3! 2!) = 420 orders
+    api.register_corpus("test_exact", " ".join(words), "test")
+    return words
+
+
+@pytest.mark.parametrize("ids", [[0, 1, 0, 2, 1, 3, 0], [0, 0, 0, 1], [2, 1, 0], [5]])
+def test_distinct_orders(ids):
+    ids = np.array(ids)
+    brute = set(permutations(ids.tolist()))
+    orders = distinct_orders(ids, 10_000)
+    assert count_distinct_orders(ids, 10_000) == len(brute) == len(orders)
+    assert {tuple(ids[row].tolist()) for row in orders} == brute
+    assert all(sorted(row) == list(range(len(ids))) for row in orders.tolist())
+    if len(brute) > 1:
+        assert distinct_orders(ids, len(brute) - 1) is None
+
+
+@pytest.mark.parametrize("metric", ["zlib", "ctw"])
+def test_exact_test_matches_brute_force(short_corpus, metric):
+    meta, encode = METRICS[metric], ENCODINGS["test_o5"].fn
+    brute = [meta.fn(encode(" ".join(order))) for order in set(permutations(short_corpus))]
+    observed = meta.fn(encode(" ".join(short_corpus)))
+
+    spec = api.TestSpec("test_exact", "test_o5", "word_perm", metric, exact=True)
+    result = run_test(spec, use_cache=False)
+    assert result.exact and result.n_perm_used == len(brute) == 420
+    assert sorted(result.null_distribution) == pytest.approx(sorted(brute), abs=1e-12)
+    assert result.p_value == sum(x <= observed for x in brute) / len(brute)
+
+
+def test_exact_result_survives_the_cache(short_corpus, result_cache):
+    spec = api.TestSpec("test_exact", "test_o5", "word_perm", "zlib", exact=True)
+    fresh = run_test(spec)
+    cached = run_test(spec)
+    assert cached.exact and cached.null_distribution == fresh.null_distribution
+    assert cached.p_value == fresh.p_value
+
+
+def test_exact_max_orders_is_per_spec(short_corpus):
+    spec = api.TestSpec("test_exact", "test_o5", "word_perm", "zlib", n_perm=100,
+                        exact=True, exact_max_orders=419)
+    assert not run_test(spec, use_cache=False).exact  # 420 orders: Monte Carlo
+    wide = api.TestSpec("test_exact", "test_o5", "word_perm", "zlib", n_perm=100,
+                        exact=True, exact_max_orders=420)
+    result = run_test(wide, use_cache=False)
+    assert result.exact and result.n_perm_used == 420
+    assert api.TestSpec("test_exact", "test_o5", "word_perm", "zlib",
+                        exact=True, exact_max_orders=0).validate()
+
+
+def test_exact_max_orders_is_in_the_cache_key(short_corpus, result_cache):
+    narrow = api.TestSpec("test_exact", "test_o5", "word_perm", "zlib", n_perm=100,
+                          exact=True, exact_max_orders=419)
+    wide = api.TestSpec("test_exact", "test_o5", "word_perm", "zlib", n_perm=100,
+                        exact=True, exact_max_orders=420)
+    assert api._cache_key(narrow) != api._cache_key(wide)
+    assert not run_test(narrow).exact
+    assert run_test(wide).exact  # Not served the narrow Monte Carlo result
+    assert run_test(api.TestSpec(**asdict(wide))).exact
+
+    plain = api.TestSpec("test_exact", "test_o5", "word_perm", "zlib", n_perm=100)
+    assert api._cache_key(plain) == api._cache_key(replace(plain, exact_max_orders=7))
@@ -0,0 +1,58 @@
+"""Family test: per-null draws as in run_test, max-T within nulls, Holm across."""
+
+import numpy as np
+import pytest
+
+from core import api
+from core.api import run_family_test, run_test
+from core.statistics import holm_across_families, westfall_young_maxT
+
+
+def naive_maxT(observed: list, null: list) -> list:
+    """Westfall & Young step-down max-T, one test at a time."""
+    order = sorted(range(len(observed)), key=lambda j: -observed[j])
+    adjusted, running = [0.0] * len(observed), 0.0
+    for r, j in enumerate(order):
+        rest = order[r:]  # This test and every less extreme one
+        count = sum(max(row[i] for i in rest) >= observed[j] for row in null)
+        running = max(running, (count + 1) / (len(null) + 1))
+        adjusted[j] = running
+    return adjusted
+
+
+@pytest.mark.parametrize("n_tests", [1, 3, 8])
+def test_westfall_young_maxT(n_tests):
+    rng = np.random.default_rng(n_tests)
+    shared = rng.normal(size=(200, 1))
+    null = (shared + rng.normal(size=(200, n_tests))).tolist()  # Correlated tests
+    observed = (rng.normal(size=n_tests) * 2).tolist()
+    assert westfall_young_maxT(observed, null) == pytest.approx(naive_maxT(observed, null))
+
+
+@pytest.mark.parametrize("nulls", [["word_perm", "random"], ["random", "markov_2"]])
+def test_each_null_draws_as_run_test(corpus, nulls):
+    encodings = ["test_o5", "test_delta"]
+    family = run_family_test(corpus, encodings, nulls=nulls, metrics=["zlib"], n_perm=100)
+    for n in nulls:
+        for e in encodings:
+            single = run_test(api.TestSpec(corpus, e, n, "zlib", n_perm=100), use_cache=False)
+            assert family.results[n][e]["zlib"].null_distribution == single.null_distribution
+            assert family.results[n][e]["zlib"].p_value == single.p_value
+
+
+def test_single_null_family_unchanged_by_other_nulls(corpus):
+    alone = run_family_test(corpus, ["test_o5", "test_delta"], metrics=["zlib"], n_perm=100)
+    joint = run_family_test(corpus, ["test_o5", "test_delta"], nulls=["word_perm", "random"],
+                            metrics=["zlib"], n_perm=100)
+    for e in alone.encodings:
+        assert (joint.results["word_perm"][e]["zlib"].null_distribution
+                == alone.results["word_perm"][e]["zlib"].null_distribution)
+        assert joint.adjusted_p["word_perm"][e]["zlib"] >= alone.adjusted_p["word_perm"][e]["zlib"]
+
+
+def test_holm_across_families():
+    assert holm_across_families([[0.01, 0.2]]) == [[0.01, 0.2]]
+    # Smallest family scaled by 2, the next by 1 but not below the first
+    assert holm_across_families([[0.04, 0.3], [0.01]]) == [[0.04, 0.3], [0.02]]
+    assert holm_across_families([[0.015], [0.01]]) == [[0.02], [0.02]]
+    assert holm_across_families([[0.6], [0.7]]) == [[1.0], [1.0]]
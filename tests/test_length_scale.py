@@ -0,0 +1,31 @@
+"""Length-scale curve: every point equals run_test on its block_k spec."""
+
+import pytest
+
+from core import api
+from core.api import CORPORA, get_letter_table, length_scale_test_specs, run_length_scale_test, run_test
+
+
+@pytest.mark.parametrize("encoding", ["test_o5", "test_delta"])
+@pytest.mark.parametrize("seed_mode, workers", [("stream", 1), ("spawn", 3)])
+def test_curve_points_equal_run_test(corpus, result_cache, encoding, seed_mode, workers):
+    longest = get_letter_table(CORPORA[corpus]).max_word_len
+    spec = api.LengthScaleSpec(corpus, encoding, "zlib", block_sizes=(1, 3, 8, longest, 4 * longest),
+                               n_perm=100, seed_mode=seed_mode)
+    curve = run_length_scale_test(spec, workers=workers).curve
+
+    for (block_size, effect, p), test_spec in zip(curve, length_scale_test_specs(spec)):
+        single = run_test(test_spec, use_cache=False)
+        assert (effect, p) == (single.effect_bits_per_char, single.p_value), block_size
+        # The stored result (identity shortcut included) is the full sampled run
+        stored = api._cached_result(test_spec)
+        assert stored.null_distribution == single.null_distribution, block_size
+
+
+def test_identity_shortcut_is_exact(corpus):
+    longest = get_letter_table(CORPORA[corpus]).max_word_len
+    spec = api.LengthScaleSpec(corpus, "test_o5", "zlib", block_sizes=(longest,), n_perm=100)
+    single = run_test(length_scale_test_specs(spec)[0], use_cache=False)
+    assert set(single.null_distribution) == {single.observed}
+    assert single.p_value == 1.0
+    assert run_length_scale_test(spec, use_cache=False).curve == [(longest, single.effect_bits_per_char, 1.0)]
@@ -0,0 +1,61 @@
+"""Markov surrogates: chunked generation against a bit-by-bit chain."""
+
+import numpy as np
+import pytest
+
+from core import markov
+from core.markov import CHUNK_LEN, MarkovModel
+
+
+def _model(order: int = 3, n_bits: int = 5000) -> MarkovModel:
+    bits = (np.random.default_rng(0).random(n_bits) < 0.3).astype(np.uint8)
+    bits[1::7] = 1 - bits[::7][:len(bits[1::7])]  # Some order-k structure
+    return MarkovModel.fit("".join(map(str, bits)), order)
+
+
+def naive_sample(model: MarkovModel, n_bits: int, gen: np.random.Generator) -> list:
+    """Bit-by-bit chain; step s uses uniform [s % CHUNK_LEN, s // CHUNK_LEN]."""
+    n_steps = n_bits - model.order
+    u = gen.random((CHUNK_LEN, -(-n_steps // CHUNK_LEN)))
+    out = model.initial.tolist()
+    state = int("".join(map(str, out)), 2)
+    for step in range(n_steps):
+        bit = int(u[step % CHUNK_LEN, step // CHUNK_LEN] < model.p_one[state])
+        out.append(bit)
+        state = ((state << 1) | bit) & ((1 << model.order) - 1)
+    return out
+
+
+@pytest.mark.parametrize("order", [1, 3, 8])
+def test_chunked_sample_matches_bit_by_bit_chain(order):
+    model = _model(order)
+    for n_bits in (order + 1, 100, 2 * CHUNK_LEN + order, 5000):
+        batch = model.sample(n_bits, [np.random.default_rng(s) for s in range(3)])
+        for s in range(3):
+            assert batch[s].tolist() == naive_sample(model, n_bits, np.random.default_rng(s))
+
+
+def test_non_coalescing_chain():
+    # Deterministic cycle: trajectories from different starts never meet
+    model = MarkovModel.fit("0011" * 500, 2)
+    assert model.sample(5000, [np.random.default_rng(0)])[0].tolist() == ([0, 0, 1, 1] * 1250)
+    model.p_one = np.array([0.02, 0.99, 0.01, 0.97])  # Nearly deterministic
+    for s in range(2):
+        assert (model.sample(5000, [np.random.default_rng(s)])[0].tolist()
+                == naive_sample(model, 5000, np.random.default_rng(s)))
+
+
+def test_transition_frequencies_match_the_model():
+    model = _model(2, 20000)
+    arr = model.sample(200000, [np.random.default_rng(5)])[0].astype(np.int64)
+    refit = MarkovModel.fit("".join(map(str, arr.tolist())), 2)
+    assert refit.p_one == pytest.approx(model.p_one, abs=0.01)
+
+
+def test_batch_cap_does_not_change_surrogates(monkeypatch):
+    model = _model()
+    n_bits = 5000
+    whole = model.sample(n_bits, [np.random.default_rng(s) for s in range(6)])
+    monkeypatch.setattr(markov, "MAX_BATCH_BITS", 2 * n_bits)
+    capped = model.sample(n_bits, [np.random.default_rng(s) for s in range(6)])
+    assert np.array_equal(whole, capped)
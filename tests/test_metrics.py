@@ -0,0 +1,14 @@
+"""Metric registry: effect units."""
+
+from core import api
+from core.api import METRICS, effect_unit, run_test
+
+
+def test_dependence_effects_are_not_bits_per_char(corpus):
+    for name in METRICS:
+        expected = name.startswith(("mi_sum_", "acf_sum_"))
+        assert (effect_unit(name) != "bits/char") == expected, name
+
+    result = run_test(api.TestSpec(corpus, "test_o5", "word_perm", "acf_sum_64", n_perm=100), use_cache=False)
+    assert "sum rho^2" in result.summary()
+    assert "bits/char" not in result.summary()
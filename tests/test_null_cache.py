@@ -0,0 +1,38 @@
+"""Density-only null cache: same values as sampling, for str and BitSeq encodings."""
+
+import random
+
+import pytest
+
+from core import api
+from core.api import null_random_shuffle_bits, run_test
+from core.bitseq import as_bitseq, as_str
+
+
+@pytest.fixture
+def null_cache(tmp_path):
+    cache = api.enable_null_cache(str(tmp_path / "null_cache"))
+    yield cache
+    api.disable_null_cache()
+
+
+def test_random_shuffle_same_for_str_and_bitseq():
+    bits = "0110100111010001" * 20
+    for seed in range(5):
+        from_str = null_random_shuffle_bits(bits, random.Random(seed))
+        from_seq = null_random_shuffle_bits(as_bitseq(bits), random.Random(seed))
+        assert isinstance(from_str, str)
+        assert from_str == as_str(from_seq)
+        assert from_str.count("1") == bits.count("1")
+
+
+@pytest.mark.parametrize("first, second", [("test_o5", "test_o5_packed"), ("test_o5_packed", "test_o5")])
+def test_null_cache_shared_across_representations(corpus, null_cache, first, second):
+    fresh = {
+        e: run_test(api.TestSpec(corpus, e, "random", "zlib", n_perm=100), use_cache=False)
+        for e in (first, second)
+    }
+    assert fresh[first].null_distribution == fresh[second].null_distribution
+    for e in (first, second):
+        cached = run_test(api.TestSpec(corpus, e, "random", "zlib", n_perm=100), use_cache=False)
+        assert cached.null_distribution == fresh[e].null_distribution
@@ -0,0 +1,136 @@
+"""Property tests of the vectorised index nulls on a corpus with boundaries."""
+
+import itertools
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from core.api import CORPORA, NULLS, get_letter_table, get_word_table, null_block_shuffle_letters_index
+from core.word_table import LetterTable, block_layout, grouped_permutation
+
+N_DRAWS = 20
+
+
+def _words_of(text: str) -> np.ndarray:
+    """Word index of every character (spaces: -1)."""
+    chars = np.array(list(text))
+    ids = np.cumsum(chars == " ")
+    return np.where(chars == " ", -1, ids)
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 8])
+def test_block_shuffle_reorders_whole_blocks_within_words(corpus, block_size):
+    letters = get_letter_table(CORPORA[corpus])
+    text = letters.text_for(np.arange(len(letters)))
+    word = _words_of(text)
+    starts = np.flatnonzero(np.r_[True, word[1:] != word[:-1]])
+    rng = random.Random(block_size)
+    for _ in range(N_DRAWS):
+        positions = null_block_shuffle_letters_index(letters, block_size, rng)
+        assert sorted(positions.tolist()) == list(range(len(letters)))
+        assert np.array_equal(word[positions], word)  # Letters stay in their word
+        # Every run of consecutive source positions starts on a block boundary
+        run_start = np.r_[True, positions[1:] != positions[:-1] + 1] | np.isin(np.arange(len(word)), starts)
+        word_start = starts[np.searchsorted(starts, positions[run_start], side="right") - 1]
+        assert np.all((positions[run_start] - word_start) % block_size == 0)
+        short = np.isin(word, np.flatnonzero(np.bincount(word[word >= 0]) <= block_size))
+        assert np.array_equal(positions[short], np.flatnonzero(short))  # Short words intact
+
+
+def test_block_shuffle_orders_are_uniform():
+    letters = LetterTable("abcdefg hi")  # Blocks abc / def / g, "hi" intact
+    rng = random.Random(0)
+    counts = Counter(letters.text_for(null_block_shuffle_letters_index(letters, 3, rng)) for _ in range(6000))
+    assert set(counts) == {"".join(p) + " hi" for p in itertools.permutations(["abc", "def", "g"])}
+    assert all(abs(c - 1000) < 150 for c in counts.values())
+
+
+def test_block_layout_covers_long_words():
+    word_start, word_len = np.array([0, 5, 9]), np.array([4, 3, 7])
+    block_word, block_start, block_len, letters = block_layout(word_start, word_len, 3)
+    assert block_word.tolist() == [0, 0, 1, 1, 1]  # Indices into the long words (0 and 2)
+    assert block_start.tolist() == [0, 3, 9, 12, 15]
+    assert block_len.tolist() == [3, 1, 3, 3, 1]
+    assert letters.tolist() == [0, 1, 2, 3, 9, 10, 11, 12, 13, 14, 15]
+
+
+def _segment_ids(corpus: str, level: str) -> np.ndarray:
+    words = get_word_table(CORPORA[corpus])
+    offsets = CORPORA[corpus].boundary_levels()[level]
+    return np.searchsorted(offsets, np.arange(len(words)), side="right") - 1
+
+
+def _draws(corpus: str, null: str):
+    words, index_fn = get_word_table(CORPORA[corpus]), NULLS[null].index_fn
+    rng = random.Random(null)
+    for _ in range(N_DRAWS):
+        positions = index_fn(words, rng)
+        assert sorted(positions.tolist()) == list(range(len(words)))
+        yield positions
+
+
+def _assert_segments_intact(positions: np.ndarray, segment: np.ndarray):
+    """Null order is whole segments, each once, each in its own word order."""
+    moved = segment[positions]
+    breaks = np.flatnonzero(np.r_[True, moved[1:] != moved[:-1]])
+    assert sorted(moved[breaks].tolist()) == sorted(set(segment.tolist()))
+    for a, b in zip(breaks, np.r_[breaks[1:], len(positions)]):
+        assert np.array_equal(positions[a:b], np.flatnonzero(segment == moved[a]))
+
+
+@pytest.mark.parametrize("level", ["verse", "surah"])
+def test_within_segment_word_perm_keeps_membership(corpus, level):
+    segment = _segment_ids(corpus, level)
+    moved_any = False
+    for positions in _draws(corpus, f"{level}_word_perm"):
+        assert np.array_equal(segment[positions], segment)
+        moved_any |= not np.array_equal(positions, np.arange(len(positions)))
+    assert moved_any
+
+
+@pytest.mark.parametrize("level", ["verse", "surah"])
+def test_segment_perm_keeps_segments_intact(corpus, level):
+    segment = _segment_ids(corpus, level)
+    for positions in _draws(corpus, f"{level}_perm"):
+        _assert_segments_intact(positions, segment)
+
+
+def test_surah_verse_perm_keeps_verses_in_their_surah(corpus):
+    verse, surah = _segment_ids(corpus, "verse"), _segment_ids(corpus, "surah")
+    for positions in _draws(corpus, "surah_verse_perm"):
+        _assert_segments_intact(positions, verse)
+        assert np.array_equal(surah[positions], surah)
+
+
+def test_grouped_permutation_is_uniform_within_groups():
+    group = np.array([0, 0, 0, 1, 1, 2])
+    gen = np.random.default_rng(0)
+    counts = Counter(tuple(grouped_permutation(group, gen).tolist()) for _ in range(12000))
+    assert len(counts) == 6 * 2  # 3! orders of group 0, 2! of group 1
+    assert all(abs(c - 1000) < 150 for c in counts.values())
+    assert all(sorted(p[:3]) == [0, 1, 2] and sorted(p[3:5]) == [3, 4] and p[5] == 5 for p in counts)
+
+
+def test_within_word_shuffle_only_reorders_letters_inside_words(corpus):
+    letters = get_letter_table(CORPORA[corpus])
+    text = letters.text_for(np.arange(len(letters)))
+    word = _words_of(text)
+    rng = random.Random(16)
+    for _ in range(N_DRAWS):
+        positions = NULLS["within_word_shuffle"].index_fn(letters, rng)
+        assert sorted(positions.tolist()) == list(range(len(letters)))
+        assert np.array_equal(word[positions], word)  # Spaces fixed, letters in their word
+        null_words = letters.text_for(positions).split(" ")
+        assert [sorted(w) for w in null_words] == [sorted(w) for w in text.split(" ")]
+
+
+def test_within_word_shuffle_is_uniform():
+    letters = LetterTable("abc de")
+    rng = random.Random(0)
+    index_fn = NULLS["within_word_shuffle"].index_fn
+    counts = Counter(letters.text_for(index_fn(letters, rng)) for _ in range(12000))
+    assert set(counts) == {"".join(p) + " " + "".join(q)
+                           for p in itertools.permutations("abc") for q in itertools.permutations("de")}
+    assert all(abs(c - 1000) < 150 for c in counts.values())
@@ -0,0 +1,57 @@
+"""Packed / sym5 compression metrics against direct compressor calls."""
+
+import bz2
+import lzma
+import zlib
+
+import numpy as np
+import pytest
+
+from core.api import METRICS, PACKED_WIDTHS
+from core.bitseq import as_bitseq
+
+COMPRESS = {
+    "zlib": lambda data: zlib.compress(data, level=9),
+    "bz2": lambda data: bz2.compress(data, compresslevel=9),
+    "lzma": lzma.compress,
+}
+
+rng = np.random.default_rng(21)
+INPUTS = [
+    "".join(rng.choice(["0", "1"], 503)),
+    ("10110" * 97)[:481],  # 5-bit symbols repeating
+    "1",
+    "0" * 64,
+]
+
+
+def _symbols(s: str, width: int) -> bytes:
+    """One byte per width-bit symbol, zero-padded tail, by hand."""
+    s += "0" * (-len(s) % width)
+    return bytes(int(s[i:i + width], 2) for i in range(0, len(s), width))
+
+
+@pytest.mark.parametrize("compressor", sorted(COMPRESS))
+@pytest.mark.parametrize("suffix", sorted(PACKED_WIDTHS))
+def test_packed_metrics(compressor, suffix):
+    metric = METRICS[f"{compressor}_{suffix}"]
+    for s in INPUTS:
+        expected = 8 * len(COMPRESS[compressor](_symbols(s, PACKED_WIDTHS[suffix]))) / len(s)
+        assert metric.fn(s) == expected
+        assert metric.fn(as_bitseq(s)) == expected
+        assert metric.fn(as_bitseq("1" + s)[1:]) == expected  # Unaligned view
+
+
+@pytest.mark.parametrize("compressor", sorted(COMPRESS))
+def test_ascii_metrics(compressor):
+    for s in INPUTS:
+        expected = len(COMPRESS[compressor](s.encode())) / len(s)
+        assert METRICS[compressor].fn(s) == expected
+        assert METRICS[compressor].fn(as_bitseq(s)) == expected
+
+
+def test_packed_effects_are_bits_per_char():
+    for compressor in COMPRESS:
+        assert METRICS[compressor].effect_scale == 8.0
+        for suffix in PACKED_WIDTHS:
+            assert METRICS[f"{compressor}_{suffix}"].effect_scale == 1.0
@@ -0,0 +1,33 @@
+"""Permutation bank: same results as drawing, and a size limit."""
+
+import pytest
+
+from core import api
+from core.api import run_test
+
+
+@pytest.fixture
+def spec(corpus):
+    return api.TestSpec(corpus, "test_o5", "word_perm", "zlib", n_perm=100)
+
+
+def _banked(spec, directory, **kwargs):
+    bank = api.enable_permutation_bank(str(directory), **kwargs)
+    try:
+        return run_test(spec, use_cache=False), sorted(bank.directory.glob("*.npy"))
+    finally:
+        api.disable_permutation_bank()
+
+
+def test_bank_matches_drawing(spec, tmp_path):
+    drawn = run_test(spec, use_cache=False)
+    banked, files = _banked(spec, tmp_path)
+    assert len(files) == 1
+    assert banked.null_distribution == drawn.null_distribution
+
+
+def test_bank_over_size_limit_is_not_written(spec, tmp_path):
+    drawn = run_test(spec, use_cache=False)
+    banked, files = _banked(spec, tmp_path, max_bytes=1024)
+    assert files == []
+    assert banked.null_distribution == drawn.null_distribution
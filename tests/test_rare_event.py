@@ -0,0 +1,62 @@
+"""Multilevel splitting against brute-force Monte Carlo p-values."""
+
+import random
+
+import numpy as np
+import pytest
+
+from core import api
+from core.api import CORPORA, get_word_table, null_word_swap_move, run_rare_event_test, run_test
+from core.rare_event import multilevel_splitting
+
+N_ITEMS = 30
+WEIGHTS = np.arange(N_ITEMS, dtype=np.float64)
+
+
+def _swap(perm: np.ndarray, gen: np.random.Generator) -> np.ndarray:
+    i, j = gen.integers(len(perm), size=2)
+    moved = perm.copy()
+    moved[i], moved[j] = perm[j], perm[i]
+    return moved
+
+
+@pytest.mark.parametrize("p_target", [1e-2, 1e-3])
+def test_splitting_matches_brute_force(p_target):
+    # Score = sum_i i * perm[i] over uniform permutations; brute-force tail from 400k draws
+    gen = np.random.default_rng(19)
+    brute_scores = np.argsort(gen.random((400_000, N_ITEMS)), axis=1) @ WEIGHTS
+    target = float(np.quantile(brute_scores, 1 - p_target))
+    p_brute = float((brute_scores >= target).mean())
+    se_brute = (p_brute * (1 - p_brute) / len(brute_scores)) ** 0.5
+
+    states = [gen.permutation(N_ITEMS) for _ in range(1000)]
+    estimate = multilevel_splitting(states, lambda s: float(s @ WEIGHTS), _swap, target,
+                                    np.random.default_rng(20))
+    assert estimate.reached
+    assert estimate.std_error > 0
+    assert abs(estimate.p_value - p_brute) <= 3 * (estimate.std_error ** 2 + se_brute ** 2) ** 0.5
+
+
+def test_rare_event_test_matches_run_test(corpus):
+    # Moderate p (~0.08), so plain Monte Carlo gives a reference
+    spec = api.TestSpec(corpus, "test_o5", "word_perm", "mi_sum_64", n_perm=4000)
+    brute = run_test(spec, use_cache=False)
+    se_brute = (brute.p_value * (1 - brute.p_value) / spec.n_perm) ** 0.5
+
+    rare = run_rare_event_test(spec, n_per_level=400)
+    assert rare.reached and rare.observed == brute.observed
+    assert abs(rare.p_value - brute.p_value) <= 3 * (rare.std_error ** 2 + se_brute ** 2) ** 0.5
+    # Level 0 is the first n_per_level draws run_test makes
+    assert rare.null_mean == pytest.approx(float(np.mean(brute.null_distribution[:400])), rel=1e-12)
+
+
+def test_word_swap_moves_keep_the_word_multiset(corpus):
+    words = get_word_table(CORPORA[corpus])
+    gen = np.random.default_rng(0)
+    positions = api.null_word_permutation_index(words, random.Random(0))
+    for _ in range(500):
+        moved = null_word_swap_move(words, positions, gen)
+        assert sorted(moved.tolist()) == list(range(len(words)))
+        assert np.sum(moved != positions) in (0, 2)  # One swap (or i == j)
+        positions = moved
+    assert sorted(words.ids[positions].tolist()) == sorted(words.ids.tolist())
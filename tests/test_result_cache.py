@@ -0,0 +1,43 @@
+"""A result cache hit must equal what a fresh run produces."""
+
+import numpy as np
+import pytest
+
+from core import api
+from core.api import run_test
+
+
+def test_cache_hit_equals_fresh_run(corpus, result_cache):
+    spec = api.TestSpec(corpus, "test_o5", "word_perm", "zlib", n_perm=100)
+    fresh = run_test(spec, use_cache=False)
+    run_test(spec)
+    cached = run_test(spec)
+    assert cached.null_distribution == fresh.null_distribution
+    assert cached.p_value == fresh.p_value
+
+
+def test_streaming_result_does_not_poison_full_runs(corpus, result_cache):
+    spec = api.TestSpec(corpus, "test_o5", "word_perm", "zlib", n_perm=100, seed=7)
+    streamed = run_test(spec, streaming=True)
+    assert streamed.null_distribution is None
+
+    full = run_test(spec)
+    assert full.null_distribution is not None
+    assert full.p_value == streamed.p_value
+
+    # A cached full run also serves streaming callers
+    assert run_test(spec, streaming=True).null_distribution == full.null_distribution
+
+
+@pytest.mark.parametrize("seed_mode, workers", [("stream", 1), ("spawn", 1), ("spawn", 3)])
+def test_streaming_summary_matches_full_run(corpus, seed_mode, workers):
+    spec = api.TestSpec(corpus, "test_o5", "word_perm", "zlib", n_perm=150, seed_mode=seed_mode)
+    full = run_test(spec, workers=workers, use_cache=False)
+    streamed = run_test(spec, workers=workers, use_cache=False, streaming=True)
+    summary = streamed.null_summary
+    assert streamed.p_value == full.p_value
+    assert summary.n == len(full.null_distribution) == 150
+    assert summary.mean == pytest.approx(full.null_mean, rel=1e-12)
+    assert summary.std == pytest.approx(full.null_std, rel=1e-9)
+    assert (summary.min, summary.max) == (min(full.null_distribution), max(full.null_distribution))
+    assert summary.quantile(0.5) == pytest.approx(float(np.median(full.null_distribution)), rel=1e-3)
@@ -0,0 +1,52 @@
+"""Scheduler jobs are keyed by spec + corpus and survive code edits."""
+
+import json
+
+from core import api
+from core.api import run_test
+from core.scheduler import JobStatus, Scheduler
+
+
+def _spec(corpus, **kw):
+    return api.TestSpec(corpus, "test_o5", "word_perm", "zlib", n_perm=100, **kw)
+
+
+def test_scheduler_result_equals_run_test(corpus, tmp_path):
+    scheduler = Scheduler(str(tmp_path / "jobs.db"), checkpoint_every=30)
+    spec = _spec(corpus)
+    scheduler.submit(spec)
+    scheduler.run(workers=1)
+    assert scheduler.progress(spec) == 100
+    assert scheduler.result(spec).null_distribution == run_test(spec, use_cache=False).null_distribution
+
+
+def test_job_key_ignores_code_fingerprint_does_not(corpus, tmp_path):
+    scheduler = Scheduler(str(tmp_path / "jobs.db"))
+    spec = _spec(corpus, seed=5)
+    key, = scheduler.submit(spec)
+    assert key == api.job_key(spec)
+    scheduler.run(workers=1)
+
+    # Simulate an edit to the null/encoding/metric code
+    with scheduler._connect() as db:
+        db.execute("UPDATE jobs SET fingerprint = 'old' WHERE key = ?", (key,))
+    assert scheduler.result(spec) is None
+    assert scheduler.progress(spec) == 0
+
+    # Resubmitting finds the same job and redoes it
+    assert scheduler.submit(spec) == [key]
+    assert scheduler.status()[JobStatus.PENDING.value] == 1
+    scheduler.run(workers=1)
+    assert scheduler.result(spec) is not None
+
+
+def test_stale_checkpoint_is_not_resumed(corpus, tmp_path):
+    scheduler = Scheduler(str(tmp_path / "jobs.db"))
+    spec = _spec(corpus, seed=9)
+    key, = scheduler.submit(spec)
+    bogus = {"values": [0.0] * 50, "rng_state": None}
+    with scheduler._connect() as db:
+        db.execute("UPDATE jobs SET checkpoint = ?, fingerprint = 'old' WHERE key = ?",
+                   (json.dumps(bogus), key))
+    scheduler.run(workers=1)
+    assert scheduler.result(spec).null_distribution == run_test(spec, use_cache=False).null_distribution
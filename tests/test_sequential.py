@@ -0,0 +1,95 @@
+"""Sequential stopping: stopping points and p-values against the full null."""
+
+import math
+
+import pytest
+
+from core import api
+from core.api import SEQUENTIAL_DELTA, SEQUENTIAL_LOOK, run_test, run_test_resumable
+
+N_PERM = 400
+
+# (null, metric): observed typical (p ~ 0.4-0.9), extreme (p ~ 0), always exceeded (p = 1)
+CASES = [("verse_perm", "kt_8"), ("surah_perm", "kt_8"), ("within_word_shuffle", "zlib"), ("block_32", "zlib")]
+
+
+def _spec(corpus, null, metric, **kwargs):
+    kwargs.setdefault("seed_mode", "spawn")
+    return api.TestSpec(corpus, "test_o5", null, metric, n_perm=N_PERM, **kwargs)
+
+
+def _extreme(corpus, null, metric):
+    full = run_test(_spec(corpus, null, metric), use_cache=False)
+    return full, [x <= full.observed for x in full.null_distribution]  # Both metrics are LOWER
+
+
+def _binomial_cdf(k, n, p):
+    return sum(math.comb(n, i) * p ** i * (1 - p) ** (n - i) for i in range(k + 1)) if k >= 0 else 0.0
+
+
+@pytest.mark.parametrize("null, metric", CASES)
+@pytest.mark.parametrize("h", [1, 5])
+def test_besag_clifford(corpus, null, metric, h):
+    full, extreme = _extreme(corpus, null, metric)
+    result = run_test(_spec(corpus, null, metric, stopping="besag_clifford", stop_h=h), use_cache=False)
+    hits = [i + 1 for i, e in enumerate(extreme) if e]
+    if len(hits) >= h:
+        assert result.n_perm_used == hits[h - 1]
+        assert result.p_value == h / hits[h - 1]
+    else:
+        assert result.n_perm_used == N_PERM
+        assert result.p_value == full.p_value
+    assert result.null_distribution == full.null_distribution[:result.n_perm_used]
+
+
+@pytest.mark.parametrize("null, metric", CASES)
+def test_alpha_bound(corpus, null, metric):
+    full, extreme = _extreme(corpus, null, metric)
+    alpha = 0.05
+    result = run_test(_spec(corpus, null, metric, stopping="alpha_bound", alpha=alpha), use_cache=False)
+
+    delta = SEQUENTIAL_DELTA / (N_PERM // SEQUENTIAL_LOOK)
+    expected = (N_PERM, full.p_value)
+    for n in range(SEQUENTIAL_LOOK, N_PERM + 1, SEQUENTIAL_LOOK):
+        k = sum(extreme[:n])
+        if _binomial_cdf(k, n, alpha) < delta or 1 - _binomial_cdf(k - 1, n, alpha) < delta:
+            expected = (n, (k + 1) / (n + 1))
+            break
+    assert result.n_perm_used == expected[0]
+    assert result.p_value == expected[1]
+    assert result.null_distribution == full.null_distribution[:result.n_perm_used]
+
+
+@pytest.mark.parametrize("stopping", ["besag_clifford", "alpha_bound"])
+def test_stopping_same_for_any_worker_count(corpus, stopping):
+    spec = _spec(corpus, "surah_perm", "kt_8", stopping=stopping)
+    one = run_test(spec, workers=1, use_cache=False)
+    three = run_test(spec, workers=3, use_cache=False)
+    assert (one.n_perm_used, one.p_value, one.null_distribution) == \
+        (three.n_perm_used, three.p_value, three.null_distribution)
+
+
+class Killed(Exception):
+    pass
+
+
+@pytest.mark.parametrize("seed_mode", ["stream", "spawn"])
+@pytest.mark.parametrize("stopping", ["besag_clifford", "alpha_bound"])
+def test_stopping_survives_resume(corpus, stopping, seed_mode):
+    spec = _spec(corpus, "surah_perm", "kt_8", stopping=stopping, stop_h=10, seed_mode=seed_mode)
+    uninterrupted = run_test(spec, use_cache=False)
+
+    states = []
+
+    def checkpoint(state):
+        states.append(state)
+        if len(states) == 2:
+            raise Killed
+
+    try:
+        run_test_resumable(spec, checkpoint=checkpoint, checkpoint_every=20, use_cache=False)
+    except Killed:
+        pass
+    resumed = run_test_resumable(spec, resume=states[-1], checkpoint_every=20, use_cache=False)
+    assert (resumed.n_perm_used, resumed.p_value, resumed.null_distribution) == \
+        (uninterrupted.n_perm_used, uninterrupted.p_value, uninterrupted.null_distribution)
@@ -0,0 +1,52 @@
+"""Word n-gram surrogates: alias tables and generated n-grams."""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from core.api import CORPORA, get_word_table
+from core.word_markov import WordMarkovModel, alias_tables
+
+
+def test_alias_tables_reproduce_the_weights():
+    weights = np.array([3.0, 1.0, 0.5, 0.5, 7.0, 2.0, 2.0, 1.0, 5.0])
+    offsets = np.array([0, 4, 5, 9])  # Three distributions, one with a single outcome
+    accept, alias = alias_tables(offsets, weights)
+    for lo, hi in zip(offsets[:-1], offsets[1:]):
+        prob = np.zeros(len(weights))
+        for slot in range(lo, hi):
+            prob[slot] += accept[slot] / (hi - lo)
+            prob[alias[slot]] += (1 - accept[slot]) / (hi - lo)
+        assert prob[lo:hi] == pytest.approx(weights[lo:hi] / weights[lo:hi].sum())
+        assert prob.sum() == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("order", [1, 2])
+def test_surrogate_ngrams_occur_in_the_corpus(corpus, order):
+    ids = get_word_table(CORPORA[corpus]).ids
+    model = WordMarkovModel(ids, order)
+    seen = {tuple(ids[i:i + order + 1].tolist()) for i in range(len(ids) - order)}
+    contexts = {g[:-1] for g in seen}
+    for seed in range(5):
+        out = model.sample(len(ids), np.random.default_rng(seed))
+        assert len(out) == len(ids)
+        assert out[:order].tolist() == ids[:order].tolist()
+        for i in range(len(out) - order):
+            gram = tuple(out[i:i + order + 1].tolist())
+            # Only a context never followed in the corpus backs off
+            assert gram in seen or gram[:-1] not in contexts
+
+
+def test_bigram_frequencies_match_the_corpus():
+    ids = np.array([0, 1, 0, 2, 2, 1, 0, 1, 1, 2, 0, 0, 2])
+    model = WordMarkovModel(ids, 1)
+    out = model.sample(200_000, np.random.default_rng(1)).tolist()
+    corpus_pairs = Counter(zip(ids[:-1].tolist(), ids[1:].tolist()))
+    sample_pairs = Counter(zip(out[:-1], out[1:]))
+    for w in range(3):
+        expected_total = sum(c for (a, _), c in corpus_pairs.items() if a == w)
+        sample_total = sum(c for (a, _), c in sample_pairs.items() if a == w)
+        for nxt in range(3):
+            expected = corpus_pairs[(w, nxt)] / expected_total
+            assert sample_pairs[(w, nxt)] / sample_total == pytest.approx(expected, abs=0.01)
@@ -0,0 +1,19 @@
+"""Nulls assembled from pre-encoded tokens equal re-encoding the null text."""
+
+import pytest
+
+from core import api
+from core.api import run_test
+
+NULLS = ["word_perm", "block_4", "block_32", "within_word_shuffle",
+         "verse_word_perm", "surah_verse_perm", "word_bigram"]
+
+
+@pytest.mark.parametrize("null", NULLS)
+@pytest.mark.parametrize("encoding", ["test_o5", "test_o5_packed", "test_delta"])
+def test_word_table_matches_reencoding(corpus, null, encoding):
+    spec = api.TestSpec(corpus, encoding, null, "zlib", n_perm=100)
+    table = run_test(spec, use_word_table=True, use_cache=False)
+    reencoded = run_test(spec, use_word_table=False, use_cache=False)
+    assert table.null_distribution == reencoded.null_distribution
+    assert table.p_value == reencoded.p_value
@@ -0,0 +1,25 @@
+"""Worker pool: spawn results do not depend on the worker count."""
+
+import pytest
+
+from core import api
+from core.api import run_test
+
+
+@pytest.mark.parametrize("null", ["word_perm", "random", "markov_2"])
+def test_spawn_same_for_any_worker_count(corpus, null):
+    spec = api.TestSpec(corpus, "test_o5", null, "zlib", n_perm=100, seed_mode="spawn")
+    one = run_test(spec, workers=1, use_cache=False)
+    three = run_test(spec, workers=3, use_cache=False)
+    assert one.null_distribution == three.null_distribution
+    assert one.p_value == three.p_value
+
+
+def test_stream_requires_one_worker(corpus):
+    spec = api.TestSpec(corpus, "test_o5", "word_perm", "zlib", n_perm=100, seed_mode="stream")
+    single = run_test(spec, workers=1, use_cache=False)
+    assert single.null_distribution == run_test(spec, workers=1, use_cache=False).null_distribution
+    with pytest.raises(ValueError, match="seed_mode='spawn'"):
+        run_test(spec, workers=3, use_cache=False)
+    with pytest.raises(ValueError, match="seed_mode='spawn'"):
+        api.run_batch_test(corpus, ["test_o5"], "word_perm", ["zlib"], n_perm=100, workers=3)